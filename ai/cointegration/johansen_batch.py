@@ -0,0 +1,235 @@
+# /ai/cointegration/johansen_batch.py
+"""
+Batch Johansen Service
+----------------------
+Evaluates many (basket, window) Johansen jobs at once.
+
+- Jobs are fanned out across a process pool (statsmodels is GIL-bound).
+- Every result is memoized by (basket, window bounds, data fingerprint,
+  det_order, k_ar_diff), so repeated windows are never re-fitted.
+- Rolling evaluations can use a stride: windows that only shift by less
+  than the stride reuse the result of the last evaluated (anchor) window.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ai.cointegration.johansen_module import JohansenCointegration
+from analytics.indicators import data_fingerprint
+
+
+class JohansenJob(NamedTuple):
+    """A single Johansen evaluation: basket columns over prices.iloc[start:end]."""
+
+    basket: Tuple[Hashable, ...]
+    start: int
+    end: int
+
+
+# ----------------------------------------------------------------------
+# Worker helpers (module level so they can be pickled)
+# ----------------------------------------------------------------------
+def _run_johansen(payload: Tuple[np.ndarray, List[Hashable], int, int]) -> Dict[str, Any]:
+    """Fit one window and return its summary dictionary."""
+    values, columns, det_order, k_ar_diff = payload
+    joh = JohansenCointegration(det_order=det_order, k_ar_diff=k_ar_diff)
+    try:
+        joh.fit(pd.DataFrame(values, columns=columns))
+        return joh.summary()
+    except Exception as e:
+        return {"rank": 0, "error": str(e)}
+
+
+class BatchJohansenService:
+    """
+    Parallel, memoized Johansen evaluation for candidate baskets.
+
+    Usage:
+        with BatchJohansenService(max_workers=4) as svc:
+            results = svc.evaluate(prices, jobs)
+            rolling = svc.evaluate_rolling(prices, window=200, stride=10)
+    """
+
+    def __init__(
+        self,
+        det_order: int = 0,
+        k_ar_diff: int = 1,
+        max_workers: Optional[int] = None,
+        max_cache_entries: int = 10_000,
+        min_parallel_jobs: int = 8,
+    ):
+        """
+        det_order, k_ar_diff : int
+            Passed through to JohansenCointegration.
+        max_workers : int, optional
+            Process pool size (defaults to cpu_count - 1). 1 disables the pool.
+        max_cache_entries : int
+            LRU bound on memoized results.
+        min_parallel_jobs : int
+            Batches smaller than this are evaluated in-process.
+        """
+        self.det_order = det_order
+        self.k_ar_diff = k_ar_diff
+        self.max_workers = max_workers or max((os.cpu_count() or 2) - 1, 1)
+        self.max_cache_entries = max_cache_entries
+        self.min_parallel_jobs = min_parallel_jobs
+
+        self._cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def __enter__(self) -> "BatchJohansenService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool (the cache is kept)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+        return result
+
+    def _cache_put(self, key: tuple, result: Dict[str, Any]) -> None:
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Return cache size and hit statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Batch evaluation
+    # ------------------------------------------------------------------
+    def evaluate(self, prices: pd.DataFrame, jobs: Sequence[JohansenJob]) -> List[Dict[str, Any]]:
+        """
+        Evaluate all jobs against `prices` and return summaries in job order.
+        Duplicate and previously seen jobs are served from the cache.
+        """
+        if not isinstance(prices, pd.DataFrame):
+            raise ValueError("Input must be a pandas DataFrame")
+
+        col_pos = {col: i for i, col in enumerate(prices.columns)}
+        values = prices.to_numpy(dtype=np.float64)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending: Dict[tuple, List[int]] = {}
+        payloads: Dict[tuple, Tuple[np.ndarray, List[Hashable], int, int]] = {}
+
+        for idx, job in enumerate(jobs):
+            basket = tuple(job.basket)
+            if len(basket) < 3:
+                raise ValueError("Johansen test requires 3 or more series")
+            block = values[job.start : job.end, [col_pos[c] for c in basket]]
+            key = (
+                basket,
+                job.start,
+                job.end,
+                data_fingerprint(block),
+                self.det_order,
+                self.k_ar_diff,
+            )
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[idx] = cached
+                continue
+            if key not in pending:
+                pending[key] = []
+                payloads[key] = (block, list(basket), self.det_order, self.k_ar_diff)
+            pending[key].append(idx)
+
+        if pending:
+            self.misses += len(pending)
+            keys = list(pending.keys())
+            work = [payloads[k] for k in keys]
+
+            if self.max_workers > 1 and len(work) >= self.min_parallel_jobs:
+                chunksize = max(1, len(work) // (self.max_workers * 4))
+                fitted = list(self._get_executor().map(_run_johansen, work, chunksize=chunksize))
+            else:
+                fitted = [_run_johansen(p) for p in work]
+
+            for key, summary in zip(keys, fitted):
+                self._cache_put(key, summary)
+                for idx in pending[key]:
+                    results[idx] = summary
+
+        return [r if r is not None else {} for r in results]
+
+    # ------------------------------------------------------------------
+    # Rolling evaluation
+    # ------------------------------------------------------------------
+    @staticmethod
+    def plan_rolling(n_rows: int, window: int, stride: int = 1) -> Tuple[List[int], List[int]]:
+        """
+        Plan a rolling evaluation over windows [i - window, i) for
+        i = window .. n_rows - 1 (the windows used by make_features).
+
+        Returns:
+            anchors: window end indices that actually need a fit
+            mapping: for every window, the anchor end index it reuses
+        """
+        if window <= 0 or stride <= 0:
+            raise ValueError("window and stride must be positive")
+        ends = range(window, n_rows)
+        mapping = [window + ((end - window) // stride) * stride for end in ends]
+        anchors = sorted(set(mapping))
+        return anchors, mapping
+
+    def evaluate_rolling(
+        self,
+        prices: pd.DataFrame,
+        window: int,
+        stride: int = 1,
+        basket: Optional[Sequence[Hashable]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate one basket over every rolling window [i - window, i).
+        Only one window per `stride` is fitted; the others reuse it.
+
+        Returns one summary per window, aligned with i = window .. len(prices) - 1.
+        """
+        basket_t = tuple(basket) if basket is not None else tuple(prices.columns)
+        anchors, mapping = self.plan_rolling(len(prices), window, stride)
+        jobs = [JohansenJob(basket_t, end - window, end) for end in anchors]
+        by_anchor = dict(zip(anchors, self.evaluate(prices, jobs)))
+        return [by_anchor[end] for end in mapping]
@@ -10,6 +10,17 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 
+from data.feature_expr import (
+    FeaturePlan,
+    col,
+    lag,
+    mean_across,
+    pct_change,
+    rolling_corr,
+    rolling_mean,
+    rolling_std,
+)
+
 
 # ---------------------------------------------------------------------
 # LSTM Model Definition
@@ -30,7 +41,30 @@ class RegimeLSTM(nn.Module):
 # ---------------------------------------------------------------------
 # Feature Extraction Utility
 # ---------------------------------------------------------------------
-def make_features(prices_df: pd.DataFrame, cluster_engine=None) -> pd.DataFrame:
+def window_feature_plan(columns, window_size: int) -> FeaturePlan:
+    """
+    Rolling regime statistics over the trailing window [i - window_size, i):
+      - vol: mean over assets of the std of in-window returns
+      - spread_mean / spread_std: first asset minus the cross-sectional mean
+      - corr: mean of the in-window correlation matrix
+    """
+    cols = [col(c) for c in columns]
+    spread = cols[0] - mean_across(*cols)
+    vol = mean_across(*[rolling_std(pct_change(c), window_size - 1) for c in cols])
+    corr = mean_across(*[rolling_corr(a, b, window_size) for a in cols for b in cols])
+    return FeaturePlan(
+        {
+            "vol": lag(vol),
+            "spread_mean": lag(rolling_mean(spread, window_size)),
+            "spread_std": lag(rolling_std(spread, window_size)),
+            "corr": lag(corr),
+        }
+    )
+
+
+def make_features(
+    prices_df: pd.DataFrame, cluster_engine=None, cluster_stride: int = 1
+) -> pd.DataFrame:
     """
     Generates temporal features for regime classification from raw price data.
 
@@ -40,34 +74,44 @@ def make_features(prices_df: pd.DataFrame, cluster_engine=None) -> pd.DataFrame:
       - Rolling volatility
       - Rolling mean spread and standard deviation
       - Rolling correlation
+
+    If the cluster engine supports `evaluate_rolling`, all windows are
+    evaluated up-front as one parallel, memoized batch; `cluster_stride` > 1
+    refits only every n-th window and reuses the fit in between.
     """
     if prices_df is None or prices_df.empty:
         raise ValueError("❌ prices_df cannot be None or empty")
 
-    feats = []
     window_size = 200
 
-    for i in range(window_size, len(prices_df)):
-        window = prices_df.iloc[i - window_size : i]
+    cluster_results = None
+    if cluster_engine is not None and hasattr(cluster_engine, "evaluate_rolling"):
+        cluster_results = cluster_engine.evaluate_rolling(
+            prices_df, window_size, stride=cluster_stride
+        )
 
+    ranks, scores = [], []
+    for i in range(window_size, len(prices_df)):
         # Cointegration/cluster results if available
-        if cluster_engine is not None and hasattr(cluster_engine, "evaluate_cluster"):
-            res = cluster_engine.evaluate_cluster(window)
+        if cluster_results is not None:
+            res = cluster_results[i - window_size]
+            rank = res.get("rank", 0)
+            score = res.get("score", 0.0)
+        elif cluster_engine is not None and hasattr(cluster_engine, "evaluate_cluster"):
+            res = cluster_engine.evaluate_cluster(prices_df.iloc[i - window_size : i])
             rank = res.get("rank", 0)
             score = res.get("score", 0.0)
         else:
             rank, score = 0, 0.0
+        ranks.append(rank)
+        scores.append(score)
 
-        # Rolling stats
-        vol = window.pct_change().std().mean()
-        mean_spread = (window.iloc[:, 0] - window.mean(axis=1)).mean()
-        std_spread = (window.iloc[:, 0] - window.mean(axis=1)).std()
-        corr = window.corr().mean().mean()
-
-        feats.append([rank, score, vol, mean_spread, std_spread, corr])
+    # Rolling stats over [i - window_size, i), evaluated as one feature DAG
+    stats = window_feature_plan(list(prices_df.columns), window_size).evaluate(prices_df)
+    stats = stats.iloc[window_size:].reset_index(drop=True)
 
     feat_df = pd.DataFrame(
-        feats, columns=["rank", "score", "vol", "spread_mean", "spread_std", "corr"]
+        {"rank": ranks, "score": scores, **{c: stats[c].to_numpy() for c in stats.columns}}
     ).dropna()
 
     print(f"✅ Generated {len(feat_df)} feature rows from {len(prices_df)} input samples.")
@@ -2,6 +2,8 @@
 import numpy as np
 import pandas as pd
 
+from analytics.indicators import get_cache
+
 
 class MarketRegimeDetector:
     """
@@ -13,9 +15,11 @@ class MarketRegimeDetector:
         self.current_regime = "neutral"
 
     def compute_features(self, price_series: pd.Series) -> dict:
-        returns = price_series.pct_change().dropna()
-        vol = returns.rolling(20).std().iloc[-1]
-        mom = price_series.pct_change(20).iloc[-1]
+        cache = get_cache()
+        values = price_series.to_numpy(dtype=np.float64)
+        returns = pd.Series(cache.compute(values, "pct_change", 1)).dropna()
+        vol = cache.compute(returns.to_numpy(), "std", 20)[-1]
+        mom = cache.compute(values, "pct_change", 20)[-1]
         kurt = returns.kurtosis()
         skew = returns.skew()
         return {"vol": vol, "mom": mom, "kurt": kurt, "skew": skew}
@@ -0,0 +1,90 @@
+# analytics/downsampling.py
+"""
+NEXORA Series Downsampling
+--------------------------
+Shape-preserving point selection for plotting long series (equity curves,
+rolling metrics) under a fixed point budget:
+
+    minmax - split the series into equal buckets and keep each bucket's
+             minimum and maximum; every peak and trough (e.g. the deepest
+             drawdown) survives exactly. Fully vectorized.
+    lttb   - Largest-Triangle-Three-Buckets (Steinarsson, 2013): one point
+             per bucket, the one forming the largest triangle with the
+             previously kept point and the next bucket's average. Visually
+             closest to the full line for the same budget.
+
+Both return sorted positions into the original series, always including the
+first and last point, so the same positions index the x values. Non-finite
+values are skipped (the rolling metrics' warm-up NaNs).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+METHODS = ("minmax", "lttb")
+
+
+def minmax_indices(values, max_points: int) -> np.ndarray:
+    """Positions of each bucket's min and max (plus both endpoints), <= max_points."""
+    y = np.asarray(values, dtype=np.float64).ravel()
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    buckets = max((max_points - 2) // 2, 1)
+    size = -(-n // buckets)  # ceil
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1) + offsets
+    highs = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1) + offsets
+
+    keep = np.concatenate([[0, n - 1], lows, highs])
+    return np.unique(keep[keep < n])
+
+
+def lttb_indices(values, max_points: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets positions (first, last and one per bucket)."""
+    y = np.asarray(values, dtype=np.float64).ravel()
+    n = len(y)
+    if n <= max_points or n < 3:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1])
+
+    # Interior points split into (max_points - 2) buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    x = np.arange(n, dtype=np.float64)
+    csum = np.concatenate([[0.0], np.cumsum(y)])
+
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx = 0.5 * (nlo + nhi - 1)
+        cy = (csum[nhi] - csum[nlo]) / (nhi - nlo)
+
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample_indices(values, max_points: Optional[int], method: str = "minmax") -> np.ndarray:
+    """
+    Sorted positions of at most `max_points` points of `values` (all finite
+    points when max_points is None or 0).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}' (expected one of {METHODS})")
+    y = np.asarray(values, dtype=np.float64).ravel()
+    finite = np.flatnonzero(np.isfinite(y))
+    if not max_points or len(finite) <= max_points:
+        return finite
+    pick = minmax_indices if method == "minmax" else lttb_indices
+    return finite[pick(y[finite], int(max_points))]
@@ -0,0 +1,413 @@
+# analytics/indicators.py
+"""
+NEXORA Indicator Library
+------------------------
+Vectorized rolling indicators (SMA, rolling std, z-score, returns) plus a
+shared, memory-bounded memoizing cache.
+
+Strategies, the FeatureStore and the regime detector all consult the same
+cache, keyed by (series id, indicator, window, version), so the same SMA on
+the same series is computed once no matter how many consumers ask for it.
+In live mode `IndicatorCache.append()` extends every cached indicator of a
+series with only the new bars instead of recomputing the full history.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+# -------------------------------------------------------------------------
+# Vectorized indicators (pandas-compatible NaN semantics)
+# -------------------------------------------------------------------------
+def data_fingerprint(values: np.ndarray) -> str:
+    """Return a short content hash of a numeric array (shape-aware)."""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    digest = hashlib.blake2b(arr.tobytes(), digest_size=16)
+    digest.update(str(arr.shape).encode())
+    return digest.hexdigest()
+
+
+def rolling_mean_std(
+    values: np.ndarray, windows: Iterable[int], ddof: int = 1, with_std: bool = True
+) -> Dict[int, Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """
+    Rolling mean (and std) for several windows from one pair of cumulative
+    sums. Output is NaN until the window is full or whenever the window holds
+    a NaN, matching pandas rolling(w).mean() / .std(ddof).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    nan_mask = np.isnan(values)
+    finite = values[~nan_mask]
+    ref = finite[0] if finite.size else 0.0
+    centered = np.where(nan_mask, 0.0, values - ref)  # de-mean for precision
+
+    csum = np.concatenate([[0.0], np.cumsum(centered)])
+    csq = np.concatenate([[0.0], np.cumsum(centered**2)]) if with_std else None
+    cnan = np.concatenate([[0], np.cumsum(nan_mask)])
+
+    out: Dict[int, Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+    for w in sorted(set(int(w) for w in windows)):
+        mean = np.full(len(values), np.nan)
+        std = np.full(len(values), np.nan) if with_std else None
+        if 0 < w <= len(values):
+            s1 = csum[w:] - csum[:-w]
+            has_nan = (cnan[w:] - cnan[:-w]) > 0
+            mean[w - 1 :] = np.where(has_nan, np.nan, s1 / w + ref)
+            if with_std and w > ddof:
+                s2 = csq[w:] - csq[:-w]
+                var = np.maximum((s2 - s1**2 / w) / (w - ddof), 0.0)
+                std[w - 1 :] = np.where(has_nan, np.nan, np.sqrt(var))
+        out[w] = (mean, std)
+    return out
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average."""
+    return rolling_mean_std(values, [window], with_std=False)[int(window)][0]
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Rolling sample standard deviation."""
+    return rolling_mean_std(values, [window], ddof=ddof)[int(window)][1]
+
+
+def zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """(x - rolling mean) / rolling std over `window`."""
+    values = np.asarray(values, dtype=np.float64)
+    mean, std = rolling_mean_std(values, [window])[int(window)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (values - mean) / std
+
+
+def pct_change(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """x[t] / x[t - periods] - 1 (NaN for the first `periods` points)."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if 0 < periods < len(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[periods:] = values[periods:] / values[:-periods] - 1.0
+    return out
+
+
+def log_return(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """log(x[t] / x[t - periods])."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if 0 < periods < len(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[periods:] = np.log(values[periods:] / values[:-periods])
+    return out
+
+
+# name -> (function(values, window), points of history needed before the first output)
+INDICATORS: Dict[str, Tuple[Callable[[np.ndarray, int], np.ndarray], Callable[[int], int]]] = {
+    "sma": (sma, lambda w: w - 1),
+    "std": (rolling_std, lambda w: w - 1),
+    "zscore": (zscore, lambda w: w - 1),
+    "pct_change": (pct_change, lambda w: w),
+    "log_return": (log_return, lambda w: w),
+}
+
+
+# -------------------------------------------------------------------------
+# Shared memoizing cache
+# -------------------------------------------------------------------------
+def _locked(method):
+    """Serialize a cache method on the instance's re-entrant lock."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class IndicatorCache:
+    """
+    Memory-bounded LRU cache of indicator arrays keyed by
+    (series id, indicator, window, version).
+
+    - Anonymous arrays are identified by their content fingerprint.
+    - Named series (e.g. "BTC/USD:close") are registered once and then kept
+      current with `append()` (live) or `sync()` (rolling buffers); every
+      update bumps the version and cached indicators are extended in place
+      from the new bars only.
+
+    Bookkeeping is serialized on a re-entrant lock, so one cache can be
+    shared by strategies running on several threads; indicator misses are
+    computed outside the lock (see get_many).
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_length: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_length = max_length
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._series: Dict[Hashable, Dict[str, object]] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Series management
+    # ------------------------------------------------------------------
+    @_locked
+    def register(self, series_id: Hashable, values: np.ndarray) -> None:
+        """(Re)define a named series; cached indicators of older versions expire."""
+        values = np.array(values, dtype=np.float64)
+        if self.max_length is not None:
+            values = values[-self.max_length :]
+        previous = self._series.get(series_id)
+        version = int(previous["version"]) + 1 if previous else 0  # type: ignore[call-overload]
+        self._drop_series_entries(series_id)
+        self._series[series_id] = {"values": values, "version": version}
+
+    @_locked
+    def append(
+        self, series_id: Hashable, new_values: np.ndarray, keep: Optional[int] = None
+    ) -> None:
+        """
+        Append new bars to a named series and extend every cached indicator
+        of that series using only the tail that the new bars affect.
+        `keep` trims the series to its last `keep` points (rolling buffers).
+        """
+        new_values = np.atleast_1d(np.asarray(new_values, dtype=np.float64))
+        if series_id not in self._series:
+            self.register(series_id, new_values)
+            return
+        if new_values.size == 0:
+            return
+
+        state = self._series[series_id]
+        old_version = int(state["version"])  # type: ignore[call-overload]
+        full = np.concatenate([state["values"], new_values])  # type: ignore[list-item]
+        limit = min(x for x in (keep, self.max_length, len(full)) if x is not None)
+        full = full[-limit:]
+        state["values"] = full
+        state["version"] = old_version + 1
+
+        k = len(new_values)
+        for key in [key for key in self._entries if key[0] == series_id]:
+            arr = self._pop(key)
+            if key[3] != old_version:
+                continue
+            _, indicator, window, _ = key
+            func, lookback = INDICATORS[indicator]
+            need = k + lookback(window)
+            if need >= len(full):
+                extended = func(full, window)
+            else:
+                tail = func(full[-need:], window)[-k:]
+                extended = np.concatenate([arr, tail])[-len(full) :]
+            self._put((series_id, indicator, window, old_version + 1), extended)
+
+    @_locked
+    def sync(self, series_id: Hashable, values: np.ndarray) -> None:
+        """
+        Bring a named series in line with `values`, which is expected to be
+        the old series plus new bars (optionally with the oldest bars dropped,
+        as in a rolling buffer). The whole overlap must match exactly;
+        anything else triggers a full re-register.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        state = self._series.get(series_id)
+        if state is None:
+            self.register(series_id, values)
+            return
+
+        old = state["values"]
+        n_old, n_new = len(old), len(values)  # type: ignore[arg-type]
+        if n_new == n_old and _same(values, old, 0, 0, n_new):  # type: ignore[arg-type]
+            return
+        for shift in range(0, min(n_old, n_new)):
+            added = n_new - (n_old - shift)
+            overlap = n_old - shift
+            if added <= 0 or overlap <= 0:
+                continue
+            if _same(values, old, 0, shift, overlap):  # type: ignore[arg-type]
+                self.append(series_id, values[-added:], keep=n_new)
+                return
+            if shift >= 64:
+                break
+        self.register(series_id, values)
+
+    def values(self, series_id: Hashable) -> np.ndarray:
+        return self._series[series_id]["values"]  # type: ignore[return-value]
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def get(self, series_id: Hashable, indicator: str, window: int) -> np.ndarray:
+        """Indicator for a registered series (computed on first use)."""
+        return self.get_many(series_id, indicator, [window])[int(window)]
+
+    def get_many(
+        self, series_id: Hashable, indicator: str, windows: Iterable[int]
+    ) -> Dict[int, np.ndarray]:
+        """
+        Several windows of one indicator; misses for sma/std share one pass.
+
+        Lookups and inserts hold the lock, the computation of misses does not,
+        so threads working on different series compute concurrently. A result
+        is only cached if its series was not updated in the meantime.
+        """
+        with self._lock:
+            lookup = self._lookup(series_id, indicator, windows)
+        return self._fill(series_id, indicator, *lookup)
+
+    def _lookup(self, series_id: Hashable, indicator: str, windows: Iterable[int]):
+        """Cached windows and misses of a series snapshot (caller holds the lock)."""
+        if indicator not in INDICATORS:
+            raise ValueError(f"Unknown indicator '{indicator}'")
+        state = self._series[series_id]
+        version, values = state["version"], state["values"]
+        out: Dict[int, np.ndarray] = {}
+        missing = []
+        for w in sorted(set(int(w) for w in windows)):
+            key = (series_id, indicator, w, version)
+            arr = self._entries.get(key)
+            if arr is None:
+                missing.append(w)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                out[w] = arr
+        self.misses += len(missing)
+        return values, version, out, missing
+
+    def _fill(self, series_id, indicator, values, version, out, missing) -> Dict[int, np.ndarray]:
+        """Compute the misses of a _lookup() snapshot without the lock, then cache them."""
+        if not missing:
+            return out
+        if indicator in ("sma", "std"):
+            with_std = indicator == "std"
+            stats = rolling_mean_std(values, missing, with_std)
+            computed = {w: stats[w][int(with_std)] for w in missing}
+        else:
+            func = INDICATORS[indicator][0]
+            computed = {w: func(values, w) for w in missing}
+
+        with self._lock:
+            current = self._series.get(series_id)
+            fresh = current is not None and current["values"] is values
+            for w, arr in computed.items():
+                if fresh:
+                    self._put((series_id, indicator, w, version), arr)
+                else:
+                    arr.setflags(write=False)
+                out[w] = arr
+        return out
+
+    def compute(
+        self,
+        values: np.ndarray,
+        indicator: str,
+        window: int,
+        series_id: Optional[Hashable] = None,
+    ) -> np.ndarray:
+        """Indicator for raw values; anonymous arrays are keyed by fingerprint."""
+        return self.compute_many(values, indicator, [window], series_id)[int(window)]
+
+    def compute_many(
+        self,
+        values: np.ndarray,
+        indicator: str,
+        windows: Iterable[int],
+        series_id: Optional[Hashable] = None,
+    ) -> Dict[int, np.ndarray]:
+        anonymous = series_id is None
+        if anonymous:
+            values = np.asarray(values, dtype=np.float64)
+            series_id = ("fp", data_fingerprint(values))
+        with self._lock:
+            if not anonymous:
+                self.sync(series_id, values)
+            elif series_id not in self._series:
+                # Private read-only copy: the caller may reuse its buffer in place
+                values = np.array(values, dtype=np.float64, copy=True)
+                values.setflags(write=False)
+                self._series[series_id] = {"values": values, "version": 0}
+            lookup = self._lookup(series_id, indicator, windows)
+        return self._fill(series_id, indicator, *lookup)
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+    def _put(self, key: tuple, arr: np.ndarray) -> None:
+        arr.setflags(write=False)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key).nbytes
+        self._entries[key] = arr
+        self.nbytes += arr.nbytes
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old = self._entries.popitem(last=False)
+            self.nbytes -= old.nbytes
+            self._forget_anonymous(old_key[0])
+
+    def _pop(self, key: tuple) -> np.ndarray:
+        arr = self._entries.pop(key)
+        self.nbytes -= arr.nbytes
+        return arr
+
+    def _drop_series_entries(self, series_id: Hashable) -> None:
+        for key in [key for key in self._entries if key[0] == series_id]:
+            self._pop(key)
+
+    def _forget_anonymous(self, series_id: Hashable) -> None:
+        """Release fingerprint-keyed source arrays once nothing refers to them."""
+        if isinstance(series_id, tuple) and series_id[:1] == ("fp",):
+            if not any(key[0] == series_id for key in self._entries):
+                self._series.pop(series_id, None)
+
+    @_locked
+    def clear(self) -> None:
+        self._entries.clear()
+        self._series.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @_locked
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "series": len(self._series),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _same(new: np.ndarray, old: np.ndarray, new_start: int, old_start: int, length: int) -> bool:
+    """Whether two overlapping segments are identical (NaN equals NaN)."""
+    # Cheap endpoint check first: most mismatching shifts fail here
+    if not np.array_equal(
+        new[[new_start, new_start + length - 1]],
+        old[[old_start, old_start + length - 1]],
+        equal_nan=True,
+    ):
+        return False
+    return bool(
+        np.array_equal(
+            new[new_start : new_start + length], old[old_start : old_start + length], equal_nan=True
+        )
+    )
+
+
+# Process-wide cache shared by strategies, features and regime detection
+_default_cache = IndicatorCache()
+
+
+def get_cache() -> IndicatorCache:
+    """Return the shared process-wide indicator cache."""
+    return _default_cache
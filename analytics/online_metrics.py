@@ -0,0 +1,273 @@
+# analytics/online_metrics.py
+"""
+NEXORA Online Performance Metrics
+---------------------------------
+Streaming counterpart of backtest.performance_metrics.compute_performance_metrics:
+an accumulator that is updated with each new equity value in O(1) and can be
+queried for Sharpe, Sortino, volatility, drawdown and win rate at any time.
+
+- returns mean / variance: Welford's algorithm,
+- Sortino: Welford moments of the negative returns only (same definition as
+  compute_performance_metrics),
+- drawdown: running peak and running worst drawdown,
+- optional EWMA (half-life in updates) mean / variance / downside deviation
+  for a "recent" Sharpe and volatility.
+
+`update_many()` folds a whole array in with vectorized moments (Chan's
+parallel merge) and scipy's linear filter for the EWMA recursions, so
+backtests and live trading share one implementation.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+class OnlineMetrics:
+    """
+    O(1)-per-update performance metrics of an equity stream.
+
+    Usage:
+        metrics = OnlineMetrics(initial_equity=1000.0, halflife=500)
+        metrics.update(1012.5)
+        metrics.sharpe_ratio, metrics.max_drawdown, metrics.snapshot()
+
+        # Backtests: same accumulator from a whole curve
+        OnlineMetrics.from_equity(equity_curve).snapshot()
+    """
+
+    def __init__(
+        self,
+        initial_equity: Optional[float] = None,
+        risk_free_rate: float = 0.0,
+        periods_per_year: int = 252,
+        halflife: Optional[float] = None,
+    ):
+        self.risk_free_rate = float(risk_free_rate)
+        self.periods_per_year = periods_per_year
+        self.halflife = halflife
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife) if halflife else None
+
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+
+        # Welford moments of all / negative returns
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.neg_n = 0
+        self.neg_mean = 0.0
+        self.neg_m2 = 0.0
+        self.wins = 0
+
+        # EWMA state (only with a half-life)
+        self.ew_mean: Optional[float] = None
+        self.ew_var = 0.0
+        self.ew_down = 0.0
+
+        if initial_equity is not None:
+            self.update(initial_equity)
+
+    @classmethod
+    def from_equity(cls, equity, **kwargs) -> "OnlineMetrics":
+        """Accumulator over a full equity curve (batch path)."""
+        metrics = cls(**kwargs)
+        metrics.update_many(equity)
+        return metrics
+
+    @property
+    def _rf(self) -> float:
+        return self.risk_free_rate / self.periods_per_year
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def update(self, equity: float) -> None:
+        """Add one equity observation."""
+        equity = float(equity)
+        if self.last is None:
+            self.first = self.last = self.peak = equity
+            return
+
+        r = equity / self.last - 1.0
+        self.last = equity
+
+        self.n += 1
+        delta = r - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (r - self.mean)
+        if r < 0:
+            self.neg_n += 1
+            delta = r - self.neg_mean
+            self.neg_mean += delta / self.neg_n
+            self.neg_m2 += delta * (r - self.neg_mean)
+        elif r > 0:
+            self.wins += 1
+
+        if equity > self.peak:
+            self.peak = equity
+        self.max_drawdown = min(self.max_drawdown, equity / self.peak - 1.0)
+
+        if self.alpha is not None:
+            a = self.alpha
+            down = min(r - self._rf, 0.0) ** 2
+            if self.ew_mean is None:
+                self.ew_mean, self.ew_var, self.ew_down = r, 0.0, down
+            else:
+                diff = r - self.ew_mean
+                self.ew_mean += a * diff
+                self.ew_var = (1 - a) * (self.ew_var + a * diff * diff)
+                self.ew_down = (1 - a) * self.ew_down + a * down
+
+    def update_many(self, equity) -> None:
+        """Add an array of equity observations at once (vectorized, same result as update())."""
+        values = np.asarray(equity, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        if self.last is None:
+            self.update(values[0])
+            values = values[1:]
+            if values.size == 0:
+                return
+
+        returns = values / np.concatenate([[self.last], values[:-1]]) - 1.0
+        self.n, self.mean, self.m2 = _merge(self.n, self.mean, self.m2, returns)
+        negative = returns[returns < 0]
+        self.neg_n, self.neg_mean, self.neg_m2 = _merge(
+            self.neg_n, self.neg_mean, self.neg_m2, negative
+        )
+        self.wins += int(np.count_nonzero(returns > 0))
+
+        peaks = np.maximum.accumulate(np.concatenate([[self.peak], values]))[1:]
+        self.max_drawdown = min(self.max_drawdown, float((values / peaks - 1.0).min()))
+        self.peak = float(peaks[-1])
+        self.last = float(values[-1])
+
+        if self.alpha is not None:
+            self._ewm_many(returns)
+
+    def _ewm_many(self, returns: np.ndarray) -> None:
+        a = self.alpha
+        down = np.minimum(returns - self._rf, 0.0) ** 2
+        if self.ew_mean is None:
+            self.ew_mean, self.ew_var, self.ew_down = float(returns[0]), 0.0, float(down[0])
+            returns, down = returns[1:], down[1:]
+            if returns.size == 0:
+                return
+
+        # y_t = (1 - a) y_{t-1} + b x_t, seeded with the current state
+        def smooth(x, y0, b):
+            return lfilter([b], [1.0, -(1.0 - a)], x, zi=[(1.0 - a) * y0])[0]
+
+        means = smooth(returns, self.ew_mean, a)
+        diff = returns - np.concatenate([[self.ew_mean], means[:-1]])
+        self.ew_var = float(smooth(diff**2, self.ew_var, (1.0 - a) * a)[-1])
+        self.ew_down = float(smooth(down, self.ew_down, a)[-1])
+        self.ew_mean = float(means[-1])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @property
+    def equity(self) -> float:
+        return self.last if self.last is not None else 0.0
+
+    @property
+    def total_return(self) -> float:
+        return self.last / self.first - 1.0 if self.first else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else float("nan")
+
+    @property
+    def volatility(self) -> float:
+        return self.std * np.sqrt(self.periods_per_year)
+
+    @property
+    def sharpe_ratio(self) -> float:
+        std = self.std
+        return np.sqrt(self.periods_per_year) * (self.mean - self._rf) / std if std > 0 else 0.0
+
+    @property
+    def sortino_ratio(self) -> float:
+        downside = np.sqrt(self.neg_m2 / (self.neg_n - 1)) if self.neg_n > 1 else 0.0
+        if downside > 0:
+            return np.sqrt(self.periods_per_year) * (self.mean - self._rf) / downside
+        return 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.n if self.n else 0.0
+
+    @property
+    def drawdown(self) -> float:
+        """Current drawdown from the running peak (<= 0)."""
+        return self.last / self.peak - 1.0 if self.last is not None else 0.0
+
+    @property
+    def ewma_volatility(self) -> float:
+        return float(np.sqrt(self.ew_var * self.periods_per_year)) if self.alpha else 0.0
+
+    @property
+    def ewma_sharpe(self) -> float:
+        if not self.alpha or self.ew_var <= 0:
+            return 0.0
+        return np.sqrt(self.periods_per_year) * (self.ew_mean - self._rf) / np.sqrt(self.ew_var)
+
+    @property
+    def ewma_sortino(self) -> float:
+        if not self.alpha or self.ew_down <= 0:
+            return 0.0
+        return np.sqrt(self.periods_per_year) * (self.ew_mean - self._rf) / np.sqrt(self.ew_down)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current metrics, keyed and rounded like compute_performance_metrics()."""
+        if self.n == 0:
+            metrics: Dict[str, Any] = {
+                "total_return": 0.0,
+                "sharpe_ratio": 0.0,
+                "sortino_ratio": 0.0,
+                "max_drawdown": 0.0,
+                "win_rate": 0.0,
+                "volatility": 0.0,
+                "trades": 0,
+            }
+        else:
+            metrics = {
+                "total_return": round(float(self.total_return), 4),
+                "sharpe_ratio": round(float(self.sharpe_ratio), 3),
+                "sortino_ratio": round(float(self.sortino_ratio), 3),
+                "max_drawdown": round(float(self.max_drawdown), 4),
+                "win_rate": round(float(self.win_rate), 3),
+                "volatility": round(float(self.volatility), 3),
+                "trades": int(self.n),
+            }
+        metrics["equity"] = round(float(self.equity), 2)
+        metrics["drawdown"] = round(float(self.drawdown), 4)
+        if self.alpha is not None:
+            metrics["ewma_sharpe"] = round(float(self.ewma_sharpe), 3)
+            metrics["ewma_sortino"] = round(float(self.ewma_sortino), 3)
+            metrics["ewma_volatility"] = round(float(self.ewma_volatility), 3)
+        return metrics
+
+
+def _merge(n: int, mean: float, m2: float, values: np.ndarray):
+    """Chan et al. merge of (n, mean, M2) with the moments of `values`."""
+    k = values.size
+    if k == 0:
+        return n, mean, m2
+    chunk_mean = float(values.mean())
+    chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+    total = n + k
+    delta = chunk_mean - mean
+    return (
+        total,
+        mean + delta * k / total,
+        m2 + chunk_m2 + delta * delta * n * k / total,
+    )
@@ -1,88 +1,294 @@
 # backtest_runner.py
 import os
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import pandas as pd
 
+from backtest.checkpoint import CheckpointLog, job_key
+from backtest.engine import VectorizedBacktester
 from backtest.performance_metrics import BacktestReportGenerator
+from backtest.portfolio_backtest import PortfolioBacktester
+from backtest.report_pipeline import ReportPipeline
+from backtest.shared_data import SharedDatasetStore, SharedFrameLoader
 from strategies.mean_reversion import MeanReversionStrategy
 from strategies.statistical_arbitrage import StatisticalArbitrageStrategy
 from strategies.trend_following import TrendFollowingStrategy
 
+TIME_COLUMNS = ("timestamp", "time", "datetime", "date")
+
+
+# -------------------------------------------------------------------------
+# Job helpers (module level so process workers can run them)
+# -------------------------------------------------------------------------
+def _time_indexed(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index a symbol frame by its timestamp column (sorted, last duplicate kept)
+    so streams of different symbols line up by time. Frames without one are
+    labelled by bars before their end (-n .. -1), i.e. aligned on the last bar.
+    """
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df
+    column = next((c for c in TIME_COLUMNS if c in df.columns), None)
+    if column is None:
+        return df.set_axis(pd.RangeIndex(-len(df), 0), axis=0)
+    stamps = df[column]
+    unit = "s" if pd.api.types.is_numeric_dtype(stamps) else None
+    frame = df.drop(columns=column).set_axis(pd.DatetimeIndex(pd.to_datetime(stamps, unit=unit)))
+    return frame[~frame.index.duplicated(keep="last")].sort_index(kind="stable")
+
+
+def _strategy_data(strategy_cls, symbol: str, load: Callable, benchmark: str) -> Dict[str, Any]:
+    """Shape the (time-indexed) symbol frame(s) into the input each strategy expects."""
+    df = _time_indexed(load(symbol))
+    if strategy_cls is StatisticalArbitrageStrategy:
+        # Pairs are traded against the first (benchmark) symbol on their common bars
+        if symbol == benchmark:
+            raise ValueError(f"{symbol} is the pairs benchmark")
+        x = _time_indexed(load(benchmark))
+        common = x.index.intersection(df.index)
+        return {"X": x.loc[common], "Y": df.loc[common]}
+    prices = df["close"].astype(float)
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def _run_job(
+    engine: VectorizedBacktester,
+    strategy_cls,
+    symbol: str,
+    load: Callable,
+    benchmark: str,
+    curve_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run one (strategy, symbol) backtest and return its metrics row."""
+    try:
+        strategy = strategy_cls()
+        data = _strategy_data(strategy_cls, symbol, load, benchmark)
+        result = engine.run_strategy(strategy, data)
+
+        if curve_dir and engine.save_equity_curves:
+            os.makedirs(curve_dir, exist_ok=True)
+            curve_path = os.path.join(curve_dir, f"{strategy_cls.__name__}_{symbol}.csv")
+            result["equity"].to_csv(curve_path, header=True)
+
+        results = dict(result["metrics"])
+        results["strategy"] = strategy_cls.__name__
+        results["symbol"] = symbol
+        print(f"✅ Completed {strategy_cls.__name__} on {symbol}")
+        return results
+
+    except Exception as e:
+        print(f"❌ Error in {strategy_cls.__name__} on {symbol}: {e}")
+        traceback.print_exc()
+        return {
+            "strategy": strategy_cls.__name__,
+            "symbol": symbol,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+        }
+
+
+_worker_loader: Optional[SharedFrameLoader] = None
+
+
+def _init_worker(specs) -> None:
+    """Process-pool initializer: attach lazily to the shared datasets by name."""
+    global _worker_loader
+    _worker_loader = SharedFrameLoader(specs)
+
+
+def _run_shared_job(engine, strategy_cls, symbol, benchmark, curve_dir) -> Dict[str, Any]:
+    return _run_job(engine, strategy_cls, symbol, _worker_loader, benchmark, curve_dir)
+
+
+STRATEGIES = {
+    "TrendFollowing": TrendFollowingStrategy,
+    "MeanReversion": MeanReversionStrategy,
+    "StatArbitrage": StatisticalArbitrageStrategy,
+}
+
+
+def resolve_strategy(name: str):
+    """Strategy class for a runner name ("TrendFollowing") or class name; None if unknown."""
+    for key, cls in STRATEGIES.items():
+        if name in (key, cls.__name__):
+            return cls
+    return None
+
 
 class BacktestRunner:
     """
     Runs all enabled strategies concurrently and aggregates results
     into CSV and HTML summaries for analysis.
+
+    mode="thread" keeps the original thread pool; mode="process" loads every
+    symbol CSV once into shared memory and fans the (strategy × symbol) jobs
+    out over a process pool whose workers attach to the data by name.
+
+    `checkpoint` (a path or CheckpointLog) makes runs resumable: completed
+    (strategy, symbol, params) jobs are streamed to an append-only log and
+    skipped when the run is restarted.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        engine: VectorizedBacktester = None,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        checkpoint=None,
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown execution mode '{mode}'")
+        self.engine = engine or VectorizedBacktester.from_settings()
+        self.mode = mode
+        self.max_workers = max_workers or (os.cpu_count() or 1 if mode == "process" else 4)
         self.results_dir = os.path.join("F:", "NEXORA", "reports", "backtests")
         os.makedirs(self.results_dir, exist_ok=True)
-        self.strategies = {
-            "TrendFollowing": TrendFollowingStrategy,
-            "MeanReversion": MeanReversionStrategy,
-            "StatArbitrage": StatisticalArbitrageStrategy,
-        }
+        self.strategies = dict(STRATEGIES)
         self.symbols = ["AAPL", "GOOG", "MSFT", "AMZN"]
         self.data_dir = os.path.join("F:", "NEXORA", "data", "cleaned")
+        if checkpoint is not None and not isinstance(checkpoint, CheckpointLog):
+            checkpoint = CheckpointLog(checkpoint)
+        self.checkpoint = checkpoint
 
     # -------------------------------------------------------------------------
+    @property
+    def curve_dir(self) -> str:
+        return os.path.join(self.results_dir, "equity_curves")
+
+    def _load(self, symbol: str) -> pd.DataFrame:
+        data_path = os.path.join(self.data_dir, f"{symbol}.csv")
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Missing data file: {data_path}")
+        return pd.read_csv(data_path)
+
     def run_strategy(self, strategy_cls, symbol: str) -> Dict[str, Any]:
         """
-        Run a single strategy for a given symbol and return performance results.
+        Run a single strategy for a given symbol through the vectorized
+        engine (costs from settings) and return its performance metrics.
         """
-        try:
-            strategy = strategy_cls()
-            data_path = os.path.join(self.data_dir, f"{symbol}.csv")
+        return _run_job(
+            self.engine, strategy_cls, symbol, self._load, self.symbols[0], self.curve_dir
+        )
 
-            if not os.path.exists(data_path):
-                raise FileNotFoundError(f"Missing data file: {data_path}")
+    # -------------------------------------------------------------------------
+    def _job_key(self, strategy_cls, symbol: str) -> str:
+        return job_key(strategy_cls.__name__, symbol, strategy_cls().parameters())
 
-            data = pd.read_csv(data_path)
-            results = strategy.run(data)
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each (strategy, symbol) result as soon as it completes. With a
+        checkpoint, jobs completed by an earlier run are yielded from the log
+        and every new successful result is appended to it before being yielded.
+        """
+        jobs = [(cls, sym) for cls in self.strategies.values() for sym in self.symbols]
+        if self.checkpoint is None:
+            yield from self._run_jobs(jobs)
+            return
 
-            results["strategy"] = strategy_cls.__name__
-            results["symbol"] = symbol
-            print(f"✅ Completed {strategy_cls.__name__} on {symbol}")
-            return results
+        keys = {(cls.__name__, sym): self._job_key(cls, sym) for cls, sym in jobs}
+        pending = [
+            (cls, sym) for cls, sym in jobs if keys[(cls.__name__, sym)] not in self.checkpoint
+        ]
+        if len(pending) < len(jobs):
+            print(f"♻️  Resuming: {len(jobs) - len(pending)}/{len(jobs)} jobs already completed")
+        for cls, sym in jobs:
+            if (cls, sym) not in pending:
+                yield self.checkpoint.get(keys[(cls.__name__, sym)])
 
-        except Exception as e:
-            print(f"❌ Error in {strategy_cls.__name__} on {symbol}: {e}")
-            traceback.print_exc()
-            return {
-                "strategy": strategy_cls.__name__,
-                "symbol": symbol,
-                "error": str(e),
-                "traceback": traceback.format_exc(),
-            }
+        for res in self._run_jobs(pending):
+            key = keys.get((res.get("strategy"), res.get("symbol")))
+            if key is not None and "error" not in res:
+                self.checkpoint.append(key, res)
+            yield res
 
-    # -------------------------------------------------------------------------
-    def run_all(self) -> List[Dict[str, Any]]:
+    def _run_jobs(self, jobs) -> Iterator[Dict[str, Any]]:
+        if not jobs:
+            return
+
+        if self.mode == "thread":
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self.run_strategy, cls, sym) for cls, sym in jobs]
+                yield from self._completed(futures)
+            return
+
+        with SharedDatasetStore() as store:
+            needed = {sym for _, sym in jobs} | {self.symbols[0]}
+            for symbol in [sym for sym in self.symbols if sym in needed]:
+                try:
+                    store.put(symbol, _time_indexed(self._load(symbol)))
+                except FileNotFoundError as e:
+                    print(f"⚠️  {e}")
+            print(f"📦 Shared {len(store.specs)} datasets ({store.nbytes / 1e6:.1f} MB)")
+
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker, initargs=(store.specs,)
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _run_shared_job, self.engine, cls, sym, self.symbols[0], self.curve_dir
+                    )
+                    for cls, sym in jobs
+                ]
+                yield from self._completed(futures)
+
+    @staticmethod
+    def _completed(futures) -> Iterator[Dict[str, Any]]:
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                print(f"⚠️  Worker failed with: {e}")
+
+    def run_all(self, on_result: Optional[Callable] = None) -> List[Dict[str, Any]]:
         """
         Run all enabled strategies concurrently across all symbols.
+        `on_result` is called with every result as it arrives.
         """
-        print("\n🚀 Starting backtests for all strategies...\n")
+        print(f"\n🚀 Starting backtests for all strategies ({self.mode} mode)...\n")
         results = []
-        futures = []
+        for res in self.iter_results():
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
 
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            for strat_name, strat_cls in self.strategies.items():
-                for symbol in self.symbols:
-                    futures.append(executor.submit(self.run_strategy, strat_cls, symbol))
+        print(f"\n✅ Total completed strategy runs: {len(results)}")
+        if self.engine.result_cache is not None:
+            stats = self.engine.result_cache.stats()
+            print(f"🗃️  Result cache hit rate: {stats['hit_rate']:.1%} ({stats['entries']} cached)")
+        return results
 
-            for future in as_completed(futures):
+    # -------------------------------------------------------------------------
+    def run_portfolio(
+        self, params: Optional[Dict[str, Dict[str, Any]]] = None, **overrides
+    ) -> Dict[str, Any]:
+        """
+        Backtest every enabled strategy × symbol together on shared capital
+        (PortfolioBacktester with the portfolio/risk settings and this engine's
+        capital and costs). `params` maps strategy name → parameter overrides;
+        `overrides` are passed to PortfolioBacktester.
+        """
+        params = params or {}
+        jobs = []
+        for name, cls in self.strategies.items():
+            for symbol in self.symbols:
                 try:
-                    res = future.result()
-                    results.append(res)
-                except Exception as e:
-                    print(f"⚠️  Worker failed with: {e}")
+                    data = _strategy_data(cls, symbol, self._load, self.symbols[0])
+                except (FileNotFoundError, ValueError) as e:
+                    print(f"⚠️  Skipping {name} on {symbol}: {e}")
+                    continue
+                jobs.append((name, symbol, cls(), data, params.get(name)))
 
-        print(f"\n✅ Total completed strategy runs: {len(results)}")
-        return results
+        backtester = PortfolioBacktester.from_settings(**{**self.engine.cost_settings, **overrides})
+        result = backtester.run_strategies(jobs)
+        metrics = result["metrics"]
+        print(
+            f"\n📈 Portfolio of {len(jobs)} streams: return {metrics['total_return']:.2%}, "
+            f"Sharpe {metrics['sharpe_ratio']:.2f}, max DD {metrics['max_drawdown']:.2%}"
+        )
+        return result
 
     # -------------------------------------------------------------------------
     def save_summary(self, results: List[Dict[str, Any]]):
@@ -109,11 +315,38 @@ class BacktestRunner:
             print(f"❌ Could not generate HTML report: {e}")
             traceback.print_exc()
 
+    # -------------------------------------------------------------------------
+    def generate_reports(
+        self,
+        results: List[Dict[str, Any]],
+        output_dir: Optional[str] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Render per-(strategy, symbol) HTML reports from the saved equity curves,
+        comparison charts and an index page on a process pool. Reports whose
+        inputs are unchanged since the last run are skipped.
+        """
+        pipeline = ReportPipeline(
+            output_dir or os.path.join(self.results_dir, "html"), max_workers=self.max_workers
+        )
+        outcome = pipeline.run(results, curve_dir=self.curve_dir, force=force)
+        print(
+            f"🧾 Reports: {len(outcome['rendered'])} rendered, "
+            f"{len(outcome['skipped'])} unchanged → {outcome['index']}"
+        )
+        return outcome
+
     # -------------------------------------------------------------------------
     def run_pipeline(self):
         """Convenience wrapper: runs all tests and saves results."""
         results = self.run_all()
         self.save_summary(results)
+        try:
+            self.generate_reports(results)
+        except Exception as e:
+            print(f"❌ Could not generate HTML reports: {e}")
+            traceback.print_exc()
         print("\n🎯 Backtesting pipeline completed successfully.\n")
 
 
@@ -0,0 +1,112 @@
+# backtest/checkpoint.py
+"""
+NEXORA Run Checkpoints
+----------------------
+Append-only JSONL log of completed backtest / optimization jobs, so a
+crashed multi-hour run resumes with only its unfinished work.
+
+- one line per completed job: {"key": ..., "result": {...}, "time": ...};
+- each line is flushed and fsync'ed before the next job is recorded, so a
+  crash loses at most the job being written;
+- on load, a torn final line (crash mid-write) is truncated away;
+- jobs are keyed by (strategy, symbol or data file, normalized params), see
+  job_key(); failed jobs are never recorded, so they are retried on resume.
+
+Usage:
+    log = CheckpointLog("logs/run.checkpoint.jsonl")
+    key = job_key("TrendFollowing", "AAPL", params)
+    if key not in log:
+        log.append(key, run(...))
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from backtest.result_cache import normalize_params
+
+
+def job_key(strategy: Any, symbol: Any = None, params: Optional[Dict[str, Any]] = None) -> str:
+    """Canonical identity of one job: strategy name, symbol (or data path) and params."""
+    name = strategy if isinstance(strategy, str) else getattr(strategy, "__name__", str(strategy))
+    return f"{name}|{'' if symbol is None else symbol}|{normalize_params(params)}"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class CheckpointLog:
+    """Durable, append-only record of completed jobs (thread-safe)."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._done: Dict[str, Any] = {}
+        self._load()
+
+    def __getstate__(self):
+        # Picklable for process pools (only the parent process appends)
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # A final line without "\n" was torn by a crash: drop it so the next
+        # append starts on a fresh line
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+        for line in data[:complete].decode("utf-8", errors="replace").splitlines():
+            try:
+                record = json.loads(line)
+                self._done[record["key"]] = record["result"]
+            except (ValueError, KeyError, TypeError):
+                continue  # corrupt or foreign line
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._done.get(key, default)
+
+    def results(self) -> Iterator[Any]:
+        return iter(list(self._done.values()))
+
+    def append(self, key: str, result: Any) -> None:
+        """Record a completed job; durable once this returns."""
+        line = json.dumps({"key": key, "result": result, "time": time.time()}, default=_plain)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._done[key] = json.loads(line)["result"]
+
+    def clear(self) -> None:
+        """Forget every completed job (start the next run from scratch)."""
+        with self._lock:
+            self._done.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,180 @@
+# backtest/engine.py
+"""
+NEXORA Vectorized Backtest Engine
+---------------------------------
+Turns a position array and per-bar instrument returns into an equity curve,
+a trade list and the full compute_performance_metrics() output, with
+commission and slippage charged on every position change.
+
+Conventions:
+- position[t] is the target exposure (fraction of equity, e.g. -1..1)
+  decided at the close of bar t and held over bar t + 1.
+- returns[t] is the instrument return from bar t - 1 to bar t.
+- Costs are (commission + slippage) × |position change| × equity, charged
+  on the bar where the position changes.
+
+Everything is a handful of O(n) numpy passes, so millions of bars run in
+well under a second. With a BacktestResultCache attached, run_strategy()
+results are memoized by strategy, params, data and cost settings.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from backtest.performance_metrics import compute_performance_metrics
+from backtest.result_cache import BacktestResultCache
+
+DEFAULT_SETTINGS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "settings.yaml"
+)
+
+
+class VectorizedBacktester:
+    """
+    Bar-based vectorized backtester.
+
+    Usage:
+        engine = VectorizedBacktester.from_settings()
+        result = engine.run(positions, returns, prices)
+        result = engine.run_strategy(strategy, data, params)
+    """
+
+    def __init__(
+        self,
+        capital_base: float = 100_000.0,
+        commission: float = 0.001,
+        slippage: float = 0.0005,
+        save_equity_curves: bool = False,
+        result_cache: Optional[BacktestResultCache] = None,
+    ):
+        self.capital_base = float(capital_base)
+        self.commission = float(commission)
+        self.slippage = float(slippage)
+        self.save_equity_curves = bool(save_equity_curves)
+        self.result_cache = result_cache
+
+    @classmethod
+    def from_settings(cls, path: Optional[str] = None, settings: Optional[Dict] = None):
+        """Build an engine from the `backtest` section of settings.yaml."""
+        if settings is None:
+            with open(path or DEFAULT_SETTINGS, "r", encoding="utf-8") as f:
+                settings = yaml.safe_load(f) or {}
+        section = settings.get("backtest", {}) or {}
+        cache_cfg = section.get("result_cache", {}) or {}
+        result_cache = None
+        if cache_cfg.get("enabled", False):
+            result_cache = BacktestResultCache(
+                cache_cfg.get("path"), max_bytes=int(cache_cfg.get("max_mb", 512)) * 1024 * 1024
+            )
+        return cls(
+            capital_base=section.get("capital_base", 100_000.0),
+            commission=section.get("commission", 0.001),
+            slippage=section.get("slippage", 0.0005),
+            save_equity_curves=section.get("save_equity_curves", False),
+            result_cache=result_cache,
+        )
+
+    @property
+    def cost_rate(self) -> float:
+        return self.commission + self.slippage
+
+    @property
+    def cost_settings(self) -> Dict[str, float]:
+        """Everything besides strategy, params and data that changes a result."""
+        return {
+            "capital_base": self.capital_base,
+            "commission": self.commission,
+            "slippage": self.slippage,
+        }
+
+    # ------------------------------------------------------------------
+    def run(
+        self,
+        positions,
+        returns,
+        prices=None,
+        risk_free_rate: float = 0.0,
+    ) -> Dict[str, Any]:
+        """
+        Backtest one position stream.
+
+        Returns:
+            {"equity": Series, "returns": Series (net per-bar strategy returns),
+             "positions": Series, "trades": DataFrame, "metrics": dict}
+        """
+        index = positions.index if isinstance(positions, pd.Series) else None
+        pos = np.nan_to_num(np.asarray(positions, dtype=np.float64))
+        ret = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+        if pos.shape != ret.shape:
+            raise ValueError(f"positions {pos.shape} and returns {ret.shape} must align")
+        if index is None:
+            index = pd.RangeIndex(len(pos))
+
+        # Gross P&L of yesterday's position, minus costs of today's change
+        turnover = np.abs(np.diff(pos, prepend=0.0))
+        strat_ret = np.zeros(len(pos))
+        strat_ret[1:] = pos[:-1] * ret[1:]
+        strat_ret -= turnover * self.cost_rate
+
+        equity_values = self.capital_base * np.cumprod(1.0 + strat_ret)
+        equity = pd.Series(equity_values, index=index, name="equity")
+        trades = self._trades(pos, turnover, equity_values, prices, index)
+
+        metrics = compute_performance_metrics(
+            pd.concat([pd.Series([self.capital_base]), equity], ignore_index=True),
+            risk_free_rate=risk_free_rate,
+        )
+        metrics["trades"] = int(len(trades))
+        metrics["turnover"] = round(float(turnover.sum()), 4)
+        metrics["costs"] = round(float(trades["cost"].sum()) if len(trades) else 0.0, 2)
+        metrics["final_equity"] = round(float(equity_values[-1]), 2) if len(pos) else 0.0
+
+        return {
+            "equity": equity,
+            "returns": pd.Series(strat_ret, index=index, name="returns"),
+            "positions": pd.Series(pos, index=index, name="position"),
+            "trades": trades,
+            "metrics": metrics,
+        }
+
+    def _trades(self, pos, turnover, equity_values, prices, index) -> pd.DataFrame:
+        """One row per position change (fills at the bar's price)."""
+        idx = np.flatnonzero(turnover > 0)
+        before = np.where(idx > 0, pos[idx - 1], 0.0)
+        delta = pos[idx] - before
+        # Strategy returns (and so costs) are relative to the previous bar's equity
+        equity_prev = np.where(idx > 0, equity_values[np.maximum(idx - 1, 0)], self.capital_base)
+        notional = np.abs(delta) * equity_prev
+        trades = pd.DataFrame(
+            {
+                "time": np.asarray(index)[idx],
+                "side": np.where(delta > 0, "BUY", "SELL"),
+                "from_position": before,
+                "to_position": pos[idx],
+                "notional": notional,
+                "cost": notional * self.cost_rate,
+            }
+        )
+        if prices is not None:
+            trades.insert(2, "price", np.asarray(prices, dtype=np.float64)[idx])
+        return trades
+
+    # ------------------------------------------------------------------
+    def run_strategy(self, strategy, data, params=None) -> Dict[str, Any]:
+        """
+        Run a strategy exposing generate_positions(params, data), which returns
+        a frame with "position", "returns" and optionally "price" columns.
+        """
+        params = params or strategy.parameters()
+
+        def compute():
+            frame = strategy.generate_positions(params, data)
+            return self.run(frame["position"], frame["returns"], frame.get("price"))
+
+        if self.result_cache is None:
+            return compute()
+        return self.result_cache.get_or_compute(strategy, params, data, compute, self.cost_settings)
@@ -0,0 +1,185 @@
+# backtest/event_engine.py
+"""
+NEXORA Event-Driven Backtester
+------------------------------
+Replays historical bars through the same components used live:
+
+    strategy.on_bar → PaperExecutor.fill → PortfolioAllocator → RiskManager
+
+but at historical speed:
+- a SimClock replaces the wall clock (all timestamps are simulated),
+- order latency is modeled by scheduling the fill on a priority event
+  queue at bar time + latency instead of sleeping,
+- trade records go to a null or buffered sink instead of one CSV append
+  per trade.
+
+Fills are produced by PaperExecutor.fill(), the same code path paper trading
+uses after its latency sleep, so the same bars yield the same fills.
+"""
+
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from live.paper_executor import PaperExecutor
+from monitoring.logging_utils import NullTradeSink
+from portfolio.allocator import PortfolioAllocator
+from risk.risk_manager import RiskManager
+
+# Event priorities at equal timestamps: fills land before the next bar
+FILL, BAR = 0, 1
+
+
+class SimClock:
+    """Simulated clock exposing the same utcnow() the live components call."""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = start or datetime(1970, 1, 1)
+
+    def utcnow(self) -> datetime:
+        return self._now
+
+    def advance_to(self, when: datetime) -> None:
+        if when > self._now:
+            self._now = when
+
+
+class EventBacktester:
+    """
+    Event-driven backtest over long-format bars
+    (columns: timestamp, symbol, close, ...), one strategy instance per symbol.
+
+    Usage:
+        bt = EventBacktester(TrendFollowingStrategy, config)
+        result = bt.run(bars)
+    """
+
+    def __init__(
+        self,
+        strategy_cls,
+        config: Optional[Dict[str, Any]] = None,
+        size: float = 1.0,
+        trade_sink=None,
+        logger=None,
+        latency_jitter_ms: float = 0.0,
+        trade_on_change: bool = False,
+        seed: Optional[int] = None,
+    ):
+        """
+        size : float
+            Order size attached to every signal.
+        trade_sink :
+            Sink for allocator trade records (default: NullTradeSink).
+        latency_jitter_ms : float
+            Uniform extra latency in [0, jitter) on top of live.latency_ms.
+        trade_on_change : bool
+            Only route a signal when its side differs from the symbol's last
+            routed side (the live engine routes every BUY/SELL).
+        """
+        self.config = config or {}
+        self.strategy_cls = strategy_cls
+        self.size = float(size)
+        self.trade_on_change = trade_on_change
+        self.latency_jitter_ms = float(latency_jitter_ms)
+        self.rng = np.random.default_rng(seed)
+
+        if logger is None:
+            logger = logging.getLogger("EventBacktester")
+            logger.setLevel(logging.WARNING)
+        self.logger = logger
+
+        self.clock = SimClock()
+        self.trade_sink = trade_sink or NullTradeSink()
+        self.executor = PaperExecutor(self.config, clock=self.clock, logger=logger)
+        self.allocator = PortfolioAllocator(
+            logger,
+            {"initial_capital": self.executor.balance},
+            trade_sink=self.trade_sink,
+            clock=self.clock,
+        )
+        self.risk_manager = RiskManager(logger, self.config.get("risk", {}))
+
+        self.symbol_strategies: Dict[Any, Any] = {}
+        self._events: list = []
+        self._seq = itertools.count()
+        self._last_side: Dict[Any, str] = {}
+
+    # ------------------------------------------------------------------
+    def _strategy_for(self, symbol):
+        if symbol not in self.symbol_strategies:
+            self.symbol_strategies[symbol] = self.strategy_cls(config=self.config)
+        return self.symbol_strategies[symbol]
+
+    def _latency(self) -> timedelta:
+        ms = self.executor.latency_ms
+        if self.latency_jitter_ms > 0:
+            ms += self.rng.uniform(0, self.latency_jitter_ms)
+        return timedelta(milliseconds=ms)
+
+    def schedule(self, when: datetime, priority: int, payload: Dict[str, Any]) -> None:
+        heapq.heappush(self._events, (when, priority, next(self._seq), payload))
+
+    def _drain_until(self, when: Optional[datetime]) -> None:
+        """Process every queued event due before `when` (all if None)."""
+        while self._events and (when is None or self._events[0][:2] <= (when, BAR)):
+            due, _, _, payload = heapq.heappop(self._events)
+            self.clock.advance_to(due)
+            self._on_fill(payload)
+
+    # ------------------------------------------------------------------
+    def _on_bar(self, bar: Dict[str, Any]) -> None:
+        signal = self._strategy_for(bar.get("symbol")).on_bar(bar)
+        if not signal or signal.get("side") not in ("BUY", "SELL"):
+            return
+        symbol = signal["symbol"]
+        if self.trade_on_change and self._last_side.get(symbol) == signal["side"]:
+            return
+        self._last_side[symbol] = signal["side"]
+
+        order = dict(signal)
+        order.setdefault("size", self.size)
+        self.schedule(self.clock.utcnow() + self._latency(), FILL, order)
+
+    def _on_fill(self, order: Dict[str, Any]) -> None:
+        trade = self.executor.fill(order)
+        self.allocator.allocate_capital(
+            {
+                "symbol": trade["symbol"],
+                "side": trade["side"],
+                "qty": trade["size"],
+                "price": trade["executed_price"],
+            },
+            trade["executed_price"],
+        )
+        self.risk_manager.evaluate_risk(self.allocator)
+
+    # ------------------------------------------------------------------
+    def run(self, bars: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Replay bars in timestamp order and return:
+            {"trades": executor fills, "equity": allocator equity series,
+             "balance": final executor balance, "positions": executor positions,
+             "risk_state": last risk state}
+        """
+        frame = bars.sort_values("timestamp", kind="stable")
+        times = pd.to_datetime(frame["timestamp"]).dt.to_pydatetime()
+
+        for when, bar in zip(times, frame.to_dict("records")):
+            self._drain_until(when)
+            self.clock.advance_to(when)
+            self._on_bar(bar)
+        self._drain_until(None)
+        self.trade_sink.flush()
+
+        return {
+            "trades": pd.DataFrame(self.executor.trade_log),
+            "equity": self.allocator.get_equity_series(),
+            "balance": self.executor.balance,
+            "positions": self.executor.positions,
+            "risk_state": self.risk_manager.risk_state,
+        }
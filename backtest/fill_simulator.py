@@ -0,0 +1,351 @@
+# backtest/fill_simulator.py
+"""
+NEXORA Intrabar Fill Simulator
+------------------------------
+Fills entry, stop-loss and take-profit orders against bar open/high/low
+instead of at the close, as a handful of array passes:
+
+    1. segments   every run of a constant non-zero target position is one
+                  order; the position is held over bars s+1 .. e+1
+    2. entry      "market" fills at the signal bar's close; "limit" rests
+                  `limit_offset` below (long) / above (short) that close and
+                  fills on the first held bar whose low / high reaches it, at
+                  the open when the bar gaps through the level
+    3. exits      stop-loss and take-profit levels are set from the entry
+                  price (settings `risk.stop_loss_pct` / `take_profit_pct`)
+                  and checked from the bar after the entry; a bar that opens
+                  beyond a level fills at the open, and a bar touching both
+                  levels is resolved by the `intrabar_path` assumption:
+
+                      OHLC   open -> high -> low -> close
+                      OLHC   open -> low -> high -> close
+                      worst  the stop always fills first
+                      best   the take-profit always fills first
+
+                  after an exit the position stays flat until the signal
+                  changes (no re-entry within a segment)
+
+The first fill of every segment is a segment-wise minimum over the held
+bars (np.minimum.reduceat), so millions of bars cost no per-bar Python
+work and risk-parameter grids can be swept directly (see sweep()).
+
+The output is re-expressed in the VectorizedBacktester convention: a
+position held over a bar earns the bar's *effective* return (close to
+close, fill price to close on a limit fill bar, previous close to exit
+price on an exit bar), so VectorizedBacktester.run() charges costs on the
+stop / limit fills like on any other position change.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from backtest.engine import DEFAULT_SETTINGS, VectorizedBacktester
+from backtest.performance_metrics import compute_performance_metrics_batch
+
+PATHS = ("OHLC", "OLHC", "worst", "best")
+ENTRY_TYPES = ("market", "limit")
+
+_NEVER = np.iinfo(np.int64).max
+
+
+def _ohlc(bars: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+    """Float open/high/low/close arrays; missing opens fall back to the previous close."""
+    columns = {str(c).lower(): c for c in bars.columns}
+    missing = {"high", "low", "close"} - set(columns)
+    if missing:
+        raise ValueError(f"bars need high/low/close columns (missing {sorted(missing)})")
+    close = bars[columns["close"]].to_numpy(dtype=np.float64)
+    high = bars[columns["high"]].to_numpy(dtype=np.float64)
+    low = bars[columns["low"]].to_numpy(dtype=np.float64)
+    prev_close = np.concatenate([close[:1], close[:-1]])
+    if "open" in columns:
+        open_ = bars[columns["open"]].to_numpy(dtype=np.float64)
+        open_ = np.where(np.isfinite(open_), open_, prev_close)
+    else:
+        open_ = prev_close
+    return open_, high, low, close
+
+
+class _Layout:
+    """Segments, held bars and entry fills of one (bars, positions) input; reused across sweeps."""
+
+    def __init__(self, bars: pd.DataFrame, positions, entry: str, limit_offset: float):
+        open_, high, low, close = _ohlc(bars)
+        n = len(close)
+        target = np.nan_to_num(np.asarray(positions, dtype=np.float64))
+        if target.shape != (n,):
+            raise ValueError(f"positions {target.shape} and bars ({n},) must align")
+        self.n, self.index = n, bars.index
+        self.target = target
+        # One padded bar with NaN prices: exposure past the last bar, never a fill
+        self.open, self.high, self.low = (np.append(a, np.nan) for a in (open_, high, low))
+        self.close = np.append(close, np.nan)
+
+        change = np.flatnonzero(np.diff(target, prepend=0.0) != 0)
+        starts = change[target[change] != 0]
+        nxt = np.searchsorted(change, starts, side="right")
+        ends = np.where(nxt < len(change), change[np.minimum(nxt, len(change) - 1)] - 1, n - 1)
+        self.starts, self.size, self.side = starts, target[starts], np.sign(target[starts])
+
+        # Held bars of every segment, flattened: bar number and segment label
+        lengths = ends - starts + 1
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        self.seg = np.repeat(np.arange(len(starts)), lengths)
+        self.bar = starts[self.seg] + 1 + np.arange(len(self.seg)) - self.offsets[self.seg]
+
+        if entry == "market":
+            self.entry_bar = starts.copy()
+            self.entry_price = close[starts]
+            self.exposed_from = starts + 1
+        else:
+            level = close[starts] * (1.0 - self.side * limit_offset)
+            fill = self.first(self.reached(level, adverse=True))
+            filled = fill != _NEVER
+            at = np.where(filled, fill, 0)
+            gap = self.open[at]
+            price = np.where(self.side > 0, np.minimum(gap, level), np.maximum(gap, level))
+            self.entry_bar = fill
+            self.entry_price = np.where(filled, price, np.nan)
+            self.exposed_from = fill
+
+    def first(self, hit: np.ndarray) -> np.ndarray:
+        """First held bar where `hit` holds, per segment (_NEVER when it never does)."""
+        if not len(self.seg):
+            return np.zeros(0, dtype=np.int64)
+        return np.minimum.reduceat(np.where(hit, self.bar, _NEVER), self.offsets)
+
+    def reached(self, level: np.ndarray, adverse: bool) -> np.ndarray:
+        """
+        Per held bar: whether the segment's `level` trades, moving against the
+        position (long: low <= level) or in its favour (long: high >= level).
+        """
+        bar, lvl, long_ = self.bar, level[self.seg], self.side[self.seg] > 0
+        down = long_ if adverse else ~long_
+        with np.errstate(invalid="ignore"):
+            return np.where(down, self.low[bar] <= lvl, self.high[bar] >= lvl)
+
+
+class IntrabarFillSimulator:
+    """
+    Vectorized limit / stop-loss / take-profit fills against OHLC bars.
+
+    Usage:
+        sim = IntrabarFillSimulator.from_settings(intrabar_path="OHLC")
+        frame, fills = sim.simulate(bars, positions)     # engine-ready frame
+        result = sim.run(bars, positions, engine)        # VectorizedBacktester result + fills
+        table = sim.sweep(bars, positions, [0.01, 0.02], [0.03, 0.05])
+    """
+
+    def __init__(
+        self,
+        stop_loss_pct: Optional[float] = None,
+        take_profit_pct: Optional[float] = None,
+        intrabar_path: str = "worst",
+        entry: str = "market",
+        limit_offset: float = 0.0,
+    ):
+        if intrabar_path not in PATHS:
+            raise ValueError(f"Unknown intrabar path '{intrabar_path}' (expected one of {PATHS})")
+        if entry not in ENTRY_TYPES:
+            raise ValueError(f"Unknown entry type '{entry}' (expected one of {ENTRY_TYPES})")
+        self.stop_loss_pct = float(stop_loss_pct) if stop_loss_pct else None
+        self.take_profit_pct = float(take_profit_pct) if take_profit_pct else None
+        self.intrabar_path = intrabar_path
+        self.entry = entry
+        self.limit_offset = float(limit_offset)
+
+    @classmethod
+    def from_settings(cls, path: Optional[str] = None, settings: Optional[Dict] = None, **kwargs):
+        """
+        Build from settings.yaml: `risk` (stop_loss_pct, take_profit_pct) and
+        `backtest.intrabar` (path, entry, limit_offset). Keyword arguments
+        override the settings.
+        """
+        if settings is None:
+            with open(path or DEFAULT_SETTINGS, "r", encoding="utf-8") as f:
+                settings = yaml.safe_load(f) or {}
+        risk = settings.get("risk", {}) or {}
+        intrabar = (settings.get("backtest", {}) or {}).get("intrabar", {}) or {}
+        options = {
+            "stop_loss_pct": risk.get("stop_loss_pct"),
+            "take_profit_pct": risk.get("take_profit_pct"),
+            "intrabar_path": intrabar.get("path", "worst"),
+            "entry": intrabar.get("entry", "market"),
+            "limit_offset": intrabar.get("limit_offset", 0.0),
+        }
+        options.update(kwargs)
+        return cls(**options)
+
+    # ------------------------------------------------------------------
+    def simulate(self, bars: pd.DataFrame, positions) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Simulate the fills of a target position stream (VectorizedBacktester
+        convention: decided at the close of bar t) against `bars` (open/high/
+        low/close columns, aligned with `positions`).
+
+        Returns:
+            (frame, fills): frame has the effective "position", "returns" and
+            "price" columns for VectorizedBacktester.run(); fills has one row
+            per fill with "time", "bar", "side", "type" (market / limit /
+            stop_loss / take_profit), "price" and "size"
+        """
+        layout = _Layout(bars, positions, self.entry, self.limit_offset)
+        return self._simulate(layout, self.stop_loss_pct, self.take_profit_pct)
+
+    def run(
+        self,
+        bars: pd.DataFrame,
+        positions,
+        engine: Optional[VectorizedBacktester] = None,
+        risk_free_rate: float = 0.0,
+    ) -> Dict[str, Any]:
+        """
+        simulate() followed by engine.run(); adds "fills" and the stop-loss /
+        take-profit / unfilled-order counts to the metrics.
+        """
+        engine = engine or VectorizedBacktester()
+        frame, fills = self.simulate(bars, positions)
+        result = engine.run(frame["position"], frame["returns"], frame["price"], risk_free_rate)
+        counts = fills["type"].value_counts()
+        result["fills"] = fills
+        result["metrics"]["stop_losses"] = int(counts.get("stop_loss", 0))
+        result["metrics"]["take_profits"] = int(counts.get("take_profit", 0))
+        return result
+
+    def sweep(
+        self,
+        bars: pd.DataFrame,
+        positions,
+        stop_loss_pcts: Iterable[Optional[float]],
+        take_profit_pcts: Iterable[Optional[float]],
+        engine: Optional[VectorizedBacktester] = None,
+        risk_free_rate: float = 0.0,
+    ) -> pd.DataFrame:
+        """
+        Backtest every (stop_loss_pct, take_profit_pct) pair (None or 0
+        disables a level). Segments and entry fills are computed once; each pair is one
+        exit pass, and all equity curves are scored together with
+        compute_performance_metrics_batch().
+
+        Returns:
+            DataFrame indexed by (stop_loss_pct, take_profit_pct) with the
+            batch metrics plus "stop_losses", "take_profits", "turnover" and
+            "final_equity" columns
+        """
+        engine = engine or VectorizedBacktester()
+        layout = _Layout(bars, positions, self.entry, self.limit_offset)
+        pairs = [(sl or 0.0, tp or 0.0) for sl in stop_loss_pcts for tp in take_profit_pcts]
+        if not pairs:
+            raise ValueError("Empty stop-loss / take-profit grid")
+
+        equity = np.empty((layout.n + 1, len(pairs)))
+        equity[0] = engine.capital_base
+        extra = []
+        for j, (sl, tp) in enumerate(pairs):
+            frame, fills = self._simulate(layout, sl, tp)
+            pos = frame["position"].to_numpy()
+            turnover = np.abs(np.diff(pos, prepend=0.0))
+            strat_ret = np.zeros(layout.n)
+            strat_ret[1:] = pos[:-1] * np.nan_to_num(frame["returns"].to_numpy()[1:])
+            strat_ret -= turnover * engine.cost_rate
+            equity[1:, j] = engine.capital_base * np.cumprod(1.0 + strat_ret)
+            kinds = fills["type"].to_numpy()
+            extra.append(
+                {
+                    "stop_losses": int(np.count_nonzero(kinds == "stop_loss")),
+                    "take_profits": int(np.count_nonzero(kinds == "take_profit")),
+                    "turnover": round(float(turnover.sum()), 4),
+                    "final_equity": round(float(equity[-1, j]), 2),
+                }
+            )
+
+        index = pd.MultiIndex.from_tuples(pairs, names=["stop_loss_pct", "take_profit_pct"])
+        metrics = compute_performance_metrics_batch(
+            equity, risk_free_rate=risk_free_rate, rounded=True
+        )
+        metrics.index = index
+        return pd.concat([metrics, pd.DataFrame(extra, index=index)], axis=1)
+
+    # ------------------------------------------------------------------
+    def _stop_first(self, side: np.ndarray) -> np.ndarray:
+        """Whether the stop fills first on a bar that touches both levels."""
+        if self.intrabar_path == "worst":
+            return np.ones(len(side), dtype=bool)
+        if self.intrabar_path == "best":
+            return np.zeros(len(side), dtype=bool)
+        # The high comes first on OHLC: the take-profit of a long, the stop of a short
+        return side < 0 if self.intrabar_path == "OHLC" else side > 0
+
+    def _simulate(
+        self, layout: _Layout, stop_loss_pct, take_profit_pct
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        n, side = layout.n, layout.side
+        o, h, lo, c = layout.open, layout.high, layout.low, layout.close
+        entry_price = layout.entry_price
+        nan = np.full(len(side), np.nan)
+        stop = entry_price * (1.0 - side * stop_loss_pct) if stop_loss_pct else nan
+        take = entry_price * (1.0 + side * take_profit_pct) if take_profit_pct else nan
+
+        # First bar after the entry that touches either level
+        hit_stop = layout.reached(stop, adverse=True)
+        hit_take = layout.reached(take, adverse=False)
+        after_entry = layout.bar > layout.entry_bar[layout.seg]
+        exit_bar = layout.first(after_entry & (hit_stop | hit_take))
+        exited = exit_bar < n  # exits on the padded bar are never fills
+        at = np.where(exited, exit_bar, n)
+        long_ = side > 0
+        with np.errstate(invalid="ignore"):
+            gap_stop = np.where(long_, o[at] <= stop, o[at] >= stop)
+            gap_take = np.where(long_, o[at] >= take, o[at] <= take)
+            touch_stop = np.where(long_, lo[at] <= stop, h[at] >= stop)
+            touch_take = np.where(long_, h[at] >= take, lo[at] <= take)
+        is_stop = gap_stop | (~gap_take & touch_stop & (~touch_take | self._stop_first(side)))
+        exit_price = np.where(gap_stop | gap_take, o[at], np.where(is_stop, stop, take))
+
+        # Exposure over every held bar from the entry through the exit bar
+        last = np.where(exited, exit_bar, _NEVER)
+        held = (layout.bar >= layout.exposed_from[layout.seg]) & (layout.bar <= last[layout.seg])
+        hold = np.zeros(n + 1)
+        hold[layout.bar[held]] = layout.size[layout.seg[held]]
+        position = hold[1:]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.zeros(n)
+            returns[1:] = c[1:n] / c[: n - 1] - 1.0
+            price = c[:n].copy()
+            limit_fills = (layout.entry_bar < n) & (layout.entry_bar > layout.starts)
+            fill_bar = layout.entry_bar[limit_fills]
+            returns[fill_bar] = c[fill_bar] / entry_price[limit_fills] - 1.0
+            # The position change of a limit fill is booked on the bar before it
+            price[fill_bar - 1] = entry_price[limit_fills]
+            out_bar = exit_bar[exited]
+            returns[out_bar] = exit_price[exited] / c[out_bar - 1] - 1.0
+            price[out_bar] = exit_price[exited]
+
+        frame = pd.DataFrame(
+            {"position": position, "returns": np.nan_to_num(returns), "price": price},
+            index=layout.index,
+        )
+        return frame, self._fills(layout, limit_fills, exited, exit_bar, exit_price, is_stop)
+
+    def _fills(self, layout, limit_fills, exited, exit_bar, exit_price, is_stop) -> pd.DataFrame:
+        entered = layout.entry_bar < layout.n
+        entry_type = np.where(limit_fills, "limit", "market")
+        exit_type = np.where(is_stop, "stop_loss", "take_profit")
+        bar = np.concatenate([layout.entry_bar[entered], exit_bar[exited]])
+        size = np.concatenate([layout.size[entered], -layout.size[exited]])
+        fills = pd.DataFrame(
+            {
+                "bar": bar,
+                "side": np.where(size > 0, "BUY", "SELL"),
+                "type": np.concatenate([entry_type[entered], exit_type[exited]]),
+                "price": np.concatenate([layout.entry_price[entered], exit_price[exited]]),
+                "size": size,
+            }
+        )
+        fills = fills.sort_values("bar", kind="stable").reset_index(drop=True)
+        fills.insert(0, "time", np.asarray(layout.index)[fills["bar"].to_numpy()])
+        return fills
@@ -71,6 +71,141 @@ def compute_performance_metrics(
     }
 
 
+BATCH_METRICS = [
+    "total_return",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "max_drawdown",
+    "win_rate",
+    "volatility",
+    "trades",
+    "calmar_ratio",
+    "omega_ratio",
+    "tail_ratio",
+    "time_under_water",
+    "max_time_under_water",
+]
+
+_ROUNDING = {
+    "total_return": 4,
+    "sharpe_ratio": 3,
+    "sortino_ratio": 3,
+    "max_drawdown": 4,
+    "win_rate": 3,
+    "volatility": 3,
+    "calmar_ratio": 3,
+    "omega_ratio": 3,
+    "tail_ratio": 3,
+    "time_under_water": 4,
+}
+
+
+def compute_performance_metrics_batch(
+    equity_curves,
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = 252,
+    rounded: bool = False,
+) -> pd.DataFrame:
+    """
+    compute_performance_metrics() for many equity curves at once.
+
+    `equity_curves` is a (time × n_curves) array or DataFrame of finite,
+    positive portfolio values sharing one time axis. Every metric is a
+    column-wise array operation over the whole matrix, so thousands of
+    candidates cost a few vectorized passes instead of a Python loop.
+
+    Besides the compute_performance_metrics() fields (same definitions), adds:
+        calmar_ratio         - annualized (compounded) return / |max drawdown|
+        omega_ratio          - sum of gains / sum of losses vs the per-period risk-free rate
+        tail_ratio           - |95th percentile| / |5th percentile| of returns
+        time_under_water     - fraction of points below the running peak
+        max_time_under_water - longest stretch below the running peak (bars)
+
+    Returns a DataFrame with one row per curve (indexed by the input columns)
+    and BATCH_METRICS as columns; `rounded=True` applies the single-curve
+    function's rounding.
+    """
+    labels = equity_curves.columns if isinstance(equity_curves, pd.DataFrame) else None
+    equity = np.asarray(equity_curves, dtype=np.float64)
+    if equity.ndim == 1:
+        equity = equity[:, None]
+    n_points, n_curves = equity.shape
+    n = n_points - 1
+    index = labels if labels is not None else pd.RangeIndex(n_curves)
+
+    if n < 1:
+        empty = pd.DataFrame(0.0, index=index, columns=BATCH_METRICS)
+        empty["trades"] = 0
+        empty["max_time_under_water"] = 0
+        return empty
+
+    returns = equity[1:] / equity[:-1] - 1.0
+    rf = risk_free_rate / periods_per_year
+    annual = np.sqrt(periods_per_year)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Mean / sample std (ddof=1, as pandas)
+        mean = returns.mean(axis=0)
+        std = (
+            np.sqrt(((returns - mean) ** 2).sum(axis=0) / (n - 1))
+            if n > 1
+            else np.full(n_curves, np.nan)
+        )
+        sharpe = np.where(std > 0, annual * (mean - rf) / std, 0.0)
+
+        # Sortino: sample std of the negative returns only
+        neg = returns < 0
+        k = neg.sum(axis=0)
+        neg_mean = np.where(neg, returns, 0.0).sum(axis=0) / k
+        neg_ss = np.where(neg, (returns - neg_mean) ** 2, 0.0).sum(axis=0)
+        downside = np.where(k > 1, np.sqrt(neg_ss / (k - 1)), np.nan)
+        sortino = np.where(downside > 0, annual * (mean - rf) / downside, 0.0)
+
+        # Drawdown path
+        peaks = np.maximum.accumulate(equity, axis=0)
+        drawdown = equity / peaks - 1.0
+        max_dd = drawdown.min(axis=0)
+        underwater = drawdown < 0
+
+        total_return = equity[-1] / equity[0] - 1.0
+        cagr = np.power(1.0 + total_return, periods_per_year / n) - 1.0
+        calmar = np.where(max_dd < 0, cagr / np.abs(max_dd), 0.0)
+
+        excess = returns - rf
+        gains = np.clip(excess, 0.0, None).sum(axis=0)
+        losses = np.clip(-excess, 0.0, None).sum(axis=0)
+        omega = np.where(losses > 0, gains / losses, np.where(gains > 0, np.inf, 0.0))
+
+        p5, p95 = np.percentile(returns, [5, 95], axis=0)
+        tail = np.where(p5 != 0, np.abs(p95) / np.abs(p5), 0.0)
+
+    metrics = pd.DataFrame(
+        {
+            "total_return": total_return,
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "max_drawdown": max_dd,
+            "win_rate": (returns > 0).sum(axis=0) / n,
+            "volatility": std * annual,
+            "trades": np.full(n_curves, n, dtype=np.int64),
+            "calmar_ratio": calmar,
+            "omega_ratio": omega,
+            "tail_ratio": tail,
+            "time_under_water": underwater.mean(axis=0),
+            "max_time_under_water": _longest_runs(underwater),
+        },
+        index=index,
+    )
+    return metrics.round(_ROUNDING) if rounded else metrics
+
+
+def _longest_runs(mask: np.ndarray) -> np.ndarray:
+    """Longest run of consecutive True values down each column of a 2-D mask."""
+    steps = np.arange(1, mask.shape[0] + 1)[:, None]
+    last_false = np.maximum.accumulate(np.where(mask, 0, steps), axis=0)
+    return (steps - last_false).max(axis=0).astype(np.int64)
+
+
 # ============================================================================
 # 🔹 Report Generator Class
 # ============================================================================
@@ -0,0 +1,269 @@
+# backtest/portfolio_backtest.py
+"""
+NEXORA Multi-Strategy Portfolio Backtest
+----------------------------------------
+Backtests several strategy sleeves (trend, mean reversion, stat-arb, ...)
+over many symbols on one shared capital base, the way PortfolioAllocator
+runs them live, as (bars × streams) array passes:
+
+    1. streams    every (sleeve, symbol) position in [-1, 1] and the return of
+                  the instrument it trades, aligned on one time axis
+    2. selection  at most `max_positions` open streams per bar, strongest
+                  |position| first (ties: stream order)
+    3. allocation "equal" or "risk_parity" (inverse trailing volatility)
+                  weights over the selected streams, scaled to `max_exposure`
+                  gross and capped at `max_weight` per stream
+    4. P&L        w[t-1]·r[t] per stream, minus turnover × (commission + slippage)
+    5. stop       when equity first falls `max_drawdown` below its running
+                  peak, the book is flattened at that bar's close and stays
+                  flat; the path up to the breach does not depend on the stop,
+                  so it is located with one cumulative pass
+
+Per-sleeve attribution splits P&L, costs, exposure and trades by sleeve; the
+sleeve returns add up to the portfolio's per-bar return. There are no
+per-bar Python loops, so a run is cheap enough to be an optimizer objective.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from backtest.engine import DEFAULT_SETTINGS
+from backtest.performance_metrics import compute_performance_metrics
+
+ALLOCATION_METHODS = ("equal", "risk_parity")
+
+
+def collect_streams(jobs: Iterable[Tuple[str, str, Any, Any, Optional[Dict]]]):
+    """
+    Run generate_positions() for every (sleeve, symbol, strategy, data, params)
+    job and align the streams on the union of their indices (missing bars are
+    flat with zero return).
+
+    Returns:
+        (positions, returns) DataFrames with (sleeve, symbol) MultiIndex columns
+    """
+    positions, returns = {}, {}
+    for sleeve, symbol, strategy, data, params in jobs:
+        frame = strategy.generate_positions(params or strategy.parameters(), data)
+        positions[(sleeve, symbol)] = frame["position"]
+        returns[(sleeve, symbol)] = frame["returns"]
+    if not positions:
+        raise ValueError("No strategy streams to combine")
+    names = ["sleeve", "symbol"]
+    pos = pd.concat(positions, axis=1, names=names).astype(float).fillna(0.0)
+    ret = pd.concat(returns, axis=1, names=names).astype(float).reindex_like(pos).fillna(0.0)
+    return pos, ret
+
+
+def trailing_volatility(returns: np.ndarray, window: int) -> np.ndarray:
+    """Per-column rolling std (ddof=1) over `window` bars ending at each bar; NaN until full."""
+    n = len(returns)
+    vol = np.full(returns.shape, np.nan)
+    if window < 2 or n < window:
+        return vol
+    ref = returns[:1]
+    centered = returns - ref  # de-mean for precision
+    csum = np.concatenate([np.zeros((1, returns.shape[1])), np.cumsum(centered, axis=0)])
+    csq = np.concatenate([np.zeros((1, returns.shape[1])), np.cumsum(centered**2, axis=0)])
+    s1, s2 = csum[window:] - csum[:-window], csq[window:] - csq[:-window]
+    vol[window - 1 :] = np.sqrt(np.maximum((s2 - s1**2 / window) / (window - 1), 0.0))
+    return vol
+
+
+def _entries_and_exits(weights: np.ndarray) -> int:
+    """Number of times a stream is opened or closed (weight rebalancing is not a trade)."""
+    held = weights != 0
+    return int(np.count_nonzero(held[1:] != held[:-1]) + np.count_nonzero(held[:1]))
+
+
+class PortfolioBacktester:
+    """
+    Vectorized multi-strategy, multi-symbol portfolio backtest on shared capital.
+
+    Usage:
+        bt = PortfolioBacktester.from_settings()
+        result = bt.run_strategies([("trend", "AAPL", TrendFollowingStrategy(), data, None), ...])
+        result = bt.run(positions, returns)   # (bars × streams) frames
+    """
+
+    def __init__(
+        self,
+        capital_base: float = 100_000.0,
+        commission: float = 0.001,
+        slippage: float = 0.0005,
+        max_positions: Optional[int] = None,
+        allocation_method: str = "equal",
+        max_exposure: float = 1.0,
+        max_weight: float = 1.0,
+        max_drawdown: Optional[float] = None,
+        vol_window: int = 60,
+    ):
+        if allocation_method not in ALLOCATION_METHODS:
+            raise ValueError(
+                f"Unknown allocation method '{allocation_method}' "
+                f"(expected one of {ALLOCATION_METHODS})"
+            )
+        self.capital_base = float(capital_base)
+        self.commission = float(commission)
+        self.slippage = float(slippage)
+        self.max_positions = int(max_positions) if max_positions else None
+        self.allocation_method = allocation_method
+        self.max_exposure = float(max_exposure)
+        self.max_weight = float(max_weight)
+        self.max_drawdown = float(max_drawdown) if max_drawdown else None
+        self.vol_window = int(vol_window)
+
+    @classmethod
+    def from_settings(cls, path: Optional[str] = None, settings: Optional[Dict] = None, **kwargs):
+        """
+        Build from settings.yaml: `portfolio` (max_positions, allocation_method,
+        max_drawdown), `risk` (max_exposure) and `backtest` (capital and costs).
+        Keyword arguments override the settings.
+        """
+        if settings is None:
+            with open(path or DEFAULT_SETTINGS, "r", encoding="utf-8") as f:
+                settings = yaml.safe_load(f) or {}
+        backtest = settings.get("backtest", {}) or {}
+        portfolio = settings.get("portfolio", {}) or {}
+        risk = settings.get("risk", {}) or {}
+        options = {
+            "capital_base": backtest.get("capital_base", 100_000.0),
+            "commission": backtest.get("commission", 0.001),
+            "slippage": backtest.get("slippage", 0.0005),
+            "max_positions": portfolio.get("max_positions"),
+            "allocation_method": portfolio.get("allocation_method", "equal"),
+            "max_drawdown": portfolio.get("max_drawdown"),
+            "max_exposure": risk.get("max_exposure", 1.0),
+        }
+        options.update(kwargs)
+        return cls(**options)
+
+    @property
+    def cost_rate(self) -> float:
+        return self.commission + self.slippage
+
+    # ------------------------------------------------------------------
+    def run_strategies(self, jobs, risk_free_rate: float = 0.0) -> Dict[str, Any]:
+        """collect_streams(jobs) followed by run()."""
+        return self.run(*collect_streams(jobs), risk_free_rate=risk_free_rate)
+
+    def target_weights(self, positions: np.ndarray, returns: np.ndarray) -> np.ndarray:
+        """Capital weight of every stream at every bar (before the drawdown stop)."""
+        n, k = positions.shape
+        strength = np.abs(positions)
+        selected = strength > 0
+        if self.max_positions and k > self.max_positions:
+            order = np.argsort(-strength, axis=1, kind="stable")
+            rank = np.empty_like(order)
+            np.put_along_axis(rank, order, np.broadcast_to(np.arange(k), (n, k)), axis=1)
+            selected &= rank < self.max_positions
+
+        if self.allocation_method == "risk_parity":
+            with np.errstate(divide="ignore"):
+                inv_vol = 1.0 / trailing_volatility(returns, self.vol_window)
+            known = selected & np.isfinite(inv_vol)
+            # Streams without a volatility estimate yet get the average of the known ones
+            count = known.sum(axis=1, keepdims=True)
+            fill = np.where(known, inv_vol, 0.0).sum(axis=1, keepdims=True) / np.maximum(count, 1)
+            fill = np.where(count > 0, fill, 1.0)
+            raw = np.where(known, inv_vol, np.where(selected, fill, 0.0))
+        else:
+            raw = selected.astype(np.float64)
+
+        total = raw.sum(axis=1, keepdims=True)
+        alloc = np.divide(raw, total, out=np.zeros_like(raw), where=total > 0)
+        weights = self.max_exposure * alloc * positions
+        return np.clip(weights, -self.max_weight, self.max_weight)
+
+    def _pnl(self, weights: np.ndarray, returns: np.ndarray):
+        contrib = np.zeros_like(weights)
+        contrib[1:] = weights[:-1] * returns[1:]
+        turnover = np.abs(np.diff(weights, axis=0, prepend=0.0))
+        return contrib, turnover, contrib.sum(axis=1) - self.cost_rate * turnover.sum(axis=1)
+
+    def run(
+        self, positions: pd.DataFrame, returns: pd.DataFrame, risk_free_rate: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Backtest aligned (bars × streams) position and return frames whose
+        columns are (sleeve, symbol) pairs (see collect_streams).
+
+        Returns:
+            {"equity": Series, "returns": Series, "weights": DataFrame,
+             "sleeve_returns": DataFrame, "sleeves": DataFrame (attribution),
+             "metrics": dict}
+        """
+        if positions.shape != returns.shape:
+            raise ValueError(f"positions {positions.shape} and returns {returns.shape} must align")
+        index, streams = positions.index, positions.columns
+        pos = np.clip(np.nan_to_num(positions.to_numpy(dtype=np.float64)), -1.0, 1.0)
+        ret = np.nan_to_num(returns.to_numpy(dtype=np.float64))
+
+        weights = self.target_weights(pos, ret)
+        contrib, turnover, port_ret = self._pnl(weights, ret)
+
+        halted_at = None
+        if self.max_drawdown:
+            wealth = np.cumprod(1.0 + port_ret)
+            peak = np.maximum.accumulate(np.maximum(wealth, 1.0))
+            breaches = np.flatnonzero(wealth / peak - 1.0 <= -self.max_drawdown)
+            if breaches.size:
+                halted_at = int(breaches[0])
+                weights[halted_at:] = 0.0
+                contrib, turnover, port_ret = self._pnl(weights, ret)
+
+        equity = pd.Series(
+            self.capital_base * np.cumprod(1.0 + port_ret), index=index, name="equity"
+        )
+        sleeve_returns, sleeves = self._attribution(streams, weights, contrib, turnover, index)
+
+        metrics = compute_performance_metrics(
+            pd.concat([pd.Series([self.capital_base]), equity], ignore_index=True),
+            risk_free_rate=risk_free_rate,
+        )
+        held = weights != 0
+        metrics["trades"] = _entries_and_exits(weights)
+        metrics["turnover"] = round(float(turnover.sum()), 4)
+        prior = np.concatenate([[self.capital_base], equity.to_numpy()[:-1]])
+        metrics["costs"] = round(float((self.cost_rate * turnover.sum(axis=1) * prior).sum()), 2)
+        metrics["avg_positions"] = round(float(held.sum(axis=1).mean()), 2) if len(held) else 0.0
+        metrics["avg_gross_exposure"] = round(float(np.abs(weights).sum(axis=1).mean()), 4)
+        metrics["halted_at"] = None if halted_at is None else index[halted_at]
+        metrics["final_equity"] = round(float(equity.iloc[-1]), 2) if len(equity) else 0.0
+
+        return {
+            "equity": equity,
+            "returns": pd.Series(port_ret, index=index, name="returns"),
+            "weights": pd.DataFrame(weights, index=index, columns=streams),
+            "sleeve_returns": sleeve_returns,
+            "sleeves": sleeves,
+            "metrics": metrics,
+        }
+
+    def _attribution(self, streams, weights, contrib, turnover, index):
+        """Per-sleeve return series and summary; sleeve returns sum to the portfolio's."""
+        sleeve_of = np.asarray(streams.get_level_values(0))
+        labels = list(dict.fromkeys(sleeve_of))
+        columns, rows = {}, {}
+        for sleeve in labels:
+            mask = sleeve_of == sleeve
+            gross = contrib[:, mask].sum(axis=1)
+            costs = self.cost_rate * turnover[:, mask].sum(axis=1)
+            columns[sleeve] = gross - costs
+            std = columns[sleeve].std()
+            rows[sleeve] = {
+                "contribution": columns[sleeve].sum(),
+                "gross_return": gross.sum(),
+                "costs": costs.sum(),
+                "sharpe": columns[sleeve].mean() / std * np.sqrt(252) if std > 0 else 0.0,
+                "avg_exposure": np.abs(weights[:, mask]).sum(axis=1).mean(),
+                "avg_positions": (weights[:, mask] != 0).sum(axis=1).mean(),
+                "trades": _entries_and_exits(weights[:, mask]),
+                "streams": int(mask.sum()),
+            }
+        sleeve_returns = pd.DataFrame(columns, index=index)
+        sleeves = pd.DataFrame.from_dict(rows, orient="index").rename_axis("sleeve").round(4)
+        return sleeve_returns, sleeves
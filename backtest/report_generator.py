@@ -1,21 +1,79 @@
+import html
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
+import plotly
 import plotly.graph_objects as go
 import plotly.io as pio
 from plotly.subplots import make_subplots
 
+from analytics.downsampling import METHODS, downsample_indices
 from analytics.rolling_metrics import RollingMetrics
 
+PLOTLY_JS_NAME = "plotly.min.js"
+
+
+def write_plotlyjs(output_dir: str, overwrite: bool = False) -> str:
+    """
+    Write the Plotly bundle that include_plotlyjs="directory" pages load
+    (atomically, so parallel report workers never see a partial file).
+    """
+    path = os.path.join(output_dir, PLOTLY_JS_NAME)
+    if overwrite or not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(plotly.offline.get_plotlyjs())
+        os.replace(tmp, path)
+    return path
+
+
+def write_html_page(path: str, title: str, sections: Iterable[str]) -> str:
+    """Write a complete HTML document made of `sections` in a single pass."""
+    body = "\n".join(sections)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f'<html>\n<head><meta charset="utf-8" /><title>{html.escape(title)}</title></head>\n'
+            f"<body>\n{body}\n</body>\n</html>\n"
+        )
+    return path
 
-class BacktestReportGenerator:
-    """Generates interactive HTML reports from backtest results with rolling analytics."""
 
-    def __init__(self, output_dir: str = "reports", window: int = 30):
+class BacktestReportGenerator:
+    """
+    Generates interactive HTML reports from backtest results with rolling analytics.
+
+    Rolling metrics are computed on the full series, but every plotted trace
+    is downsampled to at most `max_points` points (`downsample`: "minmax" keeps
+    each bucket's extremes, "lttb" the largest-triangle point; None plots
+    everything), so year-long 1m curves stay a few MB. `include_plotlyjs` is
+    passed to Plotly ("cdn", "directory", True, ...); with "directory" the
+    shared plotly.min.js is written to `output_dir` when missing.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "reports",
+        window: int = 30,
+        max_points: Optional[int] = 5_000,
+        downsample: str = "minmax",
+        include_plotlyjs: Union[bool, str] = "cdn",
+    ):
+        if downsample not in METHODS:
+            raise ValueError(f"Unknown downsampling method '{downsample}'")
         self.output_dir = output_dir
+        self.window = window
+        self.max_points = max_points
+        self.downsample = downsample
+        self.include_plotlyjs = include_plotlyjs
         self.metrics_engine = RollingMetrics(window=window)
         os.makedirs(self.output_dir, exist_ok=True)
 
+    def _trace(self, df: pd.DataFrame, column: str, name: str) -> go.Scatter:
+        idx = downsample_indices(df[column].to_numpy(), self.max_points, self.downsample)
+        return go.Scatter(x=df.index[idx], y=df[column].to_numpy()[idx], name=name, mode="lines")
+
     def generate_html_report(self, df: pd.DataFrame, strategy_name: str, asset: str) -> str:
         # Compute rolling metrics
         df = self.metrics_engine.compute(df)
@@ -35,51 +93,15 @@ class BacktestReportGenerator:
             ),
         )
 
-        # Equity curve
-        fig.add_trace(
-            go.Scatter(x=df.index, y=df["equity_curve"], name="Equity Curve", mode="lines"),
-            row=1,
-            col=1,
-        )
-
-        # Rolling Sharpe
-        if "rolling_sharpe" in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df["rolling_sharpe"],
-                    name="Rolling Sharpe",
-                    mode="lines",
-                ),
-                row=2,
-                col=1,
-            )
-
-        # Rolling Volatility
-        if "rolling_volatility" in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df["rolling_volatility"],
-                    name="Rolling Volatility",
-                    mode="lines",
-                ),
-                row=3,
-                col=1,
-            )
-
-        # Rolling Max Drawdown
-        if "rolling_max_drawdown" in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df["rolling_max_drawdown"],
-                    name="Rolling Drawdown",
-                    mode="lines",
-                ),
-                row=4,
-                col=1,
-            )
+        panels = [
+            ("equity_curve", "Equity Curve"),
+            ("rolling_sharpe", "Rolling Sharpe"),
+            ("rolling_volatility", "Rolling Volatility"),
+            ("rolling_max_drawdown", "Rolling Drawdown"),
+        ]
+        for row, (column, name) in enumerate(panels, start=1):
+            if column in df.columns:
+                fig.add_trace(self._trace(df, column, name), row=row, col=1)
 
         # Layout aesthetics
         fig.update_layout(
@@ -89,7 +111,7 @@ class BacktestReportGenerator:
             template="plotly_white",
         )
 
-        # --- Add summary table ---
+        # --- Summary table ---
         summary_table = go.Figure(
             data=[
                 go.Table(
@@ -113,23 +135,41 @@ class BacktestReportGenerator:
             ]
         )
 
-        # Save to HTML
+        # --- Write chart and table as one document, in a single pass ---
+        if self.include_plotlyjs == "directory":
+            write_plotlyjs(self.output_dir)
+        chart_html = pio.to_html(fig, include_plotlyjs=self.include_plotlyjs, full_html=False)
+        summary_html = pio.to_html(summary_table, include_plotlyjs=False, full_html=False)
         output_path = os.path.join(self.output_dir, f"{strategy_name}_{asset}_report.html")
-        pio.write_html(
-            fig,
-            file=output_path,
-            include_plotlyjs="cdn",
-            full_html=True,
-            auto_open=False,
+        write_html_page(
+            output_path,
+            f"Performance Report: {strategy_name} ({asset})",
+            [chart_html, "<h3>Summary Statistics</h3>", summary_html],
         )
 
-        # Append summary table HTML
-        summary_html = pio.to_html(summary_table, include_plotlyjs=False, full_html=False)
-        with open(output_path, "a", encoding="utf-8") as f:
-            f.write("<h3>Summary Statistics</h3>" + summary_html)
-
         return output_path
 
+    def generate_html_reports(
+        self,
+        jobs: Iterable[Tuple[pd.DataFrame, str, str]],
+        max_workers: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Render many (df, strategy_name, asset) reports; with max_workers > 1
+        they are rendered on a process pool. Returns the paths in job order.
+        """
+        jobs = list(jobs)
+        if not (max_workers and max_workers > 1 and len(jobs) > 1):
+            return [self.generate_html_report(*job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_render_report, [self] * len(jobs), *zip(*jobs)))
+
+
+def _render_report(
+    generator: BacktestReportGenerator, df: pd.DataFrame, strategy_name: str, asset: str
+) -> str:
+    return generator.generate_html_report(df, strategy_name, asset)
+
 
 if __name__ == "__main__":
     import numpy as np
@@ -0,0 +1,321 @@
+# backtest/report_pipeline.py
+"""
+NEXORA Report Pipeline
+----------------------
+Renders every output of a BacktestRunner run as one batch:
+
+    <Strategy>_<symbol>_report.html   per-(strategy, symbol) report
+    comparison.html                   all equity curves and metrics side by side
+    index.html                        summary table linking every report
+
+- pages render on a process pool (inline with max_workers <= 1);
+- every chart page loads one shared plotly.min.js from the output directory
+  (include_plotlyjs="directory") instead of embedding the bundle per file
+  or fetching it from a CDN;
+- a manifest of input hashes (equity curve, metrics row, render settings)
+  is kept next to the pages, and pages whose inputs are unchanged since the
+  last run are skipped.
+"""
+
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+from analytics.downsampling import downsample_indices
+from backtest.report_generator import (
+    PLOTLY_JS_NAME,
+    BacktestReportGenerator,
+    write_html_page,
+    write_plotlyjs,
+)
+from backtest.result_cache import fingerprint_data, normalize_params
+
+MANIFEST_NAME = ".report_manifest.json"
+COMPARISON_NAME = "comparison.html"
+INDEX_NAME = "index.html"
+
+Key = Tuple[str, str]
+
+
+# -------------------------------------------------------------------------
+# Page renderers (module level so process workers can run them)
+# -------------------------------------------------------------------------
+def load_equity(curve) -> pd.Series:
+    """Equity Series from a Series/DataFrame or an equity-curve CSV written by BacktestRunner."""
+    if isinstance(curve, (str, os.PathLike)):
+        curve = pd.read_csv(curve, index_col=0)
+    if isinstance(curve, pd.DataFrame):
+        curve = curve.iloc[:, 0]
+    return curve.astype(float)
+
+
+def _render_report(generator: BacktestReportGenerator, curve, strategy: str, symbol: str) -> str:
+    equity = load_equity(curve)
+    df = pd.DataFrame({"equity_curve": equity, "returns": equity.pct_change().fillna(0.0)})
+    return generator.generate_html_report(df, strategy, symbol)
+
+
+def _render_comparison(
+    path: str,
+    curves: Dict[Key, Any],
+    metrics: pd.DataFrame,
+    max_points: Optional[int],
+    downsample: str,
+) -> str:
+    """Normalized equity of every (strategy, symbol), plus Sharpe and return bars."""
+    fig = make_subplots(
+        rows=3,
+        cols=1,
+        vertical_spacing=0.08,
+        subplot_titles=("Normalized Equity", "Sharpe Ratio", "Total Return"),
+    )
+    for (strategy, symbol), curve in curves.items():
+        equity = load_equity(curve)
+        values = equity.to_numpy() / equity.iloc[0]
+        idx = downsample_indices(values, max_points, downsample)
+        fig.add_trace(
+            go.Scatter(
+                x=equity.index[idx], y=values[idx], name=f"{strategy} | {symbol}", mode="lines"
+            ),
+            row=1,
+            col=1,
+        )
+
+    for row, column in [(2, "sharpe_ratio"), (3, "total_return")]:
+        if column not in metrics.columns:
+            continue
+        for strategy, group in metrics.groupby("strategy", sort=True):
+            fig.add_trace(
+                go.Bar(
+                    x=group["symbol"],
+                    y=group[column],
+                    name=f"{strategy} {column}",
+                    legendgroup=strategy,
+                ),
+                row=row,
+                col=1,
+            )
+
+    fig.update_layout(
+        title="Strategy Comparison",
+        height=1100,
+        barmode="group",
+        template="plotly_white",
+    )
+    chart_html = pio.to_html(fig, include_plotlyjs="directory", full_html=False)
+    return write_html_page(path, "Strategy Comparison", [chart_html])
+
+
+# -------------------------------------------------------------------------
+# Pipeline
+# -------------------------------------------------------------------------
+class ReportPipeline:
+    """
+    Batch HTML reporting for BacktestRunner results.
+
+    Usage:
+        pipeline = ReportPipeline("reports/html", max_workers=4)
+        outcome = pipeline.run(results, curve_dir=runner.curve_dir)
+        outcome["index"], outcome["rendered"], outcome["skipped"]
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "reports",
+        max_workers: Optional[int] = None,
+        window: int = 30,
+        max_points: Optional[int] = 5_000,
+        downsample: str = "minmax",
+    ):
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.generator = BacktestReportGenerator(
+            output_dir=output_dir,
+            window=window,
+            max_points=max_points,
+            downsample=downsample,
+            include_plotlyjs="directory",
+        )
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Render settings that invalidate every page when changed."""
+        return {
+            "window": self.generator.window,
+            "max_points": self.generator.max_points,
+            "downsample": self.generator.downsample,
+            "plotly": plotly.__version__,
+        }
+
+    # ------------------------------------------------------------------
+    def run(
+        self,
+        results: Iterable[Dict[str, Any]],
+        curves: Optional[Mapping[Key, Any]] = None,
+        curve_dir: Optional[str] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Render the reports of one run.
+
+        Args:
+            results: BacktestRunner result rows ("strategy", "symbol", metrics,
+                or "error")
+            curves: {(strategy, symbol): equity Series or CSV path}
+            curve_dir: directory of <strategy>_<symbol>.csv equity curves, used
+                for rows missing from `curves`
+            force: re-render even when the inputs are unchanged
+
+        Returns:
+            {"index": path, "rendered": [file names], "skipped": [file names]}
+        """
+        results = list(results)
+        rows = [r for r in results if "error" not in r and "strategy" in r and "symbol" in r]
+        found = {}
+        for row in rows:
+            key = (row["strategy"], row["symbol"])
+            curve = self._find_curve(key, curves, curve_dir)
+            if curve is not None:
+                found[key] = curve
+
+        manifest = {} if force else self._load_manifest()
+        settings = normalize_params(self.settings)
+        fingerprints = {key: fingerprint_data(curve) for key, curve in found.items()}
+
+        pages: Dict[str, Tuple[str, Any, tuple]] = {}
+        for row in rows:
+            key = (row["strategy"], row["symbol"])
+            if key in found:
+                digest = _digest(settings, fingerprints[key], normalize_params(row))
+                pages[f"{key[0]}_{key[1]}_report.html"] = (
+                    digest,
+                    _render_report,
+                    (self.generator, found[key], *key),
+                )
+        if found:
+            metrics = pd.DataFrame(rows)
+            digest = _digest(
+                settings,
+                normalize_params({f"{s}|{y}": fp for (s, y), fp in fingerprints.items()}),
+                metrics.to_json(orient="records"),
+            )
+            pages[COMPARISON_NAME] = (
+                digest,
+                _render_comparison,
+                (
+                    os.path.join(self.output_dir, COMPARISON_NAME),
+                    found,
+                    metrics,
+                    self.generator.max_points,
+                    self.generator.downsample,
+                ),
+            )
+
+        stale = {
+            name: page
+            for name, page in pages.items()
+            if manifest.get(name) != page[0]
+            or not os.path.exists(os.path.join(self.output_dir, name))
+        }
+        self._write_plotlyjs()
+        self._render(stale)
+
+        index_path = self._write_index(results, set(pages))
+        self._save_manifest({name: page[0] for name, page in pages.items()})
+        return {
+            "index": index_path,
+            "rendered": sorted(stale),
+            "skipped": sorted(set(pages) - set(stale)),
+        }
+
+    # ------------------------------------------------------------------
+    def _render(self, pages: Dict[str, Tuple[str, Any, tuple]]) -> List[str]:
+        jobs = [(fn, args) for _, fn, args in pages.values()]
+        if not (self.max_workers and self.max_workers > 1 and len(jobs) > 1):
+            return [fn(*args) for fn, args in jobs]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(fn, *args) for fn, args in jobs]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _find_curve(key: Key, curves: Optional[Mapping[Key, Any]], curve_dir: Optional[str]):
+        if curves and key in curves:
+            return curves[key]
+        if curve_dir:
+            path = os.path.join(curve_dir, f"{key[0]}_{key[1]}.csv")
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def _write_plotlyjs(self) -> None:
+        """Write the shared Plotly bundle once per Plotly version."""
+        path = os.path.join(self.output_dir, PLOTLY_JS_NAME)
+        current = self._load_manifest().get(PLOTLY_JS_NAME) == plotly.__version__
+        if current and os.path.exists(path):
+            return
+        write_plotlyjs(self.output_dir, overwrite=True)
+
+    def _write_index(self, results: List[Dict[str, Any]], pages) -> str:
+        table = pd.DataFrame(results).drop(columns=["traceback"], errors="ignore")
+        names = None
+        if not table.empty and {"strategy", "symbol"} <= set(table.columns):
+            names = table["strategy"].astype(str) + "_" + table["symbol"].astype(str)
+        # Result text (error messages, names) is escaped; only the link column is raw HTML
+        for column in table.columns:
+            if not pd.api.types.is_numeric_dtype(table[column]):
+                table[column] = table[column].map(_escape_cell).astype(object)
+        if names is not None:
+            table.insert(
+                0,
+                "report",
+                [
+                    (
+                        f'<a href="{html.escape(n)}_report.html">open</a>'
+                        if f"{n}_report.html" in pages
+                        else ""
+                    )
+                    for n in names
+                ],
+            )
+        sections = ["<h2>Backtest Summary</h2>"]
+        if COMPARISON_NAME in pages:
+            sections.append(f'<p><a href="{COMPARISON_NAME}">Strategy comparison charts</a></p>')
+        sections.append(table.round(4).to_html(index=False, escape=False, border=0, na_rep=""))
+        return write_html_page(
+            os.path.join(self.output_dir, INDEX_NAME), "Backtest Summary", sections
+        )
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, pages: Dict[str, str]) -> None:
+        manifest = {**pages, PLOTLY_JS_NAME: plotly.__version__}
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def _escape_cell(value: Any) -> Any:
+    """HTML-escape a result cell; numbers and missing values pass through."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return html.escape(str(value))
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
@@ -0,0 +1,174 @@
+# backtest/resampling.py
+"""
+NEXORA Resampling / Monte Carlo Robustness
+------------------------------------------
+Confidence intervals on Sharpe, drawdown and the other batch metrics of a
+backtest, from thousands of resampled return paths:
+
+    iid    - bootstrap of individual bar returns
+    block  - stationary block bootstrap (Politis & Romano): geometric block
+             lengths with mean `block_size`, preserving autocorrelation and
+             volatility clustering
+    trades - random reordering of per-trade returns (same final return,
+             different path / drawdown)
+
+Paths are built as (bars × paths) index matrices, in chunks sized to a memory
+budget, and every chunk goes straight through
+compute_performance_metrics_batch(). Each chunk draws from its own child of
+one SeedSequence, so results depend only on the seed and chunk size — not on
+how many worker processes evaluate the chunks.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.performance_metrics import compute_performance_metrics_batch
+
+METHODS = ("iid", "block", "trades")
+
+
+def default_block_size(n: int) -> int:
+    """n^(1/3) rule of thumb for the mean block length."""
+    return max(1, int(round(n ** (1.0 / 3.0))))
+
+
+def resample_indices(
+    rng: np.random.Generator,
+    n: int,
+    n_paths: int,
+    method: str = "block",
+    block_size: Optional[int] = None,
+) -> np.ndarray:
+    """(n × n_paths) matrix of source positions for `n_paths` resampled paths."""
+    if method == "iid":
+        return rng.integers(0, n, size=(n, n_paths))
+
+    if method == "trades":
+        return rng.permuted(np.broadcast_to(np.arange(n)[:, None], (n, n_paths)), axis=0)
+
+    if method == "block":
+        p = 1.0 / (block_size or default_block_size(n))
+        starts = rng.integers(0, n, size=(n, n_paths))
+        new_block = rng.random((n, n_paths)) < p
+        new_block[0] = True
+        # Row where the current block began, then walk forward (circularly) from its start
+        steps = np.arange(n)[:, None]
+        began = np.maximum.accumulate(np.where(new_block, steps, 0), axis=0)
+        return (np.take_along_axis(starts, began, axis=0) + (steps - began)) % n
+
+    raise ValueError(f"Unknown resampling method '{method}' (expected one of {METHODS})")
+
+
+def iter_resampled_returns(
+    returns,
+    n_paths: int,
+    method: str = "block",
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[np.ndarray]:
+    """Yield (bars × chunk) matrices of resampled returns, `n_paths` columns in total."""
+    values = np.nan_to_num(np.asarray(returns, dtype=np.float64).ravel())
+    for paths, child in _chunks(n_paths, chunk_size, seed):
+        rng = np.random.default_rng(child)
+        yield values[resample_indices(rng, len(values), paths, method, block_size)]
+
+
+def _chunks(n_paths: int, chunk_size: int, seed: Optional[int]):
+    counts = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    return zip(counts, np.random.SeedSequence(seed).spawn(len(counts)))
+
+
+def _chunk_metrics(
+    returns: np.ndarray,
+    paths: int,
+    child: np.random.SeedSequence,
+    method: str,
+    block_size: Optional[int],
+    risk_free_rate: float,
+    periods_per_year: int,
+) -> pd.DataFrame:
+    """Metrics of one chunk of resampled paths (runs in a worker process)."""
+    rng = np.random.default_rng(child)
+    sampled = returns[resample_indices(rng, len(returns), paths, method, block_size)]
+    equity = np.empty((len(returns) + 1, paths))
+    equity[0] = 1.0
+    np.cumprod(1.0 + sampled, axis=0, out=equity[1:])
+    del sampled
+    return compute_performance_metrics_batch(equity, risk_free_rate, periods_per_year)
+
+
+def bootstrap_metrics(
+    returns,
+    n_paths: int = 1000,
+    method: str = "block",
+    block_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    confidence: float = 0.95,
+    max_chunk_bytes: int = 64 * 1024 * 1024,
+    max_workers: Optional[int] = None,
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = 252,
+) -> Dict[str, Any]:
+    """
+    Resample `returns` (per-bar strategy returns, or per-trade returns with
+    method="trades") into `n_paths` paths and compute the batch metrics of each.
+
+    max_chunk_bytes bounds the working set of one chunk; max_workers > 1
+    evaluates chunks on a process pool (same results as in-process).
+
+    Returns:
+        {"observed": metrics of the original path (Series),
+         "paths": one metrics row per resampled path (DataFrame),
+         "summary": mean / std / CI bounds / P(metric <= 0) per metric (DataFrame)}
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resampling method '{method}' (expected one of {METHODS})")
+    values = np.nan_to_num(np.asarray(returns, dtype=np.float64).ravel())
+    n = len(values)
+    if n < 2:
+        raise ValueError("Need at least two returns to resample")
+
+    # ~10 (bars × paths) float64 temporaries live at once inside a chunk
+    chunk_size = int(max(1, min(n_paths, max_chunk_bytes // (10 * 8 * (n + 1)))))
+    jobs = [
+        (values, paths, child, method, block_size, risk_free_rate, periods_per_year)
+        for paths, child in _chunks(n_paths, chunk_size, seed)
+    ]
+
+    if max_workers and max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(_chunk_metrics, *zip(*jobs)))
+    else:
+        frames = [_chunk_metrics(*job) for job in jobs]
+    paths = pd.concat(frames, ignore_index=True)
+
+    observed_equity = np.concatenate([[1.0], np.cumprod(1.0 + values)])
+    observed = compute_performance_metrics_batch(
+        observed_equity, risk_free_rate, periods_per_year
+    ).iloc[0]
+
+    return {
+        "observed": observed,
+        "paths": paths,
+        "summary": confidence_intervals(paths, confidence),
+    }
+
+
+def confidence_intervals(paths: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """Percentile confidence intervals of every metric column."""
+    tail = (1.0 - confidence) / 2.0
+    finite = paths.replace([np.inf, -np.inf], np.nan)
+    return pd.DataFrame(
+        {
+            "mean": finite.mean(),
+            "std": finite.std(),
+            "lower": finite.quantile(tail),
+            "median": finite.median(),
+            "upper": finite.quantile(1.0 - tail),
+            "prob_non_positive": (paths <= 0).mean(),
+        }
+    )
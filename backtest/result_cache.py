@@ -0,0 +1,294 @@
+# backtest/result_cache.py
+"""
+NEXORA Backtest Result Cache
+----------------------------
+Persistent memo of backtest results in a local SQLite file, so grid/GA/
+Bayesian searches, walk-forward windows and repeated CLI runs never repeat an
+identical backtest.
+
+Entries are keyed by
+    strategy class + version, normalized params, data fingerprint, cost settings
+
+- the version is the class's `cache_version` attribute when defined, else a
+  hash of its source, so editing a strategy invalidates its old results;
+- the database runs in WAL mode with a busy timeout, and each process/thread
+  opens its own connection, so pool workers can share one cache file;
+- the total payload size is bounded: the least recently used entries are
+  evicted once `max_bytes` is exceeded;
+- hit/miss counters are persisted, so stats() reports the hit rate across
+  every process that used the file.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics.indicators import data_fingerprint
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "backtest_results.sqlite",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key      TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    payload  BLOB NOT NULL,
+    nbytes   INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+# -------------------------------------------------------------------------
+# Key construction
+# -------------------------------------------------------------------------
+def strategy_id(strategy: Any) -> str:
+    """'module.Class@version' for a strategy instance or class (strings pass through)."""
+    if isinstance(strategy, str):
+        return strategy
+    cls = strategy if inspect.isclass(strategy) else type(strategy)
+    version = getattr(cls, "cache_version", None)
+    if version is None:
+        try:
+            source = inspect.getsource(cls)
+        except (OSError, TypeError):
+            source = ""
+        version = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+    return f"{cls.__module__}.{cls.__qualname__}@{version}"
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> str:
+    """Canonical JSON of a parameter dict (sorted keys, numpy → Python scalars)."""
+
+    def plain(value):
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, dict):
+            return {str(k): plain(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [plain(v) for v in value]
+        return value
+
+    return json.dumps(plain(params or {}), sort_keys=True, default=str)
+
+
+def fingerprint_data(data: Any) -> str:
+    """
+    Content hash of a strategy input: dicts of frames/series, frames, series,
+    arrays, or a path to a data file (hashed by content).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, dict):
+        for key in sorted(data, key=str):
+            digest.update(f"{key}={fingerprint_data(data[key])};".encode())
+    elif isinstance(data, (pd.Series, pd.DataFrame)):
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        names = data.columns if isinstance(data, pd.DataFrame) else [data.name]
+        digest.update(repr(list(names)).encode())
+    elif isinstance(data, np.ndarray):
+        digest.update(data_fingerprint(data).encode())
+    elif isinstance(data, (str, os.PathLike)) and os.path.isfile(data):
+        with open(data, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    else:
+        digest.update(repr(data).encode())
+    return digest.hexdigest()
+
+
+def make_key(
+    strategy: Any,
+    params: Optional[Dict[str, Any]],
+    data: Any,
+    costs: Optional[Dict[str, Any]] = None,
+) -> str:
+    parts = [strategy_id(strategy), normalize_params(params), fingerprint_data(data)]
+    parts.append(normalize_params(costs))
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=20).hexdigest()
+
+
+# -------------------------------------------------------------------------
+# Cache
+# -------------------------------------------------------------------------
+class BacktestResultCache:
+    """
+    SQLite-backed, size-bounded LRU cache of pickled backtest results.
+
+    Usage:
+        cache = BacktestResultCache()
+        result = cache.get_or_compute(strategy, params, data, lambda: run(...), costs)
+        cache.stats()["hit_rate"]
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        timeout: float = 30.0,
+    ):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_bytes = int(max_bytes)
+        self.timeout = float(timeout)
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def __getstate__(self):
+        # Connections don't cross process boundaries; workers reconnect lazily
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for `key` (None on a miss)."""
+        conn = self._connect()
+        row = conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        value = None
+        if row is not None:
+            try:
+                value = pickle.loads(row[0])
+            except Exception:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                row = None
+
+        hit = row is not None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if hit:
+                conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._bump(conn, "hits" if hit else "misses")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def put(self, key: str, value: Any, strategy: str = "") -> None:
+        """Store `value` and evict least recently used entries over the size budget."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, strategy, payload, len(payload), now, now),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_or_compute(
+        self,
+        strategy: Any,
+        params: Optional[Dict[str, Any]],
+        data: Any,
+        compute: Callable[[], Any],
+        costs: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        key = make_key(strategy, params, data, costs)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, strategy_id(strategy))
+        return value
+
+    # ------------------------------------------------------------------
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM results").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, nbytes in conn.execute(
+            "SELECT key, nbytes FROM results ORDER BY accessed, created"
+        ):
+            victims.append((key,))
+            excess -= nbytes
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        self._bump(conn, "evictions", len(victims))
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO counters VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def clear(self) -> None:
+        conn = self._connect()
+        conn.execute("DELETE FROM results")
+        conn.execute("DELETE FROM counters")
+        conn.execute("VACUUM")
+        self.hits = self.misses = 0
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit rate, both for this process and across all users of the file."""
+        conn = self._connect()
+        entries, nbytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM results"
+        ).fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        session = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "session_hit_rate": round(self.hits / session, 4) if session else 0.0,
+        }
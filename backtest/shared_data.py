@@ -0,0 +1,134 @@
+# backtest/shared_data.py
+"""
+Shared-Memory Datasets
+----------------------
+Load each dataset once into `multiprocessing.shared_memory` and let worker
+processes attach to it by name (zero-copy) instead of re-reading CSVs or
+pickling frames per job.
+
+Only numeric columns are shared (as one float64 block per dataset); a
+non-default index (e.g. timestamps) travels with the spec.
+
+Usage (parent):
+    with SharedDatasetStore() as store:
+        store.put("BTC", df)
+        spec = store.spec("BTC")          # small, picklable
+        pool.submit(job, spec)
+
+Usage (worker):
+    frame, shm = attach_frame(spec)
+    ...
+    shm.close()
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SharedFrameSpec(NamedTuple):
+    """Everything a worker needs to rebuild a shared frame."""
+
+    name: str
+    shape: Tuple[int, int]
+    columns: List[str]
+    index: Optional[Any] = None  # None: default RangeIndex
+
+
+def share_frame(df: pd.DataFrame) -> Tuple[shared_memory.SharedMemory, SharedFrameSpec]:
+    """Copy the numeric columns of `df` into a new shared-memory block."""
+    numeric = df.select_dtypes(include=[np.number])
+    values = numeric.to_numpy(dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    block = np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)
+    block[:] = values
+    index = None if df.index.equals(pd.RangeIndex(len(df))) else df.index
+    return shm, SharedFrameSpec(shm.name, values.shape, [str(c) for c in numeric.columns], index)
+
+
+def attach_frame(spec: SharedFrameSpec) -> Tuple[pd.DataFrame, shared_memory.SharedMemory]:
+    """
+    Attach to a shared block by name and wrap it as a read-only DataFrame.
+    Keep the returned SharedMemory alive while the frame is used, then close() it.
+    """
+    shm = shared_memory.SharedMemory(name=spec.name)
+    # The creating process owns the block; don't let this process's tracker unlink it
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    block = np.ndarray(spec.shape, dtype=np.float64, buffer=shm.buf)
+    block.setflags(write=False)
+    return pd.DataFrame(block, index=spec.index, columns=spec.columns, copy=False), shm
+
+
+class SharedDatasetStore:
+    """Owns the shared blocks for a set of named datasets and unlinks them on close()."""
+
+    def __init__(self):
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._specs: Dict[str, SharedFrameSpec] = {}
+
+    def __enter__(self) -> "SharedDatasetStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def put(self, key: str, df: pd.DataFrame) -> SharedFrameSpec:
+        if key in self._specs:
+            return self._specs[key]
+        shm, spec = share_frame(df)
+        self._blocks[key] = shm
+        self._specs[key] = spec
+        return spec
+
+    def spec(self, key: str) -> SharedFrameSpec:
+        return self._specs[key]
+
+    @property
+    def specs(self) -> Dict[str, SharedFrameSpec]:
+        return dict(self._specs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(int(np.prod(s.shape)) * 8 for s in self._specs.values())
+
+    def close(self) -> None:
+        for shm in self._blocks.values():
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks.clear()
+        self._specs.clear()
+
+
+class SharedFrameLoader:
+    """
+    Worker-side symbol loader over a dict of specs. Attachments are cached for
+    the life of the loader and released by close().
+    """
+
+    def __init__(self, specs: Dict[str, SharedFrameSpec]):
+        self.specs = specs
+        self._attached: Dict[str, Tuple[pd.DataFrame, shared_memory.SharedMemory]] = {}
+
+    def __call__(self, key: str) -> pd.DataFrame:
+        if key not in self._attached:
+            if key not in self.specs:
+                raise FileNotFoundError(f"No shared dataset for '{key}'")
+            self._attached[key] = attach_frame(self.specs[key])
+        return self._attached[key][0]
+
+    def close(self) -> None:
+        blocks = [shm for _, shm in self._attached.values()]
+        self._attached.clear()
+        for shm in blocks:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # a view is still referenced; released at process exit
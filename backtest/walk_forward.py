@@ -0,0 +1,270 @@
+# backtest/walk_forward.py
+"""
+NEXORA Walk-Forward Analysis
+----------------------------
+Rolling train/test evaluation of a strategy:
+
+    [ in-sample (optimize) ][ out-of-sample (evaluate) ]
+              step →   [ in-sample ][ out-of-sample ]
+                             ...
+
+- rolling windows keep a fixed-length in-sample segment,
+- anchored windows grow the in-sample segment from the first bar.
+
+Each in-sample segment picks the best parameters from a grid (the strategy's
+batched sweep() when it supports the fitness metric, otherwise one
+VectorizedBacktester run per combination). Those parameters are then traded
+on the following out-of-sample segment, and the out-of-sample returns of all
+windows are stitched into one equity curve.
+
+When the engine carries a BacktestResultCache, in-sample sweeps and grid
+runs are memoized, so re-running overlapping windows or the same analysis is
+mostly cache hits.
+
+Per-window data are `.iloc` / array slices of the full dataset (views, not
+copies), and windows run concurrently on a thread pool so they share those
+views and the process-wide indicator cache.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import VectorizedBacktester
+from backtest.performance_metrics import compute_performance_metrics
+from optimization.optimizers.utils import (
+    compute_fitness,
+    generate_param_grid,
+    sort_results,
+    sweep_results,
+)
+
+
+class WalkForwardWindow(NamedTuple):
+    """Bar ranges ([start, stop)) of one in-sample / out-of-sample split."""
+
+    index: int
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+
+def walk_forward_windows(
+    n_bars: int,
+    train_size: int,
+    test_size: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+) -> List[WalkForwardWindow]:
+    """
+    Split `n_bars` into consecutive walk-forward windows.
+
+    step defaults to test_size (back-to-back out-of-sample segments) and may
+    not be smaller, so no bar is traded out-of-sample twice. The last test
+    segment is truncated at the end of the data.
+    """
+    step = step or test_size
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("train_size and test_size must be positive")
+    if step < test_size:
+        raise ValueError("step must be >= test_size (out-of-sample segments may not overlap)")
+    if n_bars <= train_size:
+        raise ValueError(f"Need more than {train_size} bars, got {n_bars}")
+
+    windows = []
+    offset = 0
+    while offset + train_size < n_bars:
+        train_start = 0 if anchored else offset
+        test_start = offset + train_size
+        windows.append(
+            WalkForwardWindow(
+                len(windows),
+                train_start,
+                test_start,
+                test_start,
+                min(test_start + test_size, n_bars),
+            )
+        )
+        offset += step
+    return windows
+
+
+def slice_data(data: Any, start: int, stop: int) -> Any:
+    """Positional slice of a strategy input (dict of frames/series, frame, series or array)."""
+    if isinstance(data, dict):
+        return {key: slice_data(value, start, stop) for key, value in data.items()}
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        return data.iloc[start:stop]
+    return data[start:stop]
+
+
+def data_length(data: Any) -> int:
+    if isinstance(data, dict):
+        lengths = {len(value) for value in data.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"Strategy inputs must be aligned, got lengths {sorted(lengths)}")
+        return lengths.pop()
+    return len(data)
+
+
+class WalkForwardEngine:
+    """
+    Walk-forward optimizer / evaluator.
+
+    Usage:
+        wf = WalkForwardEngine(strategy, {"short_window": [10, 20], "long_window": [50, 100]},
+                               train_size=2000, test_size=500)
+        result = wf.run(data)
+        result["equity"]    # stitched out-of-sample equity curve
+        result["windows"]   # one row per window (ranges, chosen params, IS/OOS stats)
+    """
+
+    def __init__(
+        self,
+        strategy: Any,
+        param_grid: Dict[str, List[Any]],
+        train_size: int,
+        test_size: int,
+        step: Optional[int] = None,
+        anchored: bool = False,
+        engine: Optional[VectorizedBacktester] = None,
+        fitness_metric: str = "sharpe_ratio",
+        use_sweep: bool = True,
+        optimizer: Optional[Callable[[Any, Dict[str, List[Any]], Any], Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        fitness_metric : str
+            Metric maximized in-sample: a sweep() output ("pnl", "sharpe") or a
+            VectorizedBacktester metric ("sharpe_ratio", "total_return", ...).
+        use_sweep : bool
+            Use the strategy's frictionless batched sweep() when it provides
+            `fitness_metric`; otherwise every combination runs through the engine
+            (costs included).
+        optimizer : callable, optional
+            optimizer(strategy, param_grid, in_sample_data) -> {"params": ..., "fitness": ...}
+            replacing the built-in grid search.
+        """
+        self.strategy = strategy
+        self.param_grid = param_grid
+        self.train_size = int(train_size)
+        self.test_size = int(test_size)
+        self.step = step
+        self.anchored = anchored
+        self.engine = engine or VectorizedBacktester.from_settings()
+        self.fitness_metric = fitness_metric
+        self.use_sweep = use_sweep
+        self.optimizer = optimizer
+        self.max_workers = max_workers
+
+    # ------------------------------------------------------------------
+    def optimize(self, data: Any) -> Dict[str, Any]:
+        """Best {"params", "fitness"} of the parameter grid on `data`."""
+        if self.optimizer is not None:
+            return self.optimizer(self.strategy, self.param_grid, data)
+
+        results = None
+        if self.use_sweep:
+            try:
+                results = sweep_results(
+                    self.strategy,
+                    self.param_grid,
+                    data,
+                    self.fitness_metric,
+                    cache=self.engine.result_cache,
+                )
+            except ValueError:
+                results = None  # sweep doesn't provide this metric
+
+        if results is None:
+            results = []
+            for params in generate_param_grid(self.param_grid):
+                metrics = self.engine.run_strategy(self.strategy, data, params)["metrics"]
+                results.append(
+                    {"params": params, "fitness": compute_fitness(metrics, self.fitness_metric)}
+                )
+
+        best = sort_results(results, key="fitness")[0]
+        params = {key: _python_scalar(value) for key, value in best["params"].items()}
+        return {"params": params, "fitness": float(best["fitness"])}
+
+    def evaluate(self, data: Any, params: Dict[str, Any], test_bars: int) -> Dict[str, Any]:
+        """
+        Trade `params` over the last `test_bars` bars of `data`. Earlier bars
+        only warm up the indicators; the segment starts flat.
+        """
+        frame = self.strategy.generate_positions(params, data).iloc[-test_bars:]
+        return self.engine.run(frame["position"], frame["returns"], frame.get("price"))
+
+    def _run_window(self, data: Any, window: WalkForwardWindow) -> Tuple[Dict, Dict]:
+        best = self.optimize(slice_data(data, window.train_start, window.train_stop))
+        history = slice_data(data, window.train_start, window.test_stop)
+        result = self.evaluate(history, best["params"], window.test_stop - window.test_start)
+        return best, result
+
+    # ------------------------------------------------------------------
+    def run(self, data: Any, risk_free_rate: float = 0.0) -> Dict[str, Any]:
+        """
+        Optimize and evaluate every window (concurrently) and stitch the
+        out-of-sample segments.
+
+        Returns:
+            {"windows": DataFrame, "returns": Series, "equity": Series,
+             "positions": Series, "trades": DataFrame, "metrics": dict}
+        """
+        windows = walk_forward_windows(
+            data_length(data), self.train_size, self.test_size, self.step, self.anchored
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            outcomes = list(executor.map(lambda w: self._run_window(data, w), windows))
+
+        rows = []
+        for window, (best, result) in zip(windows, outcomes):
+            rows.append(
+                {
+                    **window._asdict(),
+                    "params": best["params"],
+                    "is_fitness": best["fitness"],
+                    "oos_return": result["metrics"]["total_return"],
+                    "oos_sharpe": result["metrics"]["sharpe_ratio"],
+                    "oos_trades": result["metrics"]["trades"],
+                }
+            )
+        return {"windows": pd.DataFrame(rows), **self.stitch(outcomes, risk_free_rate)}
+
+    def stitch(self, outcomes: List[Tuple[Dict, Dict]], risk_free_rate: float = 0.0) -> Dict:
+        """Chain the out-of-sample segments into one compounded equity curve."""
+        results = [result for _, result in outcomes]
+        returns = pd.concat([r["returns"] for r in results])
+        capital = self.engine.capital_base
+        equity = pd.Series(
+            capital * np.cumprod(1.0 + returns.to_numpy()), index=returns.index, name="equity"
+        )
+        trades = pd.concat(
+            [r["trades"].assign(window=i) for i, r in enumerate(results)], ignore_index=True
+        )
+
+        metrics = compute_performance_metrics(
+            pd.concat([pd.Series([capital]), equity], ignore_index=True),
+            risk_free_rate=risk_free_rate,
+        )
+        metrics["trades"] = int(len(trades))
+        metrics["costs"] = round(float(trades["cost"].sum()) if len(trades) else 0.0, 2)
+        metrics["final_equity"] = round(float(equity.iloc[-1]), 2) if len(equity) else 0.0
+        metrics["windows"] = len(results)
+
+        return {
+            "returns": returns,
+            "equity": equity,
+            "positions": pd.concat([r["positions"] for r in results]),
+            "trades": trades,
+            "metrics": metrics,
+        }
+
+
+def _python_scalar(value: Any) -> Any:
+    """numpy scalars (from sweep grids) → plain Python values."""
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,150 @@
+# File: core/cross_sectional.py
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.statistical_arbitrage import StatisticalArbitrageStrategy
+from strategies.trend import TrendFollowingStrategy
+
+SIDE_MAP = {1: "BUY", -1: "SELL", 0: "HOLD"}
+
+# Constructor keywords read from each settings `strategy.<section>`
+MEAN_REVERSION_OPTIONS = ("lookback", "threshold")
+STAT_ARB_OPTIONS = ("lookback", "entry_z", "exit_z", "coint_pval", "min_valid", "pairs")
+
+
+def _options(section: Optional[Dict[str, Any]], keys: Sequence[str]) -> Dict[str, Any]:
+    section = section or {}
+    return {key: section[key] for key in keys if key in section}
+
+
+def build_strategies(config: Dict[str, Any], logger=None) -> Dict[str, Any]:
+    """
+    The production strategy map run by CrossSectionalEngine, built from the
+    settings `strategy` section. Trend following takes its section as a
+    config dict; mean reversion and stat-arb take keyword arguments.
+    """
+    section = config.get("strategy", {}) or {}
+    return {
+        "trend": TrendFollowingStrategy(section.get("trend_following"), logger),
+        "mean": MeanReversionStrategy(
+            **_options(section.get("mean_reversion"), MEAN_REVERSION_OPTIONS)
+        ),
+        "stat_arb": StatisticalArbitrageStrategy(
+            **_options(section.get("stat_arb"), STAT_ARB_OPTIONS)
+        ),
+    }
+
+
+class CrossSectionalEngine:
+    """
+    Runs strategies over the whole symbol universe in one vectorized call.
+
+    Each strategy receives a (time × symbol) price matrix and returns a signal
+    vector (+1 long, -1 short, 0 flat) aligned with the matrix columns via
+    `generate_cross_section(prices)`. The engine remembers the last vector per
+    strategy and only materializes per-symbol signal dicts where it changed.
+
+    A strategy that raises (or returns a misshaped vector) is logged and
+    skipped for that step while the others still emit; after `max_failures`
+    consecutive failures it is disabled.
+    """
+
+    def __init__(self, strategies: Dict[str, Any], logger=None, max_failures: int = 3):
+        self.logger = logger
+        self.strategies = dict(strategies)
+        self.max_failures = max_failures
+        self.last_signals: Dict[str, pd.Series] = {}
+        self.failures: Dict[str, int] = {}
+        self.disabled: set = set()
+
+    # -----------------------------
+    # Signal evaluation
+    # -----------------------------
+
+    def evaluate(self, prices: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Return the full signal vector of every active strategy."""
+        vectors = {}
+        for name, strategy in self.strategies.items():
+            if name in self.disabled:
+                continue
+            try:
+                signal = np.asarray(strategy.generate_cross_section(prices), dtype=np.int8)
+                if signal.shape != (prices.shape[1],):
+                    raise ValueError(
+                        f"{name} returned {signal.shape} signals for {prices.shape[1]} symbols"
+                    )
+            except NotImplementedError:
+                self.disabled.add(name)
+                if self.logger:
+                    self.logger.warning(f"{name} has no cross-sectional mode — skipped.")
+                continue
+            except Exception as e:
+                self._record_failure(name, e)
+                continue
+            self.failures.pop(name, None)
+            vectors[name] = signal
+        return vectors
+
+    def _record_failure(self, name: str, error: Exception) -> None:
+        count = self.failures.get(name, 0) + 1
+        self.failures[name] = count
+        if self.logger:
+            self.logger.error(f"❌ Error in {name} strategy ({count}/{self.max_failures}): {error}")
+        if count >= self.max_failures:
+            self.disabled.add(name)
+            if self.logger:
+                self.logger.warning(f"⚠️ {name} disabled after {count} consecutive failures.")
+
+    def step(self, prices: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Evaluate all strategies on the latest matrix and return signal dicts
+        only for (strategy, symbol) pairs whose signal changed since the last step.
+        """
+        if prices.empty:
+            return []
+
+        symbols = prices.columns
+        last_prices = prices.ffill().iloc[-1].to_numpy(dtype=np.float64)
+        changes: List[Dict[str, Any]] = []
+
+        for name, signal in self.evaluate(prices).items():
+            previous = self.last_signals.get(name)
+            if previous is None:
+                prev = np.zeros(len(symbols), dtype=np.int8)
+            else:
+                prev = previous.reindex(symbols, fill_value=0).to_numpy(dtype=np.int8)
+
+            for i in np.flatnonzero(signal != prev):
+                changes.append(
+                    {
+                        "strategy": name,
+                        "symbol": symbols[i],
+                        "side": SIDE_MAP[int(signal[i])],
+                        "signal": int(signal[i]),
+                        "previous": int(prev[i]),
+                        "price": float(last_prices[i]),
+                    }
+                )
+            self.last_signals[name] = pd.Series(signal, index=symbols)
+
+        return changes
+
+    # -----------------------------
+    # Accessors
+    # -----------------------------
+
+    def current_signals(self, name: Optional[str] = None) -> pd.DataFrame:
+        """Return the latest signal matrix (strategies × symbols) or one row."""
+        frame = pd.DataFrame(self.last_signals).T
+        if name is not None:
+            return frame.loc[[name]] if name in frame.index else pd.DataFrame()
+        return frame
+
+    def reset(self, names: Optional[Sequence[str]] = None) -> None:
+        """Forget stored signals so the next step re-emits everything."""
+        for name in names or list(self.last_signals):
+            self.last_signals.pop(name, None)
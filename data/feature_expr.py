@@ -0,0 +1,331 @@
+# File: data/feature_expr.py
+"""
+NEXORA Feature Expressions
+--------------------------
+A small declarative layer for defining features as expressions:
+
+    close = col("close")
+    features = FeaturePlan({
+        "sma_50": rolling_mean(close, 50),
+        "momentum_10": pct_change(close, 10),
+        "vol_ratio": col("volume") / rolling_mean(col("volume"), 20),
+    })
+    frame = features.evaluate(ohlcv)
+
+Expressions are hash-consed: building the same sub-expression twice yields
+the same node, so a plan is a DAG in which every shared sub-expression is
+evaluated exactly once. Rolling statistics share their cumulative sums per
+input (all windows of rolling_mean/rolling_std/zscore/rolling_corr on one
+series reuse one cumsum), so adding a feature adds an O(n) window
+difference rather than another full rolling pass.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from analytics.indicators import IndicatorCache
+
+Number = Union[int, float]
+
+
+class Expr:
+    """A node of the feature DAG. Build nodes with the module functions."""
+
+    __slots__ = ("op", "args", "params", "__weakref__")
+
+    _interned: "weakref.WeakValueDictionary[tuple, Expr]" = weakref.WeakValueDictionary()
+
+    def __new__(cls, op: str, args: Tuple["Expr", ...] = (), params: Tuple[Hashable, ...] = ()):
+        key = (op, tuple(id(a) for a in args), params)
+        node = cls._interned.get(key)
+        if node is None:
+            node = super().__new__(cls)
+            node.op, node.args, node.params = op, tuple(args), tuple(params)
+            cls._interned[key] = node
+        return node
+
+    def __repr__(self) -> str:
+        inner = [repr(a) for a in self.args] + [repr(p) for p in self.params]
+        return f"{self.op}({', '.join(inner)})"
+
+    # Arithmetic sugar -------------------------------------------------
+    def __add__(self, other: "Expr") -> "Expr":
+        return Expr("add", _commute(self, _wrap(other)))
+
+    def __sub__(self, other: "Expr") -> "Expr":
+        return Expr("sub", (self, _wrap(other)))
+
+    def __mul__(self, other: "Expr") -> "Expr":
+        return Expr("mul", _commute(self, _wrap(other)))
+
+    def __truediv__(self, other: "Expr") -> "Expr":
+        return ratio(self, _wrap(other))
+
+
+def _wrap(value: Union[Expr, Number]) -> Expr:
+    return value if isinstance(value, Expr) else const(value)
+
+
+def _commute(a: Expr, b: Expr) -> Tuple[Expr, Expr]:
+    """Canonical argument order for commutative ops, so a+b and b+a share a node."""
+    return (a, b) if repr(a) <= repr(b) else (b, a)
+
+
+# ----------------------------------------------------------------------
+# Expression constructors
+# ----------------------------------------------------------------------
+def col(name: str) -> Expr:
+    """A raw input column."""
+    return Expr("col", (), (name,))
+
+
+def const(value: Number) -> Expr:
+    return Expr("const", (), (float(value),))
+
+
+def rolling_mean(x: Expr, window: int) -> Expr:
+    return Expr("rolling_mean", (x,), (int(window),))
+
+
+def rolling_std(x: Expr, window: int) -> Expr:
+    """Rolling sample standard deviation (ddof=1)."""
+    return Expr("rolling_std", (x,), (int(window),))
+
+
+def zscore(x: Expr, window: int) -> Expr:
+    return Expr("zscore", (x,), (int(window),))
+
+
+def rolling_corr(x: Expr, y: Expr, window: int) -> Expr:
+    return Expr("rolling_corr", _commute(x, y), (int(window),))
+
+
+def pct_change(x: Expr, periods: int = 1) -> Expr:
+    return Expr("pct_change", (x,), (int(periods),))
+
+
+def log_return(x: Expr, periods: int = 1) -> Expr:
+    return Expr("log_return", (x,), (int(periods),))
+
+
+def diff(x: Expr, periods: int = 1) -> Expr:
+    return Expr("diff", (x,), (int(periods),))
+
+
+def lag(x: Expr, periods: int = 1) -> Expr:
+    """x shifted forward by `periods` rows (pandas shift)."""
+    return Expr("lag", (x,), (int(periods),))
+
+
+def ratio(a: Expr, b: Expr) -> Expr:
+    return Expr("ratio", (a, b))
+
+
+def mean_across(*exprs: Expr) -> Expr:
+    """Row-wise mean of several expressions, ignoring NaN (like DataFrame.mean(axis=1))."""
+    return Expr("mean_across", tuple(exprs))
+
+
+# ----------------------------------------------------------------------
+# Shared rolling sums
+# ----------------------------------------------------------------------
+class _Sums:
+    """Cumulative sums of one de-meaned series, shared by all its rolling windows."""
+
+    def __init__(self, values: np.ndarray):
+        self.nan = np.isnan(values)
+        finite = values[~self.nan]
+        self.ref = finite[0] if finite.size else 0.0
+        self.centered = np.where(self.nan, 0.0, values - self.ref)
+        self.csum = np.concatenate([[0.0], np.cumsum(self.centered)])
+        self.cnan = np.concatenate([[0], np.cumsum(self.nan)])
+        self._csq: Optional[np.ndarray] = None
+
+    @property
+    def csq(self) -> np.ndarray:
+        if self._csq is None:
+            self._csq = np.concatenate([[0.0], np.cumsum(self.centered**2)])
+        return self._csq
+
+    def window(self, cum: np.ndarray, w: int) -> np.ndarray:
+        return cum[w:] - cum[:-w]
+
+    def has_nan(self, w: int) -> np.ndarray:
+        return self.window(self.cnan, w) > 0
+
+    def mean(self, w: int) -> np.ndarray:
+        out = np.full(len(self.nan), np.nan)
+        if 0 < w <= len(out):
+            s1 = self.window(self.csum, w)
+            out[w - 1 :] = np.where(self.has_nan(w), np.nan, s1 / w + self.ref)
+        return out
+
+    def std(self, w: int) -> np.ndarray:
+        out = np.full(len(self.nan), np.nan)
+        if 1 < w <= len(out):
+            s1, s2 = self.window(self.csum, w), self.window(self.csq, w)
+            var = np.maximum((s2 - s1**2 / w) / (w - 1), 0.0)
+            out[w - 1 :] = np.where(self.has_nan(w), np.nan, np.sqrt(var))
+        return out
+
+
+# ----------------------------------------------------------------------
+# Plan
+# ----------------------------------------------------------------------
+class FeaturePlan:
+    """
+    A named set of feature expressions compiled into one de-duplicated DAG.
+
+    `evaluate()` walks the DAG once in topological order. If a cache and a
+    `series_prefix` are given, rolling indicators are served from the shared
+    IndicatorCache under named series, so repeated evaluation on a growing
+    or rolling buffer only processes the new rows.
+    """
+
+    _CACHED_OPS = {
+        "rolling_mean": "sma",
+        "rolling_std": "std",
+        "zscore": "zscore",
+        "pct_change": "pct_change",
+        "log_return": "log_return",
+    }
+
+    def __init__(self, features: Mapping[str, Expr]):
+        self.features: Dict[str, Expr] = dict(features)
+        self.order: List[Expr] = []
+        seen: set = set()
+
+        def visit(node: Expr) -> None:
+            if id(node) in seen:
+                return
+            for arg in node.args:
+                visit(arg)
+            seen.add(id(node))
+            self.order.append(node)
+
+        for node in self.features.values():
+            visit(node)
+
+    @property
+    def n_nodes(self) -> int:
+        """Number of distinct nodes evaluated (after de-duplication)."""
+        return len(self.order)
+
+    @property
+    def columns(self) -> List[str]:
+        """Raw input columns the plan reads."""
+        return [n.params[0] for n in self.order if n.op == "col"]
+
+    def evaluate(
+        self,
+        data: Union[pd.DataFrame, Mapping[str, Any]],
+        cache: Optional[IndicatorCache] = None,
+        series_prefix: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Evaluate every feature and return them as columns of a DataFrame."""
+        index = data.index if isinstance(data, pd.DataFrame) else None
+        use_cache = cache is not None and series_prefix is not None
+
+        values: Dict[int, np.ndarray] = {}
+        sums: Dict[int, _Sums] = {}
+
+        def sums_of(node: Expr) -> _Sums:
+            if id(node) not in sums:
+                sums[id(node)] = _Sums(values[id(node)])
+            return sums[id(node)]
+
+        for node in self.order:
+            args = [values[id(a)] for a in node.args]
+            if use_cache and node.op in self._CACHED_OPS:
+                values[id(node)] = cache.compute(  # type: ignore[union-attr]
+                    args[0],
+                    self._CACHED_OPS[node.op],
+                    node.params[0],
+                    series_id=f"{series_prefix}:{node.args[0]!r}",
+                )
+            else:
+                values[id(node)] = self._apply(node, args, data, sums_of)
+
+        out = pd.DataFrame({name: values[id(node)] for name, node in self.features.items()})
+        if index is not None:
+            out.index = index
+        return out
+
+    @staticmethod
+    def _apply(node: Expr, args: List[np.ndarray], data: Any, sums_of) -> np.ndarray:
+        op, p = node.op, node.params
+        if op == "col":
+            return np.asarray(data[p[0]], dtype=np.float64)
+        if op == "const":
+            n = (
+                len(data.index)
+                if isinstance(data, pd.DataFrame)
+                else len(next(iter(data.values())))
+            )
+            return np.full(n, p[0])
+        if op in _ROLLING:
+            return _ROLLING[op](*[sums_of(a) for a in node.args], p[0])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if op == "zscore":
+                s = sums_of(node.args[0])
+                return (args[0] - s.mean(p[0])) / s.std(p[0])
+            if op in _SHIFTED:
+                x, k = args[0], p[0]
+                out = np.full(len(x), np.nan)
+                if 0 < k < len(x):
+                    out[k:] = _SHIFTED[op](x[k:], x[:-k])
+                return out
+            if op in _BINARY:
+                return _BINARY[op](args[0], args[1])
+            if op == "mean_across":
+                stacked = np.vstack(args)
+                valid = ~np.isnan(stacked)
+                counts = valid.sum(axis=0)
+                total = np.where(valid, stacked, 0.0).sum(axis=0)
+                return np.where(counts > 0, total / np.maximum(counts, 1), np.nan)
+        raise ValueError(f"Unknown feature op '{op}'")
+
+
+def _rolling_corr(a: _Sums, b: _Sums, w: int) -> np.ndarray:
+    """Rolling Pearson correlation from the shared sums of both inputs."""
+    out = np.full(len(a.nan), np.nan)
+    if 1 < w <= len(out):
+        cross = np.concatenate([[0.0], np.cumsum(a.centered * b.centered)])
+        sa, sb = a.window(a.csum, w), b.window(b.csum, w)
+        cov = a.window(cross, w) - sa * sb / w
+        var_a = np.maximum(a.window(a.csq, w) - sa**2 / w, 0.0)
+        var_b = np.maximum(b.window(b.csq, w) - sb**2 / w, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0)
+        has_nan = a.has_nan(w) | b.has_nan(w) | (var_a <= 0) | (var_b <= 0)
+        out[w - 1 :] = np.where(has_nan, np.nan, corr)
+    return out
+
+
+# op -> f(shared sums of each input..., window)
+_ROLLING = {
+    "rolling_mean": _Sums.mean,
+    "rolling_std": _Sums.std,
+    "rolling_corr": _rolling_corr,
+}
+
+# op -> f(x[t], x[t - k])
+_SHIFTED = {
+    "pct_change": lambda now, prev: now / prev - 1.0,
+    "log_return": lambda now, prev: np.log(now / prev),
+    "diff": lambda now, prev: now - prev,
+    "lag": lambda now, prev: prev,
+}
+
+_BINARY = {
+    "ratio": np.divide,
+    "add": np.add,
+    "sub": np.subtract,
+    "mul": np.multiply,
+}
@@ -1,8 +1,49 @@
 # File: data/feature_store.py
 
-import numpy as np
+from typing import Optional
+
 import pandas as pd
 
+from analytics.indicators import get_cache
+from data.feature_expr import (
+    FeaturePlan,
+    col,
+    diff,
+    log_return,
+    pct_change,
+    rolling_mean,
+    rolling_std,
+    zscore,
+)
+
+_close, _volume = col("close"), col("volume")
+_returns = pct_change(_close, 1)
+
+# Declarative feature set, evaluated as one de-duplicated DAG
+FEATURES = FeaturePlan(
+    {
+        "returns": _returns,
+        "log_ret": log_return(_close, 1),
+        # --- Rolling volatility ---
+        "volatility_10": rolling_std(_returns, 10),
+        "volatility_50": rolling_std(_returns, 50),
+        # --- Rolling momentum (drift indicator) ---
+        "momentum_10": pct_change(_close, 10),
+        "momentum_50": pct_change(_close, 50),
+        # --- Moving averages ---
+        "sma_10": rolling_mean(_close, 10),
+        "sma_50": rolling_mean(_close, 50),
+        # --- Moving average slope (trend strength) ---
+        "slope_10": diff(rolling_mean(_close, 10)),
+        "slope_50": diff(rolling_mean(_close, 50)),
+        # --- Volume features ---
+        "vol_mean_20": rolling_mean(_volume, 20),
+        "vol_ratio": _volume / rolling_mean(_volume, 20),
+        # --- Z-score of returns (normalized drift) ---
+        "zscore_ret": zscore(_returns, 50),
+    }
+)
+
 
 class FeatureStore:
     """
@@ -16,45 +57,22 @@ class FeatureStore:
         self.lookback = self.config.get("feature_lookback", 100)
         self.features = pd.DataFrame()
 
-    def compute_features(self, ohlcv: pd.DataFrame) -> pd.DataFrame:
+    def compute_features(self, ohlcv: pd.DataFrame, symbol: Optional[str] = None) -> pd.DataFrame:
         """
         Compute rolling statistical and technical features.
         Input:
             ohlcv (pd.DataFrame): recent price history from DataIngestion
+            symbol (str, optional): when given, the close/volume history is kept
+                as a named series in the shared indicator cache, so repeated calls
+                on a growing (or rolling) buffer only process the new bars
         Output:
             pd.DataFrame: most recent row of features
         """
         if len(ohlcv) < 5:
             return pd.DataFrame()
 
-        df = ohlcv.copy()
-        df["returns"] = df["close"].pct_change()
-        df["log_ret"] = np.log(df["close"] / df["close"].shift(1))
-
-        # --- Rolling volatility ---
-        df["volatility_10"] = df["returns"].rolling(window=10).std()
-        df["volatility_50"] = df["returns"].rolling(window=50).std()
-
-        # --- Rolling momentum (drift indicator) ---
-        df["momentum_10"] = df["close"] / df["close"].shift(10) - 1
-        df["momentum_50"] = df["close"] / df["close"].shift(50) - 1
-
-        # --- Moving averages ---
-        df["sma_10"] = df["close"].rolling(10).mean()
-        df["sma_50"] = df["close"].rolling(50).mean()
-
-        # --- Moving average slope (trend strength) ---
-        df["slope_10"] = df["sma_10"].diff()
-        df["slope_50"] = df["sma_50"].diff()
-
-        # --- Volume features ---
-        df["vol_mean_20"] = df["volume"].rolling(20).mean()
-        df["vol_ratio"] = df["volume"] / df["vol_mean_20"]
-
-        # --- Z-score of returns (normalized drift) ---
-        df["zscore_ret"] = (df["returns"] - df["returns"].rolling(50).mean()) / df[
-            "returns"
-        ].rolling(50).std()
+        frame = FEATURES.evaluate(ohlcv, cache=get_cache(), series_prefix=symbol)
+        df = ohlcv.assign(**frame)
 
         # Drop NaN and keep only last row for live use
         df = df.dropna().reset_index(drop=True)
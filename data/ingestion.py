@@ -143,6 +143,25 @@ class DataIngestion:
         await asyncio.sleep(0)  # Yield control
         return data_snapshot
 
+    # --------------------------------------------------------------------------
+    def get_price_matrix(self, field="close", window=None):
+        """
+        Return recent `field` values for every symbol as a (time × symbol)
+        DataFrame, aligned on each symbol's most recent bar. Missing history
+        is NaN. Used by the cross-sectional signal engine.
+        """
+        depth = max((len(buf) for buf in self.buffers.values()), default=0)
+        if window is not None:
+            depth = min(depth, int(window))
+
+        matrix = np.full((depth, len(self.symbols)), np.nan)
+        for j, symbol in enumerate(self.symbols):
+            rows = self.buffers[symbol][-depth:] if depth else []
+            if rows:
+                matrix[depth - len(rows) :, j] = [row.get(field, np.nan) for row in rows]
+
+        return pd.DataFrame(matrix, columns=self.symbols)
+
     # --------------------------------------------------------------------------
     def get_buffer_dataframe(self, symbol):
         """Return recent data as DataFrame."""
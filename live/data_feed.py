@@ -8,14 +8,31 @@ import aiohttp
 
 
 class KrakenDataFeed:
-    """Async Kraken WebSocket feed for trades."""
+    """
+    Async Kraken WebSocket feed for trades and (optionally) L2 book updates.
 
-    def __init__(self, symbols, queue: asyncio.Queue):
+    With `book_depth` set, the feed also subscribes to the `book` channel and
+    applies every book message to `book_manager` (an OrderBookManager).
+    With `record_path` set, every raw message is appended as one JSON line so
+    sessions can be replayed offline with live.order_book.BookReplayer.
+    """
+
+    def __init__(
+        self, symbols, queue: asyncio.Queue, book_depth=None, book_manager=None, record_path=None
+    ):
         self.url = "wss://ws.kraken.com/"
         self.symbols = symbols
         self.queue = queue
         self.session = None
         self.running = True
+        self.book_depth = book_depth
+        self.book_manager = book_manager
+        if self.book_depth and self.book_manager is None:
+            from live.order_book import OrderBookManager
+
+            self.book_manager = OrderBookManager(depth=self.book_depth)
+        self.record_path = record_path
+        self._record_file = None
 
     async def _subscribe(self, ws):
         subs = {
@@ -26,6 +43,41 @@ class KrakenDataFeed:
         await ws.send_json(subs)
         logging.info(f"Subscribed to Kraken: {self.symbols}")
 
+        if self.book_depth:
+            await ws.send_json(
+                {
+                    "event": "subscribe",
+                    "pair": self.symbols,
+                    "subscription": {"name": "book", "depth": self.book_depth},
+                }
+            )
+            logging.info(f"Subscribed to Kraken book-{self.book_depth}: {self.symbols}")
+
+    def _record(self, raw):
+        if self.record_path is None:
+            return
+        if self._record_file is None:
+            self._record_file = open(self.record_path, "a", encoding="utf-8")
+        self._record_file.write(raw.rstrip("\n") + "\n")
+
+    async def _handle_message(self, data):
+        """Route a decoded channel message to the book engine or the trade queue."""
+        if not isinstance(data, list) or len(data) < 4:
+            return
+        channel = data[-2]
+        if isinstance(channel, str) and channel.startswith("book"):
+            if self.book_manager is not None:
+                self.book_manager.handle(data)
+        elif channel == "trade":
+            await self.queue.put(
+                {
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "symbol": data[-1],
+                    "price": float(data[1][0][0]),
+                    "volume": float(data[1][0][1]),
+                }
+            )
+
     async def connect(self):
         async with aiohttp.ClientSession() as self.session:
             while self.running:
@@ -34,16 +86,8 @@ class KrakenDataFeed:
                         await self._subscribe(ws)
                         async for msg in ws:
                             if msg.type == aiohttp.WSMsgType.TEXT:
-                                data = json.loads(msg.data)
-                                if isinstance(data, list) and len(data) > 1:
-                                    await self.queue.put(
-                                        {
-                                            "timestamp": datetime.utcnow().isoformat(),
-                                            "symbol": data[-1],
-                                            "price": float(data[1][0][0]),
-                                            "volume": float(data[1][0][1]),
-                                        }
-                                    )
+                                self._record(msg.data)
+                                await self._handle_message(json.loads(msg.data))
                             elif msg.type == aiohttp.WSMsgType.ERROR:
                                 break
                 except Exception as e:
@@ -52,5 +96,8 @@ class KrakenDataFeed:
 
     async def stop(self):
         self.running = False
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
         if self.session:
             await self.session.close()
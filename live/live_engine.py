@@ -17,11 +17,16 @@ class LiveEngine:
         self.symbols = config.get("live", {}).get("symbols", ["BTC/USD"])
         self.log_interval = config.get("live", {}).get("log_interval", 5)
         self.snapshot_interval = config.get("live", {}).get("snapshot_interval", 60)
+        # Order size attached to every routed signal; optionally route only side changes
+        self.order_size = float(config.get("live", {}).get("order_size", 1.0))
+        self.trade_on_change = config.get("live", {}).get("trade_on_change", False)
+        self._last_side = {}  # {symbol: last routed side}
 
         # Core modules
         self.queue = asyncio.Queue()
         self.executor = PaperExecutor(config)
         self.strategy = strategy_cls(config=config)
+        self.symbol_strategies = {}  # {symbol: strategy} — streaming state is per symbol
         self.feed = KrakenDataFeed(self.symbols, self.queue)
         self.live_logger = LiveLogger()
 
@@ -50,17 +55,19 @@ class LiveEngine:
 
     async def _consume_data(self):
         """Main event loop: consume ticks, process strategy, execute trades."""
+        data = None
         while self.running:
             try:
                 data = await self.queue.get()
 
-                # Pass tick to strategy for signal generation
-                signal = self.strategy.run_live(data)
+                # Pass tick to strategy for incremental signal generation
+                signal = self._strategy_for(data.get("symbol")).on_tick(data)
+                order = self._order_for(signal)
                 trade = None
 
                 # Execute trade signal (if any)
-                if signal:
-                    trade = await self.executor.execute_trade(signal)
+                if order:
+                    trade = await self.executor.execute_trade(order)
                     self.logger.info(f"✅ Executed Trade: {trade}")
 
                 # Periodic metrics update
@@ -78,6 +85,37 @@ class LiveEngine:
             except Exception as e:
                 self.logger.error(f"Live loop error: {e}", exc_info=True)
                 await asyncio.sleep(2)  # small cooldown to prevent spam loops
+            finally:
+                if data is not None:
+                    self.queue.task_done()
+                    data = None
+
+    def _order_for(self, signal):
+        """
+        Turn a strategy signal into an executor order: only BUY/SELL are
+        routed (HOLD and empty signals are dropped) and the configured order
+        size is attached, as in EventBacktester._on_bar.
+        """
+        if not signal or signal.get("side") not in ("BUY", "SELL"):
+            return None
+        symbol = signal.get("symbol")
+        if self.trade_on_change and self._last_side.get(symbol) == signal["side"]:
+            return None
+        self._last_side[symbol] = signal["side"]
+
+        order = dict(signal)
+        order.setdefault("size", self.order_size)
+        return order
+
+    def _strategy_for(self, symbol):
+        """Return the streaming strategy instance that owns `symbol`'s state."""
+        if symbol not in self.symbol_strategies:
+            self.symbol_strategies[symbol] = (
+                self.strategy
+                if not self.symbol_strategies
+                else self.strategy_cls(config=self.config)
+            )
+        return self.symbol_strategies[symbol]
 
     async def stop(self):
         """Gracefully stop all live components."""
@@ -0,0 +1,203 @@
+# /live/order_book.py
+"""
+Local L2 order book engine fed by the Kraken `book` channel.
+
+- Sorted price levels per side (binary-search lookup, see BookSide)
+- Top-N snapshots in the {"bids": [...], "asks": [...]} format used by
+  MicrostructureFilter
+- Kraken CRC32 checksum verification after every update
+- BookReplayer replays recorded raw websocket messages for offline tests
+"""
+
+import json
+import logging
+import zlib
+from pathlib import Path
+
+from strategies.microstructure import BookSide
+
+
+def _checksum_token(value: str) -> str:
+    """Kraken checksum formatting: drop the decimal point and leading zeros."""
+    return value.replace(".", "").lstrip("0")
+
+
+class L2OrderBook:
+    """Price-level order book for a single pair."""
+
+    def __init__(self, pair, depth=10):
+        self.pair = pair
+        self.depth = depth
+        self.bids = BookSide(is_bid=True, depth=depth)
+        self.asks = BookSide(is_bid=False, depth=depth)
+        self.raw = {"bids": {}, "asks": {}}  # price -> (price_str, volume_str)
+        self.valid = False
+        self.last_update = None
+
+    def _side(self, side):
+        return self.bids if side == "bids" else self.asks
+
+    # ------------------------------------------------------------------
+    def apply_snapshot(self, bids, asks):
+        """Replace the book from [[price, volume, ts], ...] entries."""
+        for side, entries in (("bids", bids), ("asks", asks)):
+            self.raw[side] = {float(e[0]): (e[0], e[1]) for e in entries if float(e[1]) > 0}
+            self._side(side).reset([(p, float(v)) for p, (_, v) in self.raw[side].items()])
+        self.valid = True
+
+    def apply_update(self, side, entries):
+        """Apply level deltas for one side; volume 0 removes the level."""
+        book_side = self._side(side)
+        raw = self.raw[side]
+        for entry in entries:
+            price, volume = float(entry[0]), float(entry[1])
+            book_side.update(price, volume)
+            if volume <= 0:
+                raw.pop(price, None)
+            else:
+                raw[price] = (entry[0], entry[1])
+            if len(entry) > 2:
+                self.last_update = float(entry[2])
+
+        # Kraken only maintains `depth` levels; drop anything pushed out
+        if len(book_side.keys) > self.depth:
+            book_side.truncate(self.depth)
+            kept = {p for p, _ in book_side.top(self.depth)}
+            for price in list(raw):
+                if price not in kept:
+                    del raw[price]
+
+    # ------------------------------------------------------------------
+    def checksum(self):
+        """CRC32 over the top 10 asks (ascending) then top 10 bids (descending)."""
+        parts = []
+        for side in ("asks", "bids"):
+            for price, _ in self._side(side).top(10):
+                price_str, volume_str = self.raw[side][price]
+                parts.append(_checksum_token(price_str) + _checksum_token(volume_str))
+        return zlib.crc32("".join(parts).encode()) & 0xFFFFFFFF
+
+    def verify(self, expected):
+        """Compare against the exchange checksum; marks the book invalid on mismatch."""
+        ok = self.checksum() == int(expected)
+        if not ok:
+            self.valid = False
+        return ok
+
+    # ------------------------------------------------------------------
+    def snapshot(self, n=None):
+        """Top-N levels as {"bids": [(price, size)], "asks": [(price, size)]}."""
+        return {"bids": self.bids.top(n), "asks": self.asks.top(n)}
+
+    def best_bid(self):
+        return self.bids.best
+
+    def best_ask(self):
+        return self.asks.best
+
+    def mid(self):
+        if self.bids.best is None or self.asks.best is None:
+            return None
+        return (self.bids.best + self.asks.best) / 2
+
+    def walk(self, side, size):
+        """
+        Simulate a market order against visible depth.
+        side: "BUY" consumes asks, "SELL" consumes bids.
+        Returns (average fill price or None, filled size).
+        """
+        book_side = self.asks if side == "BUY" else self.bids
+        levels = book_side.top(len(book_side.keys))
+        remaining, cost = float(size), 0.0
+        for price, available in levels:
+            take = min(remaining, available)
+            cost += take * price
+            remaining -= take
+            if remaining <= 0:
+                break
+        filled = float(size) - remaining
+        return (cost / filled if filled > 0 else None), filled
+
+
+class OrderBookManager:
+    """
+    Routes raw Kraken book-channel messages to per-pair L2OrderBooks and,
+    optionally, mirrors them into a MicrostructureEngine.
+    """
+
+    def __init__(self, depth=10, microstructure=None):
+        self.depth = depth
+        self.microstructure = microstructure
+        self.books = {}
+        self.checksum_failures = 0
+        self.logger = logging.getLogger("OrderBookManager")
+
+    def book(self, pair):
+        if pair not in self.books:
+            self.books[pair] = L2OrderBook(pair, self.depth)
+        return self.books[pair]
+
+    @staticmethod
+    def is_book_message(msg):
+        return (
+            isinstance(msg, list)
+            and len(msg) >= 4
+            and isinstance(msg[-2], str)
+            and msg[-2].startswith("book")
+        )
+
+    def handle(self, msg):
+        """
+        Apply one message: [channelID, payload(, payload), "book-N", pair].
+        Returns the pair's book, or None if the message is not a book message.
+        """
+        if not self.is_book_message(msg):
+            return None
+
+        pair = msg[-1]
+        book = self.book(pair)
+        checksum = None
+
+        for payload in msg[1:-2]:
+            if "as" in payload or "bs" in payload:
+                book.apply_snapshot(payload.get("bs", []), payload.get("as", []))
+                if self.microstructure is not None:
+                    self.microstructure.on_book_snapshot(
+                        pair, book.bids.top(self.depth), book.asks.top(self.depth)
+                    )
+                continue
+            for key, side in (("a", "asks"), ("b", "bids")):
+                if key in payload:
+                    book.apply_update(side, payload[key])
+                    if self.microstructure is not None:
+                        for entry in payload[key]:
+                            self.microstructure.on_book_delta(pair, side, entry[0], entry[1])
+                        self.microstructure.truncate(pair, side, self.depth)
+            checksum = payload.get("c", checksum)
+
+        if checksum is not None and not book.verify(checksum):
+            self.checksum_failures += 1
+            self.logger.warning(f"Checksum mismatch for {pair} — book needs resubscription")
+        return book
+
+
+class BookReplayer:
+    """Replays recorded raw websocket messages (one JSON message per line)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def messages(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def replay(self, manager):
+        """Feed every recorded message to `manager`; returns the message count."""
+        count = 0
+        for msg in self.messages():
+            manager.handle(msg)
+            count += 1
+        return count
@@ -7,7 +7,10 @@ from datetime import datetime
 class PaperExecutor:
     """Simulated trade executor that applies latency, slippage, and fees."""
 
-    def __init__(self, config):
+    def __init__(self, config, clock=None, logger=None):
+        """
+        clock: object with utcnow() (default: wall clock); backtests pass a SimClock.
+        """
         live_cfg = config.get("live", {})
         self.latency_ms = live_cfg.get("latency_ms", 100)
         self.slippage_bps = live_cfg.get("slippage_bps", 5)
@@ -16,18 +19,28 @@ class PaperExecutor:
 
         self.positions = {}  # {symbol: {"size": float, "avg_price": float}}
         self.trade_log = []
-        self.logger = logging.getLogger("PaperExecutor")
-        self.logger.setLevel(logging.INFO)
+        self.clock = clock or datetime
+        if logger is None:
+            logger = logging.getLogger("PaperExecutor")
+            logger.setLevel(logging.INFO)
+        self.logger = logger
 
     async def execute_trade(self, signal: dict):
         """Executes a trade signal with simulated latency."""
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self.fill(signal)
+
+    def fill(self, signal: dict):
+        """
+        Fill a signal immediately (slippage, fees, position update).
+        Shared by paper trading and the event-driven backtester, which models
+        latency on its simulated clock instead of sleeping.
+        """
         symbol = signal["symbol"]
         side = signal["side"].upper()
         size = float(signal["size"])
         price = float(signal["price"])
 
-        await asyncio.sleep(self.latency_ms / 1000)
-
         slip_mult = 1 + (self.slippage_bps / 10_000) * (1 if side == "BUY" else -1)
         executed_price = price * slip_mult
         cost = executed_price * size
@@ -37,7 +50,7 @@ class PaperExecutor:
         self._update_position(symbol, side, size, executed_price, fee)
 
         trade = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.clock.utcnow().isoformat(),
             "symbol": symbol,
             "side": side,
             "size": size,
@@ -85,7 +98,7 @@ class PaperExecutor:
         for symbol, pos in self.positions.items():
             unrealized_pnl += pos["size"] * pos["avg_price"]  # Approximation
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.clock.utcnow().isoformat(),
             "balance": round(self.balance, 2),
             "positions": self.positions,
             "unrealized_pnl": round(unrealized_pnl, 2),
@@ -2,17 +2,14 @@ import bootstrap  # ensures .env loads first
 import asyncio
 import os
 
-from statistical_arbitrage import StatisticalArbitrageStrategy
-
 from config.settings_loader import load_settings
+from core.cross_sectional import CrossSectionalEngine, build_strategies
 from data.ingestion import DataIngestion
 from monitoring.live_monitor import LiveMonitor
 from monitoring.logging_utils import setup_logger
 from portfolio.allocator import PortfolioAllocator
 from portfolio.trade_logger import TradeLogger  # <-- NEW: Trade Logging
 from risk.risk_manager import RiskManager
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.trend import TrendFollowingStrategy
 from tools.log_analyzer import NEXORAAnalyzer  # <-- Auto post-run analysis
 
 class NEXORA:
@@ -62,15 +59,9 @@ class NEXORA:
         self.logger.info("📜 Trade logging initialized successfully.")
 
         # --- Strategies ---
-        self.strategies = {
-            "trend": TrendFollowingStrategy(
-                self.config["strategy"]["trend_following"], self.logger
-            ),
-            "mean": MeanReversionStrategy(self.config["strategy"]["mean_reversion"], self.logger),
-            "stat_arb": StatisticalArbitrageStrategy(
-                self.config["strategy"].get("stat_arb", {}), self.logger
-            ),
-        }
+        self.strategies = build_strategies(self.config, self.logger)
+        # --- Cross-sectional signal engine (whole universe per call) ---
+        self.signal_engine = CrossSectionalEngine(self.strategies, self.logger)
         self.logger.info("✅ Core systems initialized successfully.")
 
         # --- System Refresh Rate ---
@@ -86,14 +77,21 @@ class NEXORA:
                 loop_start = asyncio.get_event_loop().time()
 
                 # --- Fetch or Simulate Market Data ---
-                market_data = await self.data_feed.get_latest_data()
-
-                # --- Process Active Strategies ---
-                for name, strategy in self.strategies.items():
+                await self.data_feed.get_latest_data()  # refreshes per-symbol buffers
+
+                # --- Evaluate the whole universe in one call per strategy ---
+                prices = self.data_feed.get_price_matrix("close")
+                try:
+                    changed = self.signal_engine.step(prices)
+                except Exception as e:
+                    self.logger.error(f"❌ Error in cross-sectional engine: {e}")
+                    changed = []
+
+                # --- Process only signals that changed ---
+                for signal in changed:
+                    name = signal["strategy"]
                     try:
-                        signal = strategy.generate_signal(market_data)
-
-                        if isinstance(signal, dict) and "price" in signal:
+                        if signal["side"] != "HOLD":
                             self.logger.info(f"📈 {name.upper()} → {signal}")
 
                             # --- Simulate trade execution and record trade ---
@@ -46,10 +46,18 @@ class LiveMonitor:
         risk_state = getattr(self.risk_manager, "risk_state", "NORMAL")
         open_positions = getattr(self.portfolio, "open_positions", 0)
 
+        performance = ""
+        if hasattr(self.portfolio, "get_metrics"):
+            m = self.portfolio.get_metrics()
+            performance = (
+                f" | Sharpe={m['sharpe_ratio']:.2f} | Sortino={m['sortino_ratio']:.2f} | "
+                f"Vol={m['volatility']:.2%} | WinRate={m['win_rate']:.1%}"
+            )
+
         self.logger.info(
             f"📈 Status | Equity=${equity:,.2f} | Drawdown={drawdown:.2%} | "
             f"Risk={risk_state} | Positions={open_positions} | "
-            f"Loop={avg_loop:.2f}s | Latency={avg_latency*1000:.1f}ms"
+            f"Loop={avg_loop:.2f}s | Latency={avg_latency*1000:.1f}ms{performance}"
         )
 
         self.last_log_time = now
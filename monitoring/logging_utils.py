@@ -92,6 +92,66 @@ def log_trade(
         writer.writerow([timestamp, symbol, side, qty, price, pnl, equity])
 
 
+# ------------------------------------------------------------
+# TRADE SINKS (where trade records go)
+# ------------------------------------------------------------
+
+
+class CsvTradeSink:
+    """Live default: append every trade to the CSV trade log immediately."""
+
+    def __init__(self, csv_path="logs/trade_log.csv"):
+        self.csv_path = csv_path
+
+    def write(self, record):
+        log_trade(**record, csv_path=self.csv_path)
+
+    def flush(self):
+        pass
+
+
+class NullTradeSink:
+    """Discard trade records (fast historical runs)."""
+
+    def write(self, record):
+        pass
+
+    def flush(self):
+        pass
+
+
+class BufferedTradeSink:
+    """
+    Keep trade records in memory and write them in one go on flush().
+    With csv_path=None the records are only kept in memory.
+    """
+
+    def __init__(self, csv_path=None, flush_every=None):
+        self.csv_path = csv_path
+        self.flush_every = flush_every
+        self.records = []
+        self._written = 0
+
+    def write(self, record):
+        self.records.append(record)
+        if self.flush_every and len(self.records) - self._written >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        pending = self.records[self._written :]
+        if not self.csv_path or not pending:
+            return
+        os.makedirs(os.path.dirname(self.csv_path) or ".", exist_ok=True)
+        file_exists = os.path.isfile(self.csv_path)
+        fields = ["timestamp", "symbol", "side", "qty", "price", "pnl", "equity"]
+        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            if not file_exists:
+                writer.writeheader()
+            writer.writerows(pending)
+        self._written = len(self.records)
+
+
 # ------------------------------------------------------------
 # QUICK TEST (Optional standalone test)
 # ------------------------------------------------------------
@@ -34,6 +34,12 @@ class LiveMonitor:
                 drawdown = self.portfolio.get_drawdown()
                 table.add_row("Equity", f"${equity:,.2f}")
                 table.add_row("Max Drawdown", f"{drawdown:.2f}%")
+                if hasattr(self.portfolio, "get_metrics"):
+                    m = self.portfolio.get_metrics()
+                    table.add_row("Sharpe", f"{m['sharpe_ratio']:.2f}")
+                    table.add_row("Sortino", f"{m['sortino_ratio']:.2f}")
+                    table.add_row("Volatility", f"{m['volatility']:.2%}")
+                    table.add_row("Win Rate", f"{m['win_rate']:.1%}")
 
             # --- Risk state ---
             if self.risk_manager:
@@ -7,6 +7,8 @@ Now supports:
 - Grid Search (parallelized)
 - Genetic Algorithm (parallelized fitness evaluation)
 - Bayesian Optimization (Optuna-driven, with built-in concurrency)
+- Checkpoint / resume: with `checkpoint=<path>`, completed evaluations are
+  streamed to an append-only log and skipped when a crashed run restarts
 
 Designed for large-scale trading strategy optimization across CPUs/GPUs.
 """
@@ -21,6 +23,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Callable
 
+from backtest.checkpoint import CheckpointLog, job_key
 from monitoring.logging_utils import setup_logger
 
 # Core optimizers
@@ -49,13 +52,22 @@ class OptimizationRunner:
         param_config: Dict[str, Any],
         output_dir: Path | None = None,
         max_workers: int | None = None,
+        result_cache: Any = None,
+        checkpoint: Any = None,
     ) -> None:
         self.strategy_name = strategy_name
         self.mode = mode.lower()
         self.data_path = data_path
         self.param_config = param_config
+        self.result_cache = result_cache
+        if checkpoint is not None and not isinstance(checkpoint, CheckpointLog):
+            checkpoint = CheckpointLog(checkpoint)
+        self.checkpoint = checkpoint
         self.output_dir = output_dir or Path("logs/optimization_results")
         self.logger = setup_logger(f"OptimizationRunner[{strategy_name}]")
+        self._identity = None
+        if result_cache is not None:
+            self._cache_identity()  # resolved before jobs are pickled to workers
 
         self.max_workers = max_workers or max(os.cpu_count() - 1, 1)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -118,13 +130,22 @@ class OptimizationRunner:
         param_values = list(itertools.product(*self.param_config.values()))
         total_combinations = len(param_values)
 
-        self.logger.info(f"🔍 Running {total_combinations} parameter combinations in parallel...")
+        combos = [dict(zip(param_keys, combo)) for combo in param_values]
+        results, pending = [], []
+        for params in combos:
+            stored = self._checkpointed(params)
+            if stored is None:
+                pending.append(params)
+            else:
+                results.append(stored)
+        if results:
+            self.logger.info(f"♻️ Resuming: {len(results)}/{total_combinations} already completed")
+
+        self.logger.info(f"🔍 Running {len(pending)} parameter combinations in parallel...")
 
-        results = []
         with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
-                executor.submit(self._safe_run, run_fn, dict(zip(param_keys, combo))): combo
-                for combo in param_values
+                executor.submit(self._safe_run, run_fn, params): params for params in pending
             }
 
             for future in as_completed(futures):
@@ -133,6 +154,7 @@ class OptimizationRunner:
                     res = future.result()
                     if res:
                         results.append(res)
+                        self._record(params, res)
                         self.logger.info(f"✅ Completed {params}")
                 except Exception as e:
                     self.logger.error(f"❌ Failed {params}: {e}")
@@ -162,12 +184,19 @@ class OptimizationRunner:
             }
 
         def evaluate_population(population):
-            """Evaluate all individuals in parallel."""
+            """Evaluate all individuals in parallel (checkpointed ones are reused)."""
             results = []
+            pending = []
+            for individual in population:
+                stored = self._checkpointed(individual)
+                if stored is not None:
+                    results.append((individual, stored))
+                else:
+                    pending.append(individual)
             with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
                 futures = {
                     executor.submit(self._safe_run, run_fn, individual): individual
-                    for individual in population
+                    for individual in pending
                 }
                 for future in as_completed(futures):
                     individual = futures[future]
@@ -175,6 +204,7 @@ class OptimizationRunner:
                         res = future.result()
                         if res:
                             results.append((individual, res))
+                            self._record(individual, res)
                     except Exception as e:
                         self.logger.error(f"❌ Failed individual {individual}: {e}")
             return results
@@ -237,9 +267,13 @@ class OptimizationRunner:
             from backtest.backtest_runner import BacktestRunner
 
             try:
-                runner = BacktestRunner()
-                method = self._detect_runner_method(runner)
-                metrics = method(data_path=self.data_path, params=params, strategy_name=self.strategy_name)
+                metrics = self._checkpointed(params)
+                if metrics is None:
+                    runner = BacktestRunner()
+                    method = self._detect_runner_method(runner)
+                    metrics = self._cached_run(method, params)
+                    if metrics:
+                        self._record(params, metrics)
                 if isinstance(metrics, dict) and "fitness" in metrics:
                     return float(metrics["fitness"])
                 return 0.0
@@ -263,14 +297,64 @@ class OptimizationRunner:
     def _safe_run(self, run_fn: Callable, params: Dict[str, Any]) -> Dict[str, Any]:
         """Safely run a backtest function with error handling."""
         try:
-            result = run_fn(data_path=self.data_path, params=params, strategy_name=self.strategy_name)
+            result = self._cached_run(run_fn, params)
             if isinstance(result, dict):
+                result = dict(result)
                 result["params"] = params
             return result
         except Exception as e:
             self.logger.error(f"Execution error for {params}: {e}")
             return {}
 
+    def _cached_run(self, run_fn: Callable, params: Dict[str, Any]) -> Any:
+        """
+        Run one backtest, memoized by strategy class/version, params, data file
+        and cost settings when caching.
+        """
+
+        def compute():
+            return run_fn(data_path=self.data_path, params=params, strategy_name=self.strategy_name)
+
+        if self.result_cache is None:
+            return compute()
+        strategy, costs, data = self._cache_identity()
+        return self.result_cache.get_or_compute(strategy, params, data, compute, costs)
+
+    def _cache_identity(self):
+        """
+        (strategy class, engine cost settings, data file fingerprint) for
+        result-cache keys, resolved once: the data file is hashed here rather
+        than re-read for every parameter combination.
+        """
+        if self._identity is None:
+            from backtest.backtest_runner import resolve_strategy
+            from backtest.engine import VectorizedBacktester
+            from backtest.result_cache import fingerprint_data
+
+            strategy = resolve_strategy(self.strategy_name)
+            if strategy is None:
+                self.logger.warning(
+                    f"⚠️ Unknown strategy '{self.strategy_name}': cache keys carry no class version"
+                )
+                strategy = self.strategy_name
+            self._identity = (
+                strategy,
+                VectorizedBacktester.from_settings().cost_settings,
+                fingerprint_data(self.data_path),
+            )
+        return self._identity
+
+    def _checkpointed(self, params: Dict[str, Any]) -> Any:
+        """Result of `params` recorded by an earlier (interrupted) run, else None."""
+        if self.checkpoint is None:
+            return None
+        return self.checkpoint.get(job_key(self.strategy_name, str(self.data_path), params))
+
+    def _record(self, params: Dict[str, Any], result: Any) -> None:
+        """Append a completed job to the checkpoint log (durable on return)."""
+        if self.checkpoint is not None:
+            self.checkpoint.append(job_key(self.strategy_name, str(self.data_path), params), result)
+
     def _detect_runner_method(self, runner) -> Callable:
         for name in ["run_backtest", "run", "execute", "start", "run_all"]:
             if hasattr(runner, name):
@@ -284,6 +368,11 @@ class OptimizationRunner:
         with open(result_path, "w", encoding="utf-8") as f:
             json.dump(results, f, indent=2)
         self.logger.info(f"📊 Results saved → {result_path}")
+        if self.result_cache is not None:
+            stats = self.result_cache.stats()
+            self.logger.info(
+                f"🗃️ Result cache: {stats['entries']} entries, hit rate {stats['hit_rate']:.1%}"
+            )
 
     def _save_summary(self) -> Path:
         summary = {
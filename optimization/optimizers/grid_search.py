@@ -17,6 +17,7 @@ from typing import Any, Dict, List
 # Local imports
 from backtest.backtest_runner import BacktestRunner
 from monitoring.logging_utils import setup_logger
+from optimization.optimizers.utils import sweep_results
 
 
 class GridSearchOptimizer:
@@ -25,10 +26,23 @@ class GridSearchOptimizer:
     Dynamically adapts to various BacktestRunner method signatures.
     """
 
-    def __init__(self, strategy_name: str, param_grid: Dict[str, List[Any]], data_path: Path) -> None:
+    def __init__(
+        self,
+        strategy_name: str,
+        param_grid: Dict[str, List[Any]],
+        data_path: Path,
+        strategy: Any = None,
+        data: Any = None,
+        fitness_metric: str = "pnl",
+        result_cache: Any = None,
+    ) -> None:
         self.strategy_name = strategy_name
         self.param_grid = param_grid
         self.data_path = data_path
+        self.strategy = strategy
+        self.data = data
+        self.fitness_metric = fitness_metric
+        self.result_cache = result_cache
         self.logger = setup_logger(f"GridSearchOptimizer[{strategy_name}]")
 
     def generate_param_combinations(self) -> List[Dict[str, Any]]:
@@ -62,6 +76,20 @@ class GridSearchOptimizer:
 
         results: List[Dict[str, Any]] = []
 
+        # Fast path: evaluate the whole grid in one batched sweep
+        if self.strategy is not None and self.data is not None:
+            swept = sweep_results(
+                self.strategy,
+                self.param_grid,
+                self.data,
+                self.fitness_metric,
+                cache=self.result_cache,
+            )
+            if swept is not None:
+                self.logger.info(f"⚡ Evaluated {len(swept)} combinations in one vectorized sweep")
+                results = swept
+                all_params = []
+
         for i, params in enumerate(all_params, start=1):
             self.logger.info(f"Running backtest {i}/{total} with params: {params}")
             try:
@@ -98,6 +98,59 @@ def load_json(path: Path) -> Dict[str, Any]:
         return {}
 
 
+# -------------------------------------------------------------------------
+# Vectorized Sweeps
+# -------------------------------------------------------------------------
+def sweep_results(
+    strategy: Any,
+    param_grid: Dict[str, Iterable[Any]],
+    data: Any,
+    target_metric: str = "pnl",
+    cache: Any = None,
+) -> List[Dict[str, Any]] | None:
+    """
+    Evaluate a whole parameter grid through the strategy's batched `sweep()`
+    instead of one backtest per combination.
+
+    The strategy must expose `sweep(data, axis0_values, axis1_values)` and a
+    `sweep_axes` tuple naming the two grid parameters. Returns None when the
+    strategy or grid is not sweep-compatible, so callers can fall back to
+    per-combination backtests. With a BacktestResultCache as `cache`, the
+    whole sweep is memoized by strategy, grid, metric and data.
+
+    Returns:
+        [{"params": {...}, "fitness": float, <metric>: float, ...}, ...]
+    """
+    sweep = getattr(strategy, "sweep", None)
+    axes = getattr(strategy, "sweep_axes", None)
+    if sweep is None or axes is None or set(param_grid.keys()) != set(axes):
+        return None
+    if cache is not None:
+        key_params = {"sweep": dict(param_grid), "metric": target_metric}
+        return cache.get_or_compute(
+            strategy,
+            key_params,
+            data,
+            lambda: sweep_results(strategy, param_grid, data, target_metric),
+        )
+
+    row_key, col_key = axes
+    grids = sweep(data, list(param_grid[row_key]), list(param_grid[col_key]))
+    if target_metric not in grids:
+        raise ValueError(f"Sweep does not provide metric '{target_metric}'")
+
+    results: List[Dict[str, Any]] = []
+    target = grids[target_metric]
+    for row in target.index:
+        for col in target.columns:
+            entry: Dict[str, Any] = {"params": {row_key: row, col_key: col}}
+            for name, frame in grids.items():
+                entry[name] = float(frame.loc[row, col])
+            entry["fitness"] = entry[target_metric]
+            results.append(entry)
+    return results
+
+
 # -------------------------------------------------------------------------
 # Parameter Serialization Helpers
 # -------------------------------------------------------------------------
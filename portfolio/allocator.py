@@ -2,7 +2,8 @@ from datetime import datetime
 
 import pandas as pd
 
-from monitoring.logging_utils import log_trade
+from analytics.online_metrics import OnlineMetrics
+from monitoring.logging_utils import CsvTradeSink
 
 
 class PortfolioAllocator:
@@ -11,9 +12,15 @@ class PortfolioAllocator:
     Handles position sizing, capital allocation, and equity updates.
     """
 
-    def __init__(self, logger, config):
+    def __init__(self, logger, config, trade_sink=None, clock=None):
+        """
+        trade_sink: where trade records go (default: CSV trade log per trade).
+        clock: object with utcnow() (default: wall clock); backtests pass a SimClock.
+        """
         self.logger = logger
         self.config = config
+        self.trade_sink = trade_sink or CsvTradeSink()
+        self.clock = clock or datetime
 
         self.initial_capital = config.get("initial_capital", 1000.0)
         self.current_capital = self.initial_capital
@@ -22,9 +29,12 @@ class PortfolioAllocator:
         self.trade_history = []
         self.equity_curve = []
 
-        # Drawdown tracking
+        # Drawdown tracking + streaming performance metrics (O(1) per update)
         self.equity_high = self.initial_capital
         self.max_drawdown = 0.0
+        self.metrics = OnlineMetrics(
+            initial_equity=self.initial_capital, halflife=config.get("metrics_halflife")
+        )
 
         self.logger.info(
             f"💰 PortfolioAllocator initialized | Starting capital ${self.initial_capital:,.2f}"
@@ -71,9 +81,9 @@ class PortfolioAllocator:
 
     # -------------------------------------------------------------------------
     def _record_trade(self, trade, pnl=0.0):
-        """Record trade and persist to CSV."""
+        """Record trade and hand it to the trade sink."""
         trade_record = {
-            "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": self.clock.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
             "symbol": trade["symbol"],
             "side": trade["side"],
             "qty": trade.get("qty", 1.0),
@@ -83,15 +93,7 @@ class PortfolioAllocator:
         }
         self.trade_history.append(trade_record)
 
-        log_trade(
-            timestamp=trade_record["timestamp"],
-            symbol=trade_record["symbol"],
-            side=trade_record["side"],
-            qty=trade_record["qty"],
-            price=trade_record["price"],
-            pnl=trade_record["pnl"],
-            equity=trade_record["equity"],
-        )
+        self.trade_sink.write(trade_record)
 
         self.logger.info(
             f"💹 Trade logged: {trade_record['side']} {trade_record['qty']} {trade_record['symbol']} "
@@ -108,11 +110,10 @@ class PortfolioAllocator:
         self.current_capital = self.cash + open_pnl
         self.equity_curve.append(self.current_capital)
 
-        if self.current_capital > self.equity_high:
-            self.equity_high = self.current_capital
-
-        drawdown = 1 - (self.current_capital / self.equity_high)
-        self.max_drawdown = max(self.max_drawdown, drawdown)
+        self.metrics.update(self.current_capital)
+        self.equity_high = self.metrics.peak
+        drawdown = -self.metrics.drawdown
+        self.max_drawdown = -self.metrics.max_drawdown
 
         self.logger.info(
             f"📊 Equity={self.current_capital:.2f} | Drawdown={drawdown * 100:.2f}% | MaxDD={self.max_drawdown * 100:.2f}%"
@@ -127,6 +128,18 @@ class PortfolioAllocator:
     def get_drawdown(self):
         return round(self.max_drawdown * 100, 2)
 
+    def get_metrics(self):
+        """Sharpe, Sortino, volatility, drawdown and win rate as of the last update."""
+        return self.metrics.snapshot()
+
+    @property
+    def current_equity(self):
+        return self.current_capital
+
+    @property
+    def peak_equity(self):
+        return self.equity_high
+
     def get_positions(self):
         return self.positions
 
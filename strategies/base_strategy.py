@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 
@@ -82,6 +83,56 @@ class BaseStrategy:
         """
         raise NotImplementedError("run_backtest() must be implemented by subclass")
 
+    # -------------------------------------------------------------------------
+    def generate_positions(self, params: Dict[str, Any], data: Any) -> pd.DataFrame:
+        """
+        Abstract method for the vectorized backtest engine.
+        Returns a frame with one row per bar: "position" (target exposure held
+        over the next bar), "returns" (instrument return into the bar) and
+        optionally "price".
+        """
+        raise NotImplementedError("generate_positions() must be implemented by subclass")
+
+    # -------------------------------------------------------------------------
+    def generate_cross_section(self, prices: pd.DataFrame) -> np.ndarray:
+        """
+        Abstract method for cross-sectional strategies.
+        Receives a (time × symbol) price matrix and returns one signal per
+        column: +1 (long), -1 (short) or 0 (flat).
+        """
+        raise NotImplementedError("generate_cross_section() must be implemented by subclass")
+
+    # -------------------------------------------------------------------------
+    # Streaming interface
+    # -------------------------------------------------------------------------
+    def warmup(self, history: pd.DataFrame) -> None:
+        """
+        Seed the incremental state from historical bars (oldest first).
+        Signals produced while warming up are discarded.
+        """
+        for bar in history.to_dict("records"):
+            self.on_bar(bar)
+
+    # -------------------------------------------------------------------------
+    def on_bar(self, bar: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Abstract method to be implemented by streaming strategies.
+        Consumes one completed bar and updates O(1) rolling state.
+        Returns a signal dictionary (same shape as generate_signal) or None.
+        """
+        raise NotImplementedError("on_bar() must be implemented by subclass")
+
+    # -------------------------------------------------------------------------
+    def on_tick(self, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Consume a single trade tick, e.g. {"symbol": ..., "price": ..., "volume": ...}.
+        Default behaviour treats the tick price as a bar close.
+        """
+        bar = dict(tick)
+        if "close" not in bar:
+            bar["close"] = bar.get("price")
+        return self.on_bar(bar)
+
     # -------------------------------------------------------------------------
     def summary(self) -> Dict[str, Any]:
         """
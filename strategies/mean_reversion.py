@@ -1,10 +1,14 @@
 import numpy as np
 import pandas as pd
 
+from analytics.indicators import get_cache
+
 
 class MeanReversionStrategy:
     """Basic mean reversion based on z-score."""
 
+    sweep_axes = ("lookback", "threshold")
+
     def __init__(self, lookback=20, threshold=2.0):
         self.lookback = lookback
         self.threshold = threshold
@@ -24,14 +28,98 @@ class MeanReversionStrategy:
     def run_backtest(self, params, data):
         prices = data["prices"]
         returns = data["returns"].fillna(0)
-        rolling_mean = prices.rolling(params["lookback"]).mean()
-        rolling_std = prices.rolling(params["lookback"]).std()
-        zscore = (prices - rolling_mean) / rolling_std
+        zscore = pd.Series(
+            get_cache().compute(prices.to_numpy(dtype=np.float64), "zscore", params["lookback"]),
+            index=prices.index,
+        )
         signals = (zscore < -params["threshold"]).astype(int) - (
             zscore > params["threshold"]
         ).astype(int)
         pnl = (signals.shift(1) * returns).cumsum().iloc[-1]
         return {"pnl": pnl}
 
+    def generate_positions(self, params, data) -> pd.DataFrame:
+        """Z-score exposure (+1 / -1 / 0) per bar, for the VectorizedBacktester."""
+        prices = data["prices"]
+        z = get_cache().compute(prices.to_numpy(dtype=np.float64), "zscore", params["lookback"])
+        with np.errstate(invalid="ignore"):
+            position = (z < -params["threshold"]).astype(float) - (z > params["threshold"])
+        return pd.DataFrame(
+            {
+                "position": position,
+                "returns": data["returns"].fillna(0).to_numpy(),
+                "price": prices.to_numpy(),
+            },
+            index=prices.index,
+        )
+
+    def generate_cross_section(self, prices: pd.DataFrame) -> np.ndarray:
+        """
+        Z-score signal for every symbol of a (time × symbol) price matrix in
+        one vectorized call: +1 below -threshold, -1 above +threshold.
+        """
+        window = prices.tail(self.lookback).to_numpy(dtype=np.float64)
+        if window.shape[0] < self.lookback:
+            return np.zeros(prices.shape[1], dtype=np.int8)
+
+        mean = window.mean(axis=0)
+        std = window.std(axis=0, ddof=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (window[-1] - mean) / std
+            signal = (z < -self.threshold).astype(np.int8) - (z > self.threshold).astype(np.int8)
+        return signal
+
+    def sweep(self, data, lookbacks=None, thresholds=None):
+        """
+        Evaluate every (lookback, threshold) pair in one batched pass.
+
+        Rolling mean/std come from the shared indicator cache (O(n) per
+        distinct lookback via cumulative sums) and all thresholds are broadcast against the
+        resulting z-score at once. Results match run_backtest per pair.
+
+        Returns a dict of DataFrames (index=lookback, columns=threshold):
+            pnl, sharpe, trades
+        """
+        grid = self.parameter_grid()
+        lookbacks = [int(lb) for lb in (lookbacks or grid["lookback"])]
+        thresholds = [float(th) for th in (thresholds or grid["threshold"])]
+
+        prices = np.asarray(data["prices"], dtype=np.float64)
+        returns = np.nan_to_num(np.asarray(data["returns"], dtype=np.float64))
+        n = len(prices)
+        th = np.asarray(thresholds)[:, None]  # (n_th, 1)
+
+        r_next = returns[1:]
+        r_next_sq = r_next**2
+        pnl = np.zeros((len(lookbacks), len(thresholds)))
+        sum_sq = np.zeros_like(pnl)
+        trades = np.zeros_like(pnl, dtype=np.int64)
+
+        cache = get_cache()
+        means = cache.compute_many(prices, "sma", lookbacks)
+        stds = cache.compute_many(prices, "std", lookbacks)
+        for i, lb in enumerate(lookbacks):
+            mean, std = means[lb], stds[lb]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = (prices - mean) / std
+                signals = (z < -th).astype(np.int8) - (z > th).astype(np.int8)  # (n_th, n)
+            held = signals[:, :-1].astype(np.float64)
+            pnl[i] = held @ r_next
+            sum_sq[i] = np.abs(held) @ r_next_sq
+            trades[i] = np.count_nonzero(signals[:, 1:] != signals[:, :-1], axis=1)
+
+        periods = max(n - 1, 1)
+        mean_ret = pnl / periods
+        std_ret = np.sqrt(np.maximum(sum_sq / periods - mean_ret**2, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std_ret > 0, mean_ret / std_ret * np.sqrt(252), 0.0)
+
+        def frame(values):
+            df = pd.DataFrame(values, index=lookbacks, columns=thresholds)
+            df.index.name, df.columns.name = "lookback", "threshold"
+            return df
+
+        return {"pnl": frame(pnl), "sharpe": frame(sharpe), "trades": frame(trades)}
+
     def parameters(self):
         return {"lookback": self.lookback, "threshold": self.threshold}
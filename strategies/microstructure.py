@@ -1,13 +1,200 @@
+import time
+from bisect import bisect_left
+from collections import deque
+
 import numpy as np
 
 
+class RollingVWAP:
+    """Time-windowed VWAP kept as running price·size / size sums with expiry."""
+
+    def __init__(self, window_seconds=300.0):
+        self.window_seconds = window_seconds
+        self.trades = deque()  # (ts, price, size)
+        self.pv_sum = 0.0
+        self.size_sum = 0.0
+
+    def add(self, price, size, ts=None):
+        """Add a trade and expire trades older than the window. Amortized O(1)."""
+        ts = time.time() if ts is None else ts
+        self.trades.append((ts, price, size))
+        self.pv_sum += price * size
+        self.size_sum += size
+        self.expire(ts)
+
+    def expire(self, now=None):
+        now = time.time() if now is None else now
+        cutoff = now - self.window_seconds
+        while self.trades and self.trades[0][0] <= cutoff:
+            _, price, size = self.trades.popleft()
+            self.pv_sum -= price * size
+            self.size_sum -= size
+        if not self.trades:
+            self.pv_sum = self.size_sum = 0.0  # drop accumulated float drift
+
+    @property
+    def value(self):
+        if not self.trades or self.size_sum <= 0:
+            return None
+        return self.pv_sum / self.size_sum
+
+
+class BookSide:
+    """
+    One side of an order book with sorted price levels and a running sum of
+    the volume resting in the best `depth` levels, maintained from deltas.
+    Level lookup is a binary search; the top-N sum changes by at most two
+    levels per update, so depth-limited imbalance stays O(1) to read.
+    """
+
+    RESYNC_EVERY = 10_000  # recompute the running sum to bound float drift
+
+    def __init__(self, is_bid, depth=10):
+        self.is_bid = is_bid
+        self.depth = depth
+        self.levels = {}  # key -> size (key = -price for bids, so best is first)
+        self.keys = []  # sorted ascending
+        self.top_volume = 0.0
+        self._updates = 0
+
+    def _key(self, price):
+        return -price if self.is_bid else price
+
+    def reset(self, levels):
+        """Replace all levels from [(price, size), ...]."""
+        self.levels = {self._key(float(p)): float(s) for p, s in levels if float(s) > 0}
+        self.keys = sorted(self.levels)
+        self._resync()
+
+    def _resync(self):
+        self.top_volume = float(sum(self.levels[k] for k in self.keys[: self.depth]))
+        self._updates = 0
+
+    def update(self, price, size):
+        """Apply one level delta: size 0 removes the level."""
+        key = self._key(float(price))
+        size = float(size)
+        rank = bisect_left(self.keys, key)
+        exists = key in self.levels
+
+        if size <= 0:
+            if exists:
+                old = self.levels.pop(key)
+                self.keys.pop(rank)
+                if rank < self.depth:
+                    self.top_volume -= old
+                    if len(self.keys) >= self.depth:
+                        self.top_volume += self.levels[self.keys[self.depth - 1]]
+        elif exists:
+            if rank < self.depth:
+                self.top_volume += size - self.levels[key]
+            self.levels[key] = size
+        else:
+            self.keys.insert(rank, key)
+            self.levels[key] = size
+            if rank < self.depth:
+                self.top_volume += size
+                if len(self.keys) > self.depth:
+                    self.top_volume -= self.levels[self.keys[self.depth]]
+
+        self._updates += 1
+        if self._updates >= self.RESYNC_EVERY:
+            self._resync()
+
+    def truncate(self, n):
+        """Drop levels beyond the best `n` (exchange books are depth-capped)."""
+        while len(self.keys) > n:
+            self.levels.pop(self.keys.pop())
+        if n < self.depth:
+            self._resync()
+
+    def top(self, n=None):
+        """Best `n` levels as [(price, size), ...]."""
+        n = self.depth if n is None else n
+        sign = -1.0 if self.is_bid else 1.0
+        return [(sign * k, self.levels[k]) for k in self.keys[:n]]
+
+    @property
+    def best(self):
+        if not self.keys:
+            return None
+        return -self.keys[0] if self.is_bid else self.keys[0]
+
+
+class MicrostructureEngine:
+    """
+    Stateful per-pair microstructure: rolling VWAP and depth-limited order
+    book imbalance, both maintained incrementally from trades and book deltas.
+    """
+
+    def __init__(self, depth=10, vwap_window_seconds=300.0):
+        self.depth = depth
+        self.vwap_window_seconds = vwap_window_seconds
+        self.vwaps = {}
+        self.books = {}
+
+    def _vwap(self, pair):
+        if pair not in self.vwaps:
+            self.vwaps[pair] = RollingVWAP(self.vwap_window_seconds)
+        return self.vwaps[pair]
+
+    def _book(self, pair):
+        if pair not in self.books:
+            self.books[pair] = {
+                "bids": BookSide(is_bid=True, depth=self.depth),
+                "asks": BookSide(is_bid=False, depth=self.depth),
+            }
+        return self.books[pair]
+
+    # --- feed handlers ---
+    def on_trade(self, pair, price, size, ts=None):
+        self._vwap(pair).add(float(price), float(size), ts)
+
+    def on_book_snapshot(self, pair, bids, asks):
+        book = self._book(pair)
+        book["bids"].reset(bids)
+        book["asks"].reset(asks)
+
+    def on_book_delta(self, pair, side, price, size):
+        """side: "bids"/"asks" (or "b"/"a")."""
+        key = "bids" if side in ("bids", "bid", "b") else "asks"
+        self._book(pair)[key].update(price, size)
+
+    def truncate(self, pair, side, n):
+        """Cap one side of the pair's book at `n` levels."""
+        key = "bids" if side in ("bids", "bid", "b") else "asks"
+        self._book(pair)[key].truncate(n)
+
+    # --- O(1) reads ---
+    def has_pair(self, pair):
+        return pair in self.vwaps or pair in self.books
+
+    def vwap(self, pair, now=None):
+        vwap = self.vwaps.get(pair)
+        if vwap is None:
+            return None
+        vwap.expire(now)
+        return vwap.value
+
+    def obi(self, pair):
+        book = self.books.get(pair)
+        if book is None:
+            return 0
+        bid_vol = book["bids"].top_volume
+        ask_vol = book["asks"].top_volume
+        if bid_vol + ask_vol <= 0:
+            return 0
+        return (bid_vol - ask_vol) / (bid_vol + ask_vol)
+
+
 class MicrostructureFilter:
     """Execution filter: validates signals with order book imbalance + VWAP."""
 
-    def __init__(self, logger=None, config=None):
+    def __init__(self, logger=None, config=None, engine=None):
         self.logger = logger
         self.config = config
         self.obi_threshold = 0.3  # minimum imbalance to confirm
+        self.engine = engine  # optional MicrostructureEngine for O(1) confirmation
 
     def _calc_vwap(self, trades):
         """Calculate VWAP from recent trades."""
@@ -25,20 +212,30 @@ class MicrostructureFilter:
             return 0
         return (bid_vol - ask_vol) / (bid_vol + ask_vol)
 
-    def confirm(self, signal, market_data):
+    def confirm(self, signal, market_data=None):
         """
         Confirm or reject a signal using market microstructure.
         - Long needs buy imbalance (OBI > 0.3) and price < VWAP.
         - Short needs sell imbalance (OBI < -0.3) and price > VWAP.
+        Uses the incremental engine state when available (O(1) per call),
+        otherwise recomputes from market_data trades/order book.
         """
         pair = signal["pair"]
-        if pair not in market_data:
-            return False
+        market_data = market_data or {}
 
-        md = market_data[pair]
-        vwap = self._calc_vwap(md["trades"])
-        obi = self._calc_obi(md["order_book"])
-        price = signal.get("price", md["ohlcv"]["close"])
+        if self.engine is not None and self.engine.has_pair(pair):
+            vwap = self.engine.vwap(pair)
+            obi = self.engine.obi(pair)
+            price = signal.get("price")
+            if price is None and pair in market_data:
+                price = market_data[pair]["ohlcv"]["close"]
+        elif pair in market_data:
+            md = market_data[pair]
+            vwap = self._calc_vwap(md["trades"])
+            obi = self._calc_obi(md["order_book"])
+            price = signal.get("price", md["ohlcv"]["close"])
+        else:
+            return False
 
         confirmed = False
         if signal["direction"] == "LONG":
@@ -4,9 +4,27 @@ import pandas as pd
 from statsmodels.api import OLS, add_constant
 from statsmodels.tsa.stattools import coint
 
+from analytics.indicators import get_cache
+from backtest.performance_metrics import compute_performance_metrics
 from strategies.base_strategy import BaseStrategy
 
 
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window sums along axis 0 of a (time × pairs) array (NaN until full)."""
+    csum = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    out = np.full(values.shape, np.nan)
+    if window <= len(values):
+        out[window - 1 :] = csum[window:] - csum[:-window]
+    return out
+
+
+def _ffill_states(states: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN entries along axis 0 (first row must be set)."""
+    rows = np.where(np.isnan(states), 0, np.arange(len(states))[:, None])
+    rows = np.maximum.accumulate(rows, axis=0)
+    return states[rows, np.arange(states.shape[1])]
+
+
 class StatisticalArbitrageStrategy(BaseStrategy):
     """
     Adaptive Statistical-Arbitrage / Pairs-Trading Strategy
@@ -23,12 +41,14 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         exit_z: float = 0.5,
         coint_pval: float = 0.05,
         min_valid: int = 50,
+        pairs=None,
     ):
         self.lookback = lookback
         self.entry_z = entry_z
         self.exit_z = exit_z
         self.coint_pval = coint_pval
         self.min_valid = min_valid
+        self.pairs = pairs  # (X, Y) column names for generate_cross_section
 
     # ------------------------------------------------------------
     # Parameter Management
@@ -76,9 +96,7 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         spread = y - beta * x
 
         # --- Rolling mean/std of spread
-        spread_mean = pd.Series(spread).rolling(lookback).mean()
-        spread_std = pd.Series(spread).rolling(lookback).std()
-        zscore = (spread - spread_mean) / spread_std
+        zscore = get_cache().compute(np.asarray(spread, dtype=np.float64), "zscore", lookback)
 
         # --- Rolling cointegration check
         pvals = []
@@ -105,15 +123,16 @@ class StatisticalArbitrageStrategy(BaseStrategy):
                 positions[i] = positions[i - 1]
 
                 # --- Returns
-        rx = pd.Series(x).pct_change().fillna(0)
-        ry = pd.Series(y).pct_change().fillna(0)
+        cache = get_cache()
+        rx = pd.Series(cache.compute(x, "pct_change", 1)).fillna(0)
+        ry = pd.Series(cache.compute(y, "pct_change", 1)).fillna(0)
 
         # Compute portfolio return using hedge ratio
         diff_y = ry.diff().fillna(0).values
         diff_x = rx.diff().fillna(0).values
         hedge = beta[:-1]
 
-        port_ret = positions[:-1] * (diff_y - hedge * diff_x)  # type: ignore
+        port_ret = positions[:-1] * (diff_y[1:] - hedge * diff_x[1:])  # type: ignore
         port_ret = pd.Series(port_ret).fillna(0)
 
         total_return = np.prod(1 + port_ret) - 1
@@ -132,3 +151,262 @@ class StatisticalArbitrageStrategy(BaseStrategy):
             "avg_beta": round(np.nanmean(beta), 4),
             "coint_valid_pct": round(np.nanmean(coint_mask) * 100, 2),
         }
+
+    def parameters(self):
+        return {
+            "lookback": self.lookback,
+            "entry_z": self.entry_z,
+            "exit_z": self.exit_z,
+            "coint_pval": self.coint_pval,
+        }
+
+    def generate_positions(self, params, data) -> pd.DataFrame:
+        """
+        Pair position (+1 long spread, -1 short spread) and the hedged spread
+        return per bar, for the VectorizedBacktester. data = {"X": df, "Y": df}.
+        The cointegration filter is refreshed every params["coint_stride"]
+        bars (default lookback // 5, as in run_portfolio_backtest).
+        """
+        x = data["X"]["close"].to_numpy(dtype=np.float64)[:, None]
+        y = data["Y"]["close"].to_numpy(dtype=np.float64)[:, None]
+        arrays = self._pair_arrays(x, y, params, params.get("coint_stride"))
+        return pd.DataFrame(
+            {
+                "position": arrays["positions"][:, 0],
+                "returns": arrays["spread_ret"][:, 0],
+                "price": (y - arrays["beta"] * x)[:, 0],
+            },
+            index=data["Y"].index,
+        )
+
+    def generate_cross_section(self, prices: pd.DataFrame) -> np.ndarray:
+        """
+        Pair signal for every symbol of a (time × symbol) price matrix, with
+        all pairs evaluated as one (time × pairs) pass. Pairs are self.pairs
+        or, by default, consecutive columns (0, 1), (2, 3), ... A long spread
+        buys Y and sells X (β > 0); symbols in several pairs take the sign of
+        their net vote. Each pair's history starts at the first row where
+        both of its symbols have a price; a pair with too little of it is flat.
+        """
+        columns = list(prices.columns)
+        pairs = self.pairs or list(zip(columns[0::2], columns[1::2]))
+        signal = np.zeros(len(columns), dtype=np.int8)
+        if not pairs:
+            return signal
+
+        frame = prices.apply(pd.to_numeric, errors="coerce").ffill()  # type: ignore
+        x = frame[[p[0] for p in pairs]].to_numpy(dtype=np.float64)
+        y = frame[[p[1] for p in pairs]].to_numpy(dtype=np.float64)
+        if len(frame) < max(self.min_valid, int(self.lookback) + 2):
+            return signal
+
+        arrays = self._pair_arrays(x, y)
+        position = arrays["positions"][-1]
+        hedge_sign = np.sign(arrays["beta"][-1])
+        votes = np.zeros(len(columns))
+        slot = {name: i for i, name in enumerate(columns)}
+        np.add.at(votes, [slot[p[1]] for p in pairs], position)
+        np.add.at(votes, [slot[p[0]] for p in pairs], -position * hedge_sign)
+        return np.sign(votes).astype(np.int8)
+
+    # ------------------------------------------------------------
+    # Portfolio Backtest (many pairs, shared capital)
+    # ------------------------------------------------------------
+    def run_portfolio_backtest(
+        self,
+        prices: pd.DataFrame,
+        pairs,
+        params=None,
+        capital: float = 1.0,
+        max_pair_weight: float = 1.0,
+        coint_stride=None,
+    ):
+        """
+        Backtest many X/Y pairs at once on a shared capital base.
+
+        Betas, spreads, z-scores, positions and returns are computed for all
+        pairs as (time × pairs) arrays:
+          - β[i]: OLS slope of y on x over [i - lookback, i) from rolling sums
+          - z: spread z-score over the trailing lookback (as run_backtest)
+          - positions: entry/exit hysteresis via a vectorized forward-fill
+          - pair return: pos[t-1] · (ry[t] - β[t-1]·rx[t]) / (1 + |β[t-1]|),
+            i.e. per unit of gross capital in the pair
+        Capital is split equally across the pairs open on the previous bar
+        (capped at max_pair_weight each).
+
+        The Engle–Granger filter is refreshed every `coint_stride` bars
+        (default lookback // 5) on the trailing window; coint_pval=None
+        disables it.
+
+        Returns:
+            {"pairs": DataFrame of per-pair metrics,
+             "portfolio": aggregate metrics,
+             "equity": Series, "positions": DataFrame, "weights": DataFrame}
+        """
+        pairs = [tuple(p) for p in pairs]
+        labels = [f"{x}/{y}" for x, y in pairs]
+        frame = prices.ffill()
+        x = frame[[p[0] for p in pairs]].to_numpy(dtype=np.float64)
+        y = frame[[p[1] for p in pairs]].to_numpy(dtype=np.float64)
+        n, n_pairs = x.shape
+
+        arrays = self._pair_arrays(x, y, params, coint_stride)
+        beta, positions, coint_mask = arrays["beta"], arrays["positions"], arrays["coint_mask"]
+        pair_ret = np.zeros((n, n_pairs))
+        pair_ret[1:] = positions[:-1] * arrays["spread_ret"][1:]
+
+        # --- Equal allocation across open pairs
+        is_open = positions != 0
+        n_open = is_open.sum(axis=1, keepdims=True)
+        weights = np.where(is_open, np.minimum(1.0 / np.maximum(n_open, 1), max_pair_weight), 0.0)
+        contrib = np.zeros((n, n_pairs))
+        contrib[1:] = weights[:-1] * pair_ret[1:]
+        port_ret = contrib.sum(axis=1)
+
+        index = prices.index
+        equity = pd.Series(capital * np.cumprod(1 + port_ret), index=index)
+        trades = np.count_nonzero(np.diff(positions, axis=0), axis=0)
+
+        std = pair_ret.std(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, pair_ret.mean(axis=0) / std * np.sqrt(252), 0.0)
+        per_pair = pd.DataFrame(
+            {
+                "total_return": np.prod(1 + pair_ret, axis=0) - 1,
+                "sharpe": sharpe,
+                "trades": trades,
+                "avg_beta": np.nanmean(beta, axis=0),
+                "coint_valid_pct": coint_mask.mean(axis=0) * 100,
+                "exposure_pct": is_open.mean(axis=0) * 100,
+                "contribution": contrib.sum(axis=0),
+            },
+            index=pd.Index(labels, name="pair"),
+        ).round(4)
+
+        portfolio = compute_performance_metrics(equity)
+        portfolio["trades"] = int(trades.sum())
+        portfolio["avg_open_pairs"] = round(float(n_open.mean()), 2)
+        portfolio["n_pairs"] = n_pairs
+
+        return {
+            "pairs": per_pair,
+            "portfolio": portfolio,
+            "equity": equity,
+            "positions": pd.DataFrame(positions, index=index, columns=labels),
+            "weights": pd.DataFrame(weights, index=index, columns=labels),
+        }
+
+    def _pair_arrays(self, x, y, params=None, coint_stride=None):
+        """
+        Betas, z-scores, cointegration mask, positions and the hedged spread
+        return per unit of gross capital, (ry[t] - β[t-1]·rx[t]) / (1 + |β[t-1]|),
+        for (time × pairs) price arrays.
+
+        Each pair starts at its first row from which both legs have prices
+        (late listings); before it the pair is flat with NaN β / z-score and
+        an invalid cointegration mask, and a pair with less than
+        max(min_valid, lookback + 2) rows of history stays flat throughout.
+        """
+        params = params or {}
+        lookback = int(params.get("lookback", self.lookback))
+        entry_z = params.get("entry_z", self.entry_z)
+        exit_z = params.get("exit_z", self.exit_z)
+        coint_pval = params.get("coint_pval", self.coint_pval)
+        stride = int(coint_stride or max(lookback // 5, 1))
+
+        n, n_pairs = x.shape
+        need = max(self.min_valid, lookback + 2)
+        if n < need:
+            raise ValueError(f"Need at least {need} rows, got {n}")
+
+        complete = np.isfinite(x) & np.isfinite(y)
+        starts = np.where(complete.all(axis=0), 0, n - np.argmin(complete[::-1], axis=0))
+        if not starts.any():
+            return self._pair_block(x, y, lookback, entry_z, exit_z, coint_pval, stride)
+
+        arrays = {
+            "beta": np.full((n, n_pairs), np.nan),
+            "zscore": np.full((n, n_pairs), np.nan),
+            "coint_mask": np.zeros((n, n_pairs), dtype=bool),
+            "positions": np.zeros((n, n_pairs)),
+            "spread_ret": np.zeros((n, n_pairs)),
+        }
+        for start in np.unique(starts):
+            if n - start < need:
+                continue
+            cols = np.flatnonzero(starts == start)
+            block = self._pair_block(
+                x[start:, cols], y[start:, cols], lookback, entry_z, exit_z, coint_pval, stride
+            )
+            for key, values in block.items():
+                arrays[key][start:, cols] = values
+        return arrays
+
+    def _pair_block(self, x, y, lookback, entry_z, exit_z, coint_pval, stride):
+        """_pair_arrays() for pairs whose prices are all finite."""
+        n, n_pairs = x.shape
+
+        # --- Rolling β over [i - lookback, i) from de-meaned window sums
+        xc, yc = x - x[0], y - y[0]
+        sx, sy = _window_sums(xc, lookback), _window_sums(yc, lookback)
+        sxy, sxx = _window_sums(xc * yc, lookback), _window_sums(xc * xc, lookback)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta_incl = (sxy - sx * sy / lookback) / (sxx - sx**2 / lookback)
+        beta = np.full((n, n_pairs), np.nan)
+        beta[lookback:] = beta_incl[lookback - 1 : -1]
+        beta = pd.DataFrame(beta).ffill().bfill().to_numpy()
+
+        # --- Spread z-score over the trailing lookback (inclusive)
+        spread = y - beta * x
+        ref = spread[0]
+        s1 = _window_sums(spread - ref, lookback)
+        s2 = _window_sums((spread - ref) ** 2, lookback)
+        spread_mean = s1 / lookback + ref
+        spread_std = np.sqrt(np.maximum((s2 - s1**2 / lookback) / (lookback - 1), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore = (spread - spread_mean) / spread_std
+
+        coint_mask = self._portfolio_coint_mask(x, y, lookback, stride, coint_pval)
+
+        # --- Positions: long > short > exit priority, otherwise hold
+        with np.errstate(invalid="ignore"):
+            long_entry = (zscore < -entry_z) & coint_mask
+            short_entry = (zscore > entry_z) & coint_mask
+            exit_trade = (np.abs(zscore) < exit_z) | ~coint_mask
+        states = np.full((n, n_pairs), np.nan)
+        states[exit_trade] = 0.0
+        states[short_entry] = -1.0
+        states[long_entry] = 1.0
+        states[0] = 0.0
+        positions = _ffill_states(states)
+
+        # --- Hedged spread return per unit of gross exposure
+        rx = np.zeros_like(x)
+        ry = np.zeros_like(y)
+        rx[1:], ry[1:] = x[1:] / x[:-1] - 1, y[1:] / y[:-1] - 1
+        spread_ret = np.zeros((n, n_pairs))
+        spread_ret[1:] = (ry[1:] - beta[:-1] * rx[1:]) / (1 + np.abs(beta[:-1]))
+
+        return {
+            "beta": beta,
+            "zscore": zscore,
+            "coint_mask": coint_mask,
+            "positions": positions,
+            "spread_ret": np.nan_to_num(spread_ret),
+        }
+
+    def _portfolio_coint_mask(self, x, y, lookback, stride, coint_pval) -> np.ndarray:
+        """Engle–Granger validity per (bar, pair), refreshed every `stride` bars."""
+        n, n_pairs = x.shape
+        if coint_pval is None:
+            mask = np.ones((n, n_pairs), dtype=bool)
+            mask[:lookback] = False
+            return mask
+
+        pvals = np.full((n, n_pairs), np.nan)
+        for i in range(lookback, n, stride):
+            for j in range(n_pairs):
+                _, pval, _ = coint(x[i - lookback : i, j], y[i - lookback : i, j])
+                pvals[i : i + stride, j] = pval
+        with np.errstate(invalid="ignore"):
+            return pvals < coint_pval
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 from statsmodels.tsa.stattools import coint
 
+from ai.cointegration.johansen_batch import BatchJohansenService, JohansenJob
 from ai.cointegration.johansen_module import JohansenCointegration
 
 
@@ -19,7 +20,13 @@ class StatArbCluster:
     meta-learning.
     """
 
-    def __init__(self, p_threshold: float = 0.05, min_rank: int = 1, max_assets: int = 6):
+    def __init__(
+        self,
+        p_threshold: float = 0.05,
+        min_rank: int = 1,
+        max_assets: int = 6,
+        johansen_service: BatchJohansenService | None = None,
+    ):
         """
         Parameters
         ----------
@@ -29,10 +36,14 @@ class StatArbCluster:
             Minimum rank for Johansen clusters to be considered valid.
         max_assets : int
             Maximum assets allowed per cluster for stability.
+        johansen_service : BatchJohansenService, optional
+            Shared parallel/memoized Johansen backend. When set, Johansen
+            fits go through it instead of a fresh JohansenCointegration.
         """
         self.p_threshold = p_threshold
         self.min_rank = min_rank
         self.max_assets = max_assets
+        self.johansen_service = johansen_service
 
     # ------------------------------------------------------------------
     # Core detection
@@ -63,9 +74,12 @@ class StatArbCluster:
         elif n_assets >= 3:
             # --- Johansen ---
             try:
-                joh = JohansenCointegration()
-                joh.fit(prices)
-                summary = joh.summary()
+                if self.johansen_service is not None:
+                    summary = self._johansen_from_service(prices)
+                else:
+                    joh = JohansenCointegration()
+                    joh.fit(prices)
+                    summary = joh.summary()
                 summary["method"] = "Johansen"
                 return summary
             except Exception as e:
@@ -73,6 +87,14 @@ class StatArbCluster:
 
         return {"method": "N/A", "rank": 0, "pvalue": 1.0}
 
+    def _johansen_from_service(self, prices: pd.DataFrame) -> dict:
+        """Run a single full-sample Johansen fit through the batch service."""
+        job = JohansenJob(tuple(prices.columns), 0, len(prices))
+        summary = dict(self.johansen_service.evaluate(prices, [job])[0])
+        if "error" in summary:
+            raise RuntimeError(summary["error"])
+        return summary
+
     # ------------------------------------------------------------------
     # Cluster scoring
     # ------------------------------------------------------------------
@@ -97,6 +119,10 @@ class StatArbCluster:
         cointegration diagnostics, validity, and score.
         """
         result = self._find_cointegrated_groups(prices)
+        return self._finalize(result)
+
+    def _finalize(self, result: dict) -> dict:
+        """Attach score and validity flags to a raw detection result."""
         score = self._cluster_score(result)
         result["score"] = round(score, 3)
         result["valid"] = (result["method"] == "Engle-Granger" and result["rank"] == 1) or (
@@ -104,6 +130,35 @@ class StatArbCluster:
         )
         return result
 
+    def evaluate_rolling(self, prices: pd.DataFrame, window: int, stride: int = 1) -> list:
+        """
+        Evaluate every rolling window prices.iloc[i - window : i] for
+        i = window .. len(prices) - 1 and return one result per window.
+
+        Johansen clusters are evaluated as one batch through the service
+        (parallel + memoized); with stride > 1 only every stride-th window is
+        fitted and intermediate windows reuse the previous fit.
+        """
+        if prices.shape[1] < 3:
+            anchors, mapping = BatchJohansenService.plan_rolling(len(prices), window, stride)
+            by_anchor = {
+                end: self.evaluate_cluster(prices.iloc[end - window : end]) for end in anchors
+            }
+            return [dict(by_anchor[end]) for end in mapping]
+
+        service = self.johansen_service or BatchJohansenService()
+        summaries = service.evaluate_rolling(prices, window, stride)
+        results = []
+        for summary in summaries:
+            if "error" in summary:
+                res = {"method": "Johansen", "rank": 0, "pvalue": 1.0, "error": summary["error"]}
+            else:
+                res = dict(summary, method="Johansen")
+            results.append(self._finalize(res))
+        if self.johansen_service is None:
+            service.close()
+        return results
+
     def filter_valid_clusters(self, cluster_dict: dict) -> dict:
         """
         Filter multiple candidate clusters and return only those
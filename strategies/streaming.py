@@ -0,0 +1,72 @@
+# strategies/streaming.py
+# pyright: strict
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Optional
+
+
+class RollingWindow:
+    """
+    Fixed-size rolling window with O(1) push, mean and std.
+    Keeps running sums of (value - ref) so precision does not drift with
+    large price levels.
+    """
+
+    __slots__ = ("size", "_values", "_ref", "_sum", "_sum_sq")
+
+    def __init__(self, size: int) -> None:
+        if size <= 0:
+            raise ValueError("RollingWindow size must be positive")
+        self.size = int(size)
+        self._values: Deque[float] = deque(maxlen=self.size)
+        self._ref: Optional[float] = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    # ------------------------------------------------------------------
+    def push(self, value: float) -> None:
+        """Append a value, evicting the oldest once the window is full."""
+        if self._ref is None:
+            self._ref = value
+        centered = value - self._ref
+        if len(self._values) == self.size:
+            old = self._values[0] - self._ref
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._values.append(value)
+        self._sum += centered
+        self._sum_sq += centered * centered
+
+    def reset(self) -> None:
+        self._values.clear()
+        self._ref = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    # ------------------------------------------------------------------
+    @property
+    def ready(self) -> bool:
+        """True once the window holds `size` values."""
+        return len(self._values) == self.size
+
+    @property
+    def last(self) -> Optional[float]:
+        return self._values[-1] if self._values else None
+
+    @property
+    def mean(self) -> float:
+        n = len(self._values)
+        if n == 0 or self._ref is None:
+            return math.nan
+        return self._sum / n + self._ref
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), like pandas rolling().std()."""
+        n = len(self._values)
+        if n < 2:
+            return math.nan
+        var = (self._sum_sq - self._sum * self._sum / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
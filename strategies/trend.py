@@ -7,7 +7,9 @@ from typing import Any, Dict, Optional
 import numpy as np
 import pandas as pd
 
+from analytics.indicators import get_cache
 from strategies.base_strategy import BaseStrategy
+from strategies.streaming import RollingWindow
 
 
 class TrendFollowingStrategy(BaseStrategy):
@@ -40,9 +42,11 @@ class TrendFollowingStrategy(BaseStrategy):
         df["close"] = pd.to_numeric(df["close"], errors="coerce")  # type: ignore
         df["close"] = df["close"].fillna(method="ffill")  # type: ignore
 
-        # Moving averages
-        df["sma_short"] = df["close"].rolling(window=short_window).mean()  # type: ignore
-        df["sma_long"] = df["close"].rolling(window=long_window).mean()  # type: ignore
+        # Moving averages (shared cache: other strategies reuse the same SMAs)
+        close = df["close"].to_numpy(dtype=np.float64)  # type: ignore
+        smas = get_cache().compute_many(close, "sma", [short_window, long_window])
+        df["sma_short"] = smas[short_window]
+        df["sma_long"] = smas[long_window]
         df.dropna(inplace=True)
 
         if df.empty:
@@ -65,6 +69,72 @@ class TrendFollowingStrategy(BaseStrategy):
             "price": last_close,
         }
 
+    # ------------------------------------------------------------------
+    def generate_cross_section(self, prices: pd.DataFrame) -> np.ndarray:
+        """
+        Crossover signal for every symbol of a (time × symbol) close matrix
+        in one vectorized call. Symbols without a full window return 0.
+        """
+        short_window, long_window = self._windows()
+        window = prices.tail(long_window).apply(pd.to_numeric, errors="coerce")  # type: ignore
+        values = window.ffill().to_numpy(dtype=np.float64)
+        if values.shape[0] < long_window:
+            return np.zeros(prices.shape[1], dtype=np.int8)
+
+        sma_short = values[-short_window:].mean(axis=0)
+        sma_long = values.mean(axis=0)
+        signal = np.sign(np.nan_to_num(sma_short - sma_long))
+        return signal.astype(np.int8)
+
+    # ------------------------------------------------------------------
+    def _windows(self) -> tuple[int, int]:
+        short_val = self.get_param("short_window", 20)
+        long_val = self.get_param("long_window", 100)
+        short_window = int(short_val) if isinstance(short_val, (int, float, str)) else 20
+        long_window = int(long_val) if isinstance(long_val, (int, float, str)) else 100
+        return short_window, long_window
+
+    def reset_stream(self) -> None:
+        """Clear the incremental moving-average state."""
+        short_window, long_window = self._windows()
+        self._sma_short = RollingWindow(short_window)
+        self._sma_long = RollingWindow(long_window)
+        self._last_close: Optional[float] = None
+
+    def on_bar(self, bar: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Incremental crossover signal: O(1) per bar regardless of history length.
+        Mirrors generate_signal() (non-numeric closes are forward-filled).
+        """
+        if not hasattr(self, "_sma_short"):
+            self.reset_stream()
+
+        try:
+            close = float(bar.get("close"))  # type: ignore
+        except (TypeError, ValueError):
+            close = float("nan")
+        if np.isnan(close):
+            if self._last_close is None:
+                return None
+            close = self._last_close
+        self._last_close = close
+
+        self._sma_short.push(close)
+        self._sma_long.push(close)
+        if not (self._sma_short.ready and self._sma_long.ready):
+            return None
+
+        last_short = self._sma_short.mean
+        last_long = self._sma_long.mean
+        if last_short > last_long:
+            side = "BUY"
+        elif last_short < last_long:
+            side = "SELL"
+        else:
+            side = "HOLD"
+
+        return {"symbol": bar.get("symbol", "UNKNOWN"), "side": side, "price": close}
+
     # ------------------------------------------------------------------
     def run_backtest(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Simplified backtest computing cumulative return."""
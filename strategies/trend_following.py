@@ -2,12 +2,16 @@
 import numpy as np
 import pandas as pd
 
+from analytics.indicators import get_cache
+
 
 class TrendFollowingStrategy:
     """
     Simple trend-following strategy based on SMA crossover.
     """
 
+    sweep_axes = ("short_window", "long_window")
+
     def __init__(self, short_window=20, long_window=50):
         self.short_window = short_window
         self.long_window = long_window
@@ -26,13 +30,95 @@ class TrendFollowingStrategy:
 
     def run_backtest(self, params, data):
         prices = data["prices"]
-        short_sma = prices.rolling(params["short_window"]).mean()
-        long_sma = prices.rolling(params["long_window"]).mean()
+        smas = get_cache().compute_many(
+            prices.to_numpy(dtype=np.float64),
+            "sma",
+            [params["short_window"], params["long_window"]],
+        )
+        short_sma = pd.Series(smas[int(params["short_window"])], index=prices.index)
+        long_sma = pd.Series(smas[int(params["long_window"])], index=prices.index)
         signals = (short_sma > long_sma).astype(int)
         returns = data["returns"].fillna(0)
         pnl = (signals.shift(1) * returns).cumsum().iloc[-1]
         return {"pnl": pnl}
 
+    def generate_positions(self, params, data) -> pd.DataFrame:
+        """Long-only crossover exposure per bar, for the VectorizedBacktester."""
+        prices = data["prices"]
+        smas = get_cache().compute_many(
+            prices.to_numpy(dtype=np.float64),
+            "sma",
+            [params["short_window"], params["long_window"]],
+        )
+        with np.errstate(invalid="ignore"):
+            position = smas[int(params["short_window"])] > smas[int(params["long_window"])]
+        return pd.DataFrame(
+            {
+                "position": position.astype(float),
+                "returns": data["returns"].fillna(0).to_numpy(),
+                "price": prices.to_numpy(),
+            },
+            index=prices.index,
+        )
+
+    def sweep(self, data, short_windows=None, long_windows=None, max_bytes=256 * 1024 * 1024):
+        """
+        Evaluate every (short_window, long_window) pair in one pass.
+
+        All SMAs come from the shared indicator cache (one cumulative sum
+        for every missing window), then each block of
+        short windows is compared against every long window as a single
+        broadcast array operation. Results match run_backtest per pair.
+        Blocks are sized so their temporaries stay within `max_bytes`.
+
+        Returns a dict of DataFrames (index=short_window, columns=long_window):
+            pnl    - cumulative strategy return (same as run_backtest["pnl"])
+            sharpe - annualized mean/std of per-bar strategy returns
+            trades - number of signal changes
+        """
+        grid = self.parameter_grid()
+        shorts = [int(w) for w in (short_windows or grid["short_window"])]
+        longs = [int(w) for w in (long_windows or grid["long_window"])]
+
+        prices = np.asarray(data["prices"], dtype=np.float64)
+        returns = np.nan_to_num(np.asarray(data["returns"], dtype=np.float64))
+        n = len(prices)
+
+        smas = get_cache().compute_many(prices, "sma", shorts + longs)
+        long_mat = np.vstack([smas[w] for w in longs])  # (n_long, n)
+
+        r_next = returns[1:]
+        r_next_sq = r_next**2
+        pnl = np.zeros((len(shorts), len(longs)))
+        sum_sq = np.zeros_like(pnl)
+        trades = np.zeros_like(pnl, dtype=np.int64)
+
+        # Per (short, long, bar) cell: bool signal, bool change mask, float64 held copy
+        cell_bytes = 2 * np.dtype(bool).itemsize + np.dtype(np.float64).itemsize
+        block = max(1, int(max_bytes // max(len(longs) * n * cell_bytes, 1)))
+        for start in range(0, len(shorts), block):
+            rows = slice(start, start + block)
+            short_mat = np.vstack([smas[w] for w in shorts[rows]])  # (b, n)
+            with np.errstate(invalid="ignore"):
+                signals = short_mat[:, None, :] > long_mat[None, :, :]  # (b, n_long, n)
+            held = signals[..., :-1].astype(np.float64)
+            pnl[rows] = held @ r_next
+            sum_sq[rows] = held @ r_next_sq
+            trades[rows] = np.count_nonzero(signals[..., 1:] != signals[..., :-1], axis=-1)
+
+        periods = max(n - 1, 1)
+        mean = pnl / periods
+        std = np.sqrt(np.maximum(sum_sq / periods - mean**2, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(252), 0.0)
+
+        def frame(values):
+            df = pd.DataFrame(values, index=shorts, columns=longs)
+            df.index.name, df.columns.name = "short_window", "long_window"
+            return df
+
+        return {"pnl": frame(pnl), "sharpe": frame(sharpe), "trades": frame(trades)}
+
     def evaluate_signals(self, signals, data):
         returns = data["returns"].fillna(0)
         pnl = (signals.shift(1) * returns).cumsum().iloc[-1]
@@ -0,0 +1 @@
+# Hot-path benchmark suite; run with `python -m tests.benchmarks.run_benchmarks`.
@@ -0,0 +1,134 @@
+# tests/benchmarks/harness.py
+"""
+Timing, peak-memory measurement and baseline comparison for the benchmark suite.
+
+Each benchmark is timed over `repeat` untraced runs (best wall time wins),
+then run once more under tracemalloc for its peak allocation, so tracing
+overhead never leaks into the throughput figure.
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics.indicators import get_cache
+
+
+def measure(
+    fn: Callable[[], Any], items: int, unit: str = "bars", repeat: int = 3, memory: bool = True
+) -> Dict[str, Any]:
+    """
+    Time `fn` (which processes `items` units of work) and record its peak memory.
+    The shared indicator cache is cleared before every run so repeats are cold.
+    """
+    timings = []
+    for _ in range(max(int(repeat), 1)):
+        get_cache().clear()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        get_cache().clear()
+        tracemalloc.start()
+        try:
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        "items": int(items),
+        "unit": unit,
+        "seconds": round(seconds, 6),
+        "throughput": round(items / seconds, 2) if seconds > 0 else float("inf"),
+        "peak_mb": None if peak_mb is None else round(peak_mb, 3),
+        "repeat": len(timings),
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def save_results(report: Dict[str, Any], path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path) -> Optional[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.2,
+    memory_threshold: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compare two reports benchmark by benchmark.
+
+    A benchmark regresses when its throughput drops by more than `threshold`
+    (0.2 = 20% slower) or its peak memory grows by more than
+    `memory_threshold` (defaults to `threshold`). Benchmarks missing from
+    either report, or that errored, are not compared.
+
+    Returns one row per compared benchmark with the relative changes and a
+    "regression" flag.
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    rows = []
+    for name, now in current.get("results", {}).items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or "error" in now or "error" in before:
+            continue
+        speed = now["throughput"] / before["throughput"] - 1.0
+        memory = None
+        if now.get("peak_mb") is not None and before.get("peak_mb"):
+            memory = now["peak_mb"] / before["peak_mb"] - 1.0
+        slower = speed < -threshold
+        heavier = memory is not None and memory > memory_threshold
+        rows.append(
+            {
+                "benchmark": name,
+                "throughput_change": round(speed, 4),
+                "memory_change": None if memory is None else round(memory, 4),
+                "regression": slower or heavier,
+            }
+        )
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<48} {'throughput':>11} {'peak mem':>10}"]
+    for row in rows:
+        memory = "n/a" if row["memory_change"] is None else f"{row['memory_change']:+.1%}"
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['benchmark']:<48} {row['throughput_change']:>+11.1%} {memory:>10}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,337 @@
+# tests/benchmarks/run_benchmarks.py
+"""
+NEXORA Benchmark Suite
+----------------------
+Offline throughput / peak-memory benchmarks of the hot paths, on seeded
+synthetic data:
+
+    performance_metrics        compute_performance_metrics, per symbol
+    performance_metrics_batch  compute_performance_metrics_batch, all symbols at once
+    feature_store              FeatureStore.compute_features over the full history
+    ingestion                  DataIngestion.get_latest_data (simulated feed)
+    engine                     VectorizedBacktester.run_strategy (mean reversion)
+    fill_simulator             IntrabarFillSimulator.simulate (stop-loss / take-profit fills)
+    optimizer_sweep            sweep_results over a trend-following grid
+    optimizer_loop             the per-combination run_backtest loop over the same grid
+    statarb_backtest           StatisticalArbitrageStrategy.run_backtest (one pair)
+    statarb_portfolio          StatisticalArbitrageStrategy.run_portfolio_backtest
+
+Usage (from the repository root):
+
+    python -m tests.benchmarks.run_benchmarks                     # small profile
+    python -m tests.benchmarks.run_benchmarks --profile full --threshold 0.1
+    python -m tests.benchmarks.run_benchmarks --update-baseline   # store a new baseline
+
+Results are written as JSON (default .cache/benchmarks/latest.json) and
+compared with the stored baseline (default tests/benchmarks/baseline.json);
+the exit code is 1 when any benchmark regressed past the threshold.
+Baselines are machine-specific, so record one per machine before comparing.
+
+Paths that do per-tick or per-bar Python work are capped (see CAPS) so the
+large profile finishes in minutes; the effective size is stored with every
+result.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import VectorizedBacktester
+from backtest.fill_simulator import IntrabarFillSimulator
+from backtest.performance_metrics import (
+    compute_performance_metrics,
+    compute_performance_metrics_batch,
+)
+from data.feature_store import FeatureStore
+from data.ingestion import DataIngestion
+from optimization.optimizers.utils import sweep_results
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.statistical_arbitrage import StatisticalArbitrageStrategy
+from strategies.trend_following import TrendFollowingStrategy
+from tests.benchmarks import synthetic
+from tests.benchmarks.harness import (
+    compare_results,
+    environment,
+    format_comparison,
+    load_results,
+    measure,
+    save_results,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT = ROOT / ".cache" / "benchmarks" / "latest.json"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# (bars, symbols) cases per profile
+PROFILES: Dict[str, List[Tuple[int, int]]] = {
+    "small": [(10_000, 2)],
+    "large": [(1_000_000, 50)],
+    "full": [(10_000, 2), (10_000, 50), (1_000_000, 2), (1_000_000, 50)],
+}
+
+CAPS = {
+    "ingestion_ticks": 10_000,  # get_latest_data is one Python call per tick
+    "statarb_bars": 500,  # run_backtest runs one Engle–Granger test per bar
+    "portfolio_bars": 250_000,  # (bars × pairs) float64 working set
+}
+
+# Distinct synthetic series per case; larger symbol counts cycle through them
+DATA_POOL = 4
+
+TREND_GRID = {"short_window": [5, 10, 20, 40], "long_window": [50, 100, 200]}
+
+Setup = Tuple[Callable[[], Any], int, str, Dict[str, int]]
+
+
+def _pool(make, n_symbols: int, *args) -> List[Any]:
+    distinct = [make(*args, seed) for seed in range(min(n_symbols, DATA_POOL))]
+    return [distinct[i % len(distinct)] for i in range(n_symbols)]
+
+
+# -------------------------------------------------------------------------
+# Benchmarks: each returns (fn, items, unit, effective size) for (bars, symbols, seed)
+# -------------------------------------------------------------------------
+def bench_performance_metrics(bars: int, symbols: int, seed: int) -> Setup:
+    matrix = synthetic.make_equity_matrix(bars, min(symbols, DATA_POOL), seed)
+    curves = [pd.Series(matrix[:, i % matrix.shape[1]]) for i in range(symbols)]
+
+    def run():
+        for curve in curves:
+            compute_performance_metrics(curve)
+
+    return run, bars * symbols, "bars", {"bars": bars, "symbols": symbols}
+
+
+def bench_performance_metrics_batch(bars: int, symbols: int, seed: int) -> Setup:
+    matrix = synthetic.make_equity_matrix(bars, symbols, seed)
+    return (
+        lambda: compute_performance_metrics_batch(matrix),
+        bars * symbols,
+        "bars",
+        {"bars": bars, "symbols": symbols},
+    )
+
+
+def bench_feature_store(bars: int, symbols: int, seed: int) -> Setup:
+    frames = _pool(synthetic.make_ohlcv, symbols, bars)
+    store = FeatureStore()
+
+    def run():
+        for frame in frames:
+            store.compute_features(frame)
+
+    return run, bars * symbols, "bars", {"bars": bars, "symbols": symbols}
+
+
+def bench_ingestion(bars: int, symbols: int, seed: int) -> Setup:
+    ticks = min(bars, CAPS["ingestion_ticks"])
+    names = synthetic.symbol_names(symbols)
+    logger = logging.getLogger("NEXORA.benchmarks")
+
+    async def drain(feed):
+        for _ in range(ticks):
+            await feed.get_latest_data()
+
+    def run():
+        random.seed(seed)
+        asyncio.run(drain(DataIngestion(mode="SIMULATED", symbols=names, logger=logger)))
+
+    return run, ticks * symbols, "candles", {"bars": ticks, "symbols": symbols}
+
+
+def bench_engine(bars: int, symbols: int, seed: int) -> Setup:
+    datasets = _pool(synthetic.make_price_data, symbols, bars)
+    engine, strategy = VectorizedBacktester(), MeanReversionStrategy()
+
+    def run():
+        for data in datasets:
+            engine.run_strategy(strategy, data)
+
+    return run, bars * symbols, "bars", {"bars": bars, "symbols": symbols}
+
+
+def bench_fill_simulator(bars: int, symbols: int, seed: int) -> Setup:
+    frames = _pool(synthetic.make_ohlcv, symbols, bars)
+    rng = np.random.default_rng(seed)
+    target = np.repeat(rng.choice([-1.0, 0.0, 1.0], -(-bars // 20)), 20)[:bars]
+    sim = IntrabarFillSimulator(0.002, 0.004, "OHLC")
+
+    def run():
+        for frame in frames:
+            sim.simulate(frame, target)
+
+    return run, bars * symbols, "bars", {"bars": bars, "symbols": symbols}
+
+
+def _grid_size() -> int:
+    return int(np.prod([len(v) for v in TREND_GRID.values()]))
+
+
+def bench_optimizer_sweep(bars: int, symbols: int, seed: int) -> Setup:
+    data = synthetic.make_price_data(bars, seed)
+    return (
+        lambda: sweep_results(TrendFollowingStrategy(), TREND_GRID, data),
+        bars * _grid_size(),
+        "bar-evaluations",
+        {"bars": bars, "symbols": 1},
+    )
+
+
+def bench_optimizer_loop(bars: int, symbols: int, seed: int) -> Setup:
+    data = synthetic.make_price_data(bars, seed)
+    strategy = TrendFollowingStrategy()
+    combos = [
+        {"short_window": s, "long_window": lw}
+        for s in TREND_GRID["short_window"]
+        for lw in TREND_GRID["long_window"]
+    ]
+
+    def run():
+        for params in combos:
+            strategy.run_backtest(params, data)
+
+    return run, bars * len(combos), "bar-evaluations", {"bars": bars, "symbols": 1}
+
+
+def bench_statarb_backtest(bars: int, symbols: int, seed: int) -> Setup:
+    n = min(bars, CAPS["statarb_bars"])
+    data = synthetic.make_pair(n, seed)
+    strategy = StatisticalArbitrageStrategy()
+    return (
+        lambda: strategy.run_backtest({}, data),
+        n,
+        "bars",
+        {"bars": n, "symbols": 2},
+    )
+
+
+def bench_statarb_portfolio(bars: int, symbols: int, seed: int) -> Setup:
+    n, n_pairs = min(bars, CAPS["portfolio_bars"]), max(symbols // 2, 1)
+    prices, pairs = synthetic.make_pair_prices(n, n_pairs, seed)
+    strategy = StatisticalArbitrageStrategy()
+    # Vectorized path only; the per-window Engle–Granger cost is covered by statarb_backtest
+    params = {"coint_pval": None}
+    return (
+        lambda: strategy.run_portfolio_backtest(prices, pairs, params),
+        n * n_pairs,
+        "pair-bars",
+        {"bars": n, "symbols": 2 * n_pairs},
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[int, int, int], Setup]] = {
+    "performance_metrics": bench_performance_metrics,
+    "performance_metrics_batch": bench_performance_metrics_batch,
+    "feature_store": bench_feature_store,
+    "ingestion": bench_ingestion,
+    "engine": bench_engine,
+    "fill_simulator": bench_fill_simulator,
+    "optimizer_sweep": bench_optimizer_sweep,
+    "optimizer_loop": bench_optimizer_loop,
+    "statarb_backtest": bench_statarb_backtest,
+    "statarb_portfolio": bench_statarb_portfolio,
+}
+
+
+# -------------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------------
+def run_suite(
+    profile: str = "small",
+    names=None,
+    seed: int = 42,
+    repeat=None,
+    memory: bool = True,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks for every (bars, symbols) case of `profile`.
+    Failing benchmarks are recorded with their error instead of aborting the run.
+
+    Returns:
+        {"profile", "seed", "environment", "results": {"<name>[<bars>x<symbols>]": {...}}}
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (expected one of {list(PROFILES)})")
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+
+    results: Dict[str, Any] = {}
+    for bars, symbols in PROFILES[profile]:
+        runs = repeat or (5 if bars <= 100_000 else 1)
+        for name, setup in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            key = f"{name}[{bars}x{symbols}]"
+            try:
+                fn, items, unit, size = setup(bars, symbols, seed)
+                results[key] = {**size, **measure(fn, items, unit, runs, memory)}
+            except Exception as e:
+                results[key] = {"error": f"{type(e).__name__}: {e}"}
+            if verbose:
+                print(_format_result(key, results[key]), flush=True)
+
+    return {"profile": profile, "seed": seed, "environment": environment(), "results": results}
+
+
+def _format_result(key: str, result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"{key:<48} ERROR {result['error']}"
+    memory = "" if result["peak_mb"] is None else f"  peak {result['peak_mb']:>9.1f} MB"
+    return (
+        f"{key:<48} {result['seconds']:>9.4f}s  "
+        f"{result['throughput']:>14,.0f} {result['unit']}/s{memory}"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="NEXORA hot-path benchmarks")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=None, help="timed runs per benchmark")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed throughput drop (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--memory-threshold", type=float, default=None, help="allowed peak-memory growth"
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.profile, args.only, args.seed, args.repeat, not args.no_memory)
+    print(f"\n💾 Results saved to {save_results(report, args.output)}")
+
+    if args.update_baseline:
+        print(f"📌 Baseline updated: {save_results(report, args.baseline)}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    rows = compare_results(report, baseline, args.threshold, args.memory_threshold)
+    print(f"\n📊 Compared with baseline ({baseline['environment']['timestamp']}):")
+    print(format_comparison(rows))
+    regressions = [row["benchmark"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond threshold: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions beyond threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
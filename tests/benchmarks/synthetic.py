@@ -0,0 +1,72 @@
+# tests/benchmarks/synthetic.py
+"""
+Seeded synthetic market data for the benchmark suite.
+
+Everything is generated offline from a seed, so two runs of the same profile
+on the same machine time exactly the same inputs.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def symbol_names(n_symbols: int) -> List[str]:
+    return [f"SYM{i:03d}" for i in range(n_symbols)]
+
+
+def make_ohlcv(n_bars: int, seed: int = 0, start_price: float = 100.0) -> pd.DataFrame:
+    """Geometric random-walk OHLCV bars on a 1-minute clock."""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, 0.001, n_bars)))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.0005, (2, n_bars)))
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="min"),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + spread[0]),
+            "low": np.minimum(open_, close) * (1 - spread[1]),
+            "close": close,
+            "volume": rng.uniform(0.5, 5.0, n_bars),
+        }
+    )
+
+
+def make_price_data(n_bars: int, seed: int = 0) -> Dict[str, pd.Series]:
+    """{"prices", "returns"} input of the sweepable strategies."""
+    prices = make_ohlcv(n_bars, seed)["close"]
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def make_pair(n_bars: int, seed: int = 0, beta: float = 1.5) -> Dict[str, pd.DataFrame]:
+    """Cointegrated X/Y closes: y = beta·x + mean-reverting noise."""
+    rng = np.random.default_rng(seed)
+    x = 100.0 + np.cumsum(rng.normal(0.0, 0.5, n_bars))
+    noise = lfilter([1.0], [1.0, -0.9], rng.normal(0.0, 0.5, n_bars))
+    return {"X": pd.DataFrame({"close": x}), "Y": pd.DataFrame({"close": beta * x + noise})}
+
+
+def make_pair_prices(
+    n_bars: int, n_pairs: int, seed: int = 0
+) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+    """Wide close-price frame of `n_pairs` cointegrated pairs, plus the pair list."""
+    columns, pairs = {}, []
+    for j in range(n_pairs):
+        pair = make_pair(n_bars, seed + j, beta=1.0 + 0.1 * (j % 10))
+        x_name, y_name = f"X{j:03d}", f"Y{j:03d}"
+        columns[x_name] = pair["X"]["close"].to_numpy()
+        columns[y_name] = pair["Y"]["close"].to_numpy()
+        pairs.append((x_name, y_name))
+    return pd.DataFrame(columns), pairs
+
+
+def make_equity_matrix(n_bars: int, n_curves: int, seed: int = 0) -> np.ndarray:
+    """(bars × curves) equity curves starting at 1.0."""
+    rng = np.random.default_rng(seed)
+    equity = np.empty((n_bars, n_curves))
+    equity[0] = 1.0
+    np.cumprod(1.0 + rng.normal(0.0002, 0.01, (n_bars - 1, n_curves)), axis=0, out=equity[1:])
+    return equity
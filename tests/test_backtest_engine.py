@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import VectorizedBacktester
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.trend_following import TrendFollowingStrategy
+
+
+def _data(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))))
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def test_engine_applies_costs_on_position_changes():
+    engine = VectorizedBacktester(capital_base=1000, commission=0.001, slippage=0.001)
+    positions = np.array([0, 1, 1, -1, -1, 0], dtype=float)
+    returns = np.array([0, 0.01, 0.02, -0.01, 0.03, 0.0])
+    result = engine.run(positions, returns, prices=np.arange(6) + 100.0)
+
+    expected = np.array([0, -0.002, 0.02, -0.01 - 0.004, -0.03, -0.002])
+    np.testing.assert_allclose(result["returns"], expected)
+    assert result["equity"].iloc[-1] == pytest.approx(1000 * np.prod(1 + expected))
+
+    trades = result["trades"]
+    assert list(trades["side"]) == ["BUY", "SELL", "BUY"]
+    assert list(trades["price"]) == [101.0, 103.0, 105.0]
+    assert trades["cost"].sum() == pytest.approx(result["metrics"]["costs"], abs=0.01)
+    assert result["metrics"]["trades"] == 3
+
+
+@pytest.mark.parametrize(
+    "strategy, params",
+    [
+        (TrendFollowingStrategy(), {"short_window": 20, "long_window": 50}),
+        (MeanReversionStrategy(), {"lookback": 20, "threshold": 1.5}),
+    ],
+)
+def test_frictionless_engine_matches_run_backtest(strategy, params):
+    data = _data()
+    engine = VectorizedBacktester(commission=0.0, slippage=0.0)
+    result = engine.run_strategy(strategy, data, params)
+    assert result["returns"].sum() == pytest.approx(strategy.run_backtest(params, data)["pnl"])
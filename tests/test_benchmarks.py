@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from tests.benchmarks.harness import compare_results
+from tests.benchmarks.run_benchmarks import main, run_suite
+
+
+def _report(**results):
+    return {"results": results}
+
+
+def test_compare_flags_slowdowns_and_memory_growth_past_threshold():
+    baseline = _report(
+        a={"throughput": 100.0, "peak_mb": 10.0},
+        b={"throughput": 100.0, "peak_mb": 10.0},
+        c={"throughput": 100.0, "peak_mb": 10.0},
+        gone={"throughput": 1.0, "peak_mb": 1.0},
+    )
+    current = _report(
+        a={"throughput": 85.0, "peak_mb": 10.0},
+        b={"throughput": 70.0, "peak_mb": 10.0},
+        c={"throughput": 150.0, "peak_mb": 13.0},
+        new={"throughput": 1.0, "peak_mb": 1.0},
+        broken={"error": "ValueError: boom"},
+    )
+    rows = {r["benchmark"]: r for r in compare_results(current, baseline, threshold=0.2)}
+    assert set(rows) == {"a", "b", "c"}
+    assert not rows["a"]["regression"] and rows["a"]["throughput_change"] == pytest.approx(-0.15)
+    assert rows["b"]["regression"]
+    assert rows["c"]["regression"] and rows["c"]["memory_change"] == pytest.approx(0.3)
+
+    relaxed = compare_results(current, baseline, threshold=0.2, memory_threshold=0.5)
+    assert [r["benchmark"] for r in relaxed if r["regression"]] == ["b"]
+
+
+def test_suite_records_throughput_and_peak_memory():
+    report = run_suite("small", ["performance_metrics_batch"], repeat=1, verbose=False)
+    result = report["results"]["performance_metrics_batch[10000x2]"]
+    assert result["items"] == 20_000 and result["throughput"] > 0
+    assert result["peak_mb"] > 0
+    assert set(report["environment"]) >= {"python", "numpy", "pandas", "timestamp"}
+
+    with pytest.raises(ValueError):
+        run_suite("huge")
+
+
+def test_cli_writes_json_and_fails_on_regression(tmp_path, capsys):
+    out, base = tmp_path / "latest.json", tmp_path / "baseline.json"
+    args = ["--only", "performance_metrics_batch", "--repeat", "1", "--output", str(out)]
+    assert main(args + ["--baseline", str(base), "--update-baseline"]) == 0
+
+    stored = json.loads(base.read_text())
+    for result in stored["results"].values():
+        result["throughput"] *= 1000  # pretend the baseline was much faster
+    base.write_text(json.dumps(stored))
+
+    assert main(args + ["--baseline", str(base), "--threshold", "0.5"]) == 1
+    assert json.loads(out.read_text())["profile"] == "small"
+    assert "REGRESSION" in capsys.readouterr().out
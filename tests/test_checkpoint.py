@@ -0,0 +1,96 @@
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest_runner import BacktestRunner
+from backtest.checkpoint import CheckpointLog, job_key
+from backtest.engine import VectorizedBacktester
+from optimization.optimization_runner import OptimizationRunner
+
+
+def _fake_backtest(data_path, params, strategy_name):
+    return {"fitness": params["a"] * 10 + params["b"]}
+
+
+def test_log_survives_restart_and_torn_lines(tmp_path):
+    path = tmp_path / "run.jsonl"
+    log = CheckpointLog(path)
+    key = job_key("Trend", "AAPL", {"window": np.int64(20)})
+    assert key == job_key("Trend", "AAPL", {"window": 20})
+    log.append(key, {"sharpe_ratio": np.float64(1.5), "curve": np.arange(3)})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"key": "Trend|MSFT|{}", "res')  # crash mid-write
+
+    reopened = pickle.loads(pickle.dumps(CheckpointLog(path)))
+    assert len(reopened) == 1 and key in reopened
+    assert reopened.get(key) == {"sharpe_ratio": 1.5, "curve": [0, 1, 2]}
+    reopened.append(job_key("Trend", "MSFT"), {"sharpe_ratio": 0.2})
+    assert len(CheckpointLog(path)) == 2
+
+    reopened.clear()
+    assert len(CheckpointLog(path)) == 0
+
+
+def _write_csvs(data_dir, symbols, n=300):
+    rng = np.random.default_rng(0)
+    common = np.cumsum(rng.normal(0, 0.01, n))
+    for symbol in symbols:
+        close = 100 * np.exp(common + np.cumsum(rng.normal(0, 0.003, n)))
+        pd.DataFrame({"close": close}).to_csv(data_dir / f"{symbol}.csv", index=False)
+
+
+def test_runner_resumes_only_unfinished_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_csvs(tmp_path, ["AAA", "BBB"])
+    calls = []
+    run_strategy = BacktestRunner.run_strategy
+
+    def counting(self, strategy_cls, symbol):
+        calls.append((strategy_cls.__name__, symbol))
+        return run_strategy(self, strategy_cls, symbol)
+
+    monkeypatch.setattr(BacktestRunner, "run_strategy", counting)
+
+    def runner():
+        r = BacktestRunner(VectorizedBacktester(), max_workers=1, checkpoint=tmp_path / "c.jsonl")
+        r.symbols, r.data_dir = ["AAA", "BBB"], str(tmp_path)
+        return r
+
+    # "Crash" after two results: only completed jobs reach the log
+    stream = runner().iter_results()
+    first = [next(stream), next(stream)]
+    stream.close()
+    assert len(CheckpointLog(tmp_path / "c.jsonl")) == 2
+
+    calls.clear()
+    results = runner().run_all()
+    assert len(results) == 6 and len(calls) == 4
+    assert all(call not in calls for call in [(r["strategy"], r["symbol"]) for r in first])
+
+    # Failed jobs (stat arb on its own benchmark) are retried, nothing else
+    calls.clear()
+    again = {(r["strategy"], r["symbol"]): r for r in runner().run_all()}
+    assert calls == [("StatisticalArbitrageStrategy", "AAA")]
+    fresh = {(r["strategy"], r["symbol"]): r for r in results}
+    assert again == fresh
+
+
+def test_grid_search_skips_checkpointed_params(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(OptimizationRunner, "_detect_runner_method", lambda s, r: _fake_backtest)
+    grid = {"a": [1, 2], "b": [3, 4]}
+    log = CheckpointLog(tmp_path / "opt.jsonl")
+    for params in ({"a": 1, "b": 3}, {"a": 2, "b": 4}):
+        log.append(job_key("Trend", "data.csv", params), {"params": params, "fitness": 999})
+
+    runner = OptimizationRunner(
+        "Trend", "grid", "data.csv", grid, output_dir=tmp_path, max_workers=2, checkpoint=log
+    )
+    runner._run_parallel_grid_search()
+
+    (saved,) = tmp_path.glob("grid_parallel_results_*.json")
+    fitness = {tuple(r["params"].values()): r["fitness"] for r in json.loads(saved.read_text())}
+    assert fitness == {(1, 3): 999, (2, 4): 999, (1, 4): 14, (2, 3): 23}
+    assert len(CheckpointLog(tmp_path / "opt.jsonl")) == 4
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+from core.cross_sectional import CrossSectionalEngine, build_strategies
+from strategies.base_strategy import BaseStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.statistical_arbitrage import StatisticalArbitrageStrategy
+from strategies.trend import TrendFollowingStrategy
+
+
+def _universe(n_rows=120, n_symbols=100, seed=5):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, (n_rows, n_symbols))
+    return pd.DataFrame(
+        100 * np.exp(np.cumsum(steps, axis=0)),
+        columns=[f"SYM{i}/USD" for i in range(n_symbols)],
+    )
+
+
+def test_trend_cross_section_matches_per_symbol_crossover():
+    prices = _universe()
+    strategy = TrendFollowingStrategy({"short_window": 10, "long_window": 50})
+    signal = strategy.generate_cross_section(prices)
+
+    short = prices.rolling(10).mean().iloc[-1]
+    long_ = prices.rolling(50).mean().iloc[-1]
+    np.testing.assert_array_equal(signal, np.sign(short - long_).astype(int).to_numpy())
+
+
+def test_engine_emits_only_changed_signals():
+    prices = _universe()
+    engine = CrossSectionalEngine(
+        {
+            "trend": TrendFollowingStrategy({"short_window": 10, "long_window": 50}),
+            "mean": MeanReversionStrategy(lookback=20, threshold=1.0),
+        }
+    )
+
+    first = engine.step(prices)
+    assert first and all(s["side"] in {"BUY", "SELL"} for s in first)
+    assert engine.step(prices) == []
+
+    shocked = prices.copy()
+    shocked.iloc[-1, 0] *= 1.5
+    changed = engine.step(shocked)
+    assert {s["symbol"] for s in changed} == {"SYM0/USD"}
+
+
+def test_engine_skips_strategies_without_cross_section():
+    engine = CrossSectionalEngine({"plain": BaseStrategy()})
+    assert engine.step(_universe(n_symbols=3)) == []
+    assert "plain" in engine.disabled
+
+
+class _Failing(BaseStrategy):
+    def generate_cross_section(self, prices):
+        raise RuntimeError("boom")
+
+
+def test_failing_strategy_does_not_drop_the_others():
+    prices = _universe()
+    engine = CrossSectionalEngine(
+        {
+            "broken": _Failing(),
+            "trend": TrendFollowingStrategy({"short_window": 10, "long_window": 50}),
+        },
+        max_failures=2,
+    )
+    assert {s["strategy"] for s in engine.step(prices)} == {"trend"}
+    assert engine.failures == {"broken": 1} and "broken" not in engine.disabled
+    engine.step(prices)
+    assert "broken" in engine.disabled
+
+
+def test_stat_arb_cross_section_trades_pairs():
+    rng = np.random.default_rng(2)
+    n = 300
+    x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, 2)), axis=0))
+    y = 1.5 * x + rng.normal(0, 0.5, (n, 2))
+    y[-1, 0] += 8.0  # spread of the first pair far above its mean
+    prices = pd.DataFrame({"X0": x[:, 0], "Y0": y[:, 0], "X1": x[:, 1], "Y1": y[:, 1]})
+    strategy = StatisticalArbitrageStrategy(lookback=60, coint_pval=None)
+    signal = strategy.generate_cross_section(prices)
+    assert signal.shape == (4,)
+    assert list(signal[:2]) == [1, -1]  # short spread: sell Y0, buy X0
+
+    engine = CrossSectionalEngine({"stat_arb": strategy})
+    changed = engine.step(prices)
+    assert {s["symbol"] for s in changed} >= {"X0", "Y0"} and not engine.disabled
+
+    # Too little history: flat, not an error
+    assert not strategy.generate_cross_section(prices.tail(20)).any()
+
+
+def test_production_strategy_map_runs_every_sleeve():
+    config = {
+        "strategy": {
+            "trend_following": {"short_window": 5, "long_window": 20},
+            "mean_reversion": {"lookback": 15, "threshold": 1.5, "unknown": 1},
+            "stat_arb": {"lookback": 30, "coint_pval": None, "min_valid": 10},
+        }
+    }
+    strategies = build_strategies(config)
+    assert (strategies["mean"].lookback, strategies["mean"].threshold) == (15, 1.5)
+    assert strategies["stat_arb"].lookback == 30
+    assert strategies["trend"].get_param("long_window") == 20
+
+    prices = _universe(n_rows=80, n_symbols=6)
+    engine = CrossSectionalEngine(strategies)
+    for end in range(40, 80):
+        engine.step(prices.iloc[:end])
+    assert not engine.disabled and not any(engine.failures.values())
+    assert set(engine.last_signals) == {"trend", "mean", "stat_arb"}
+
+    # Settings without a `strategy` section fall back to the defaults
+    assert set(build_strategies({})) == {"trend", "mean", "stat_arb"}
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.downsampling import downsample_indices, lttb_indices, minmax_indices
+from backtest.report_generator import BacktestReportGenerator
+
+
+def _walk(n, seed=0):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+
+@pytest.mark.parametrize("pick", [minmax_indices, lttb_indices])
+@pytest.mark.parametrize("n, budget", [(10, 20), (1_000, 100), (100_001, 999), (50, 3)])
+def test_indices_are_sorted_within_budget_and_keep_endpoints(pick, n, budget):
+    idx = pick(_walk(n), budget)
+    assert len(idx) <= max(budget, 3) and len(idx) == len(np.unique(idx))
+    assert np.all(np.diff(idx) > 0)
+    assert idx[0] == 0 and idx[-1] == n - 1
+
+
+def test_minmax_keeps_every_extreme():
+    y = _walk(100_000, seed=1)
+    idx = minmax_indices(y, 500)
+    assert y[idx].min() == y.min() and y[idx].max() == y.max()
+
+
+def test_lttb_picks_isolated_spikes():
+    y = np.zeros(10_000)
+    y[1234], y[8765] = 50.0, -50.0
+    idx = lttb_indices(y, 100)
+    assert len(idx) == 100 and {1234, 8765} <= set(idx)
+
+
+def test_non_finite_values_are_skipped():
+    y = _walk(1_000)
+    y[:30] = np.nan
+    y[500] = np.inf
+    idx = downsample_indices(y, 100, "lttb")
+    assert np.isfinite(y[idx]).all() and idx[0] == 30
+    np.testing.assert_array_equal(downsample_indices(y, None), np.flatnonzero(np.isfinite(y)))
+    with pytest.raises(ValueError):
+        downsample_indices(y, 100, "nearest")
+
+
+def _curve(n, seed=0):
+    returns = np.random.default_rng(seed).normal(0.0001, 0.001, n)
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame({"returns": returns, "equity_curve": np.cumprod(1 + returns)}, index=index)
+
+
+def test_report_is_downsampled_and_written_in_one_document(tmp_path):
+    df = _curve(200_000)
+    small = BacktestReportGenerator(output_dir=str(tmp_path / "small"), max_points=1_000)
+    full = BacktestReportGenerator(output_dir=str(tmp_path / "full"), max_points=None)
+    path = small.generate_html_report(df, "Trend", "BTCUSD")
+    text = open(path, encoding="utf-8").read()
+
+    assert text.rstrip().endswith("</html>") and text.count("</html>") == 1
+    assert text.index("Summary Statistics") < text.index("</body>")
+    full_size = len(open(full.generate_html_report(df, "Trend", "BTCUSD")).read())
+    assert len(text) < full_size / 20
+
+
+def test_report_batches_render_in_parallel(tmp_path):
+    generator = BacktestReportGenerator(output_dir=str(tmp_path), max_points=500, downsample="lttb")
+    jobs = [(_curve(5_000, seed=i), "MeanReversion", asset) for i, asset in enumerate("ABC")]
+    paths = generator.generate_html_reports(jobs, max_workers=2)
+    assert [p.rsplit("/", 1)[-1] for p in paths] == [
+        f"MeanReversion_{a}_report.html" for a in "ABC"
+    ]
+    assert generator.generate_html_reports(jobs[:1]) == paths[:1]
+
+
+def test_directory_mode_writes_the_plotly_bundle(tmp_path):
+    generator = BacktestReportGenerator(output_dir=str(tmp_path), include_plotlyjs="directory")
+    path = generator.generate_html_report(_curve(2_000), "Trend", "BTCUSD")
+    assert 'src="plotly.min.js"' in open(path, encoding="utf-8").read()
+    assert (tmp_path / "plotly.min.js").stat().st_size > 1_000_000
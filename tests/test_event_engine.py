@@ -0,0 +1,95 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from backtest.event_engine import EventBacktester
+from live.live_engine import LiveEngine
+from live.paper_executor import PaperExecutor
+from monitoring.live_logger import LiveLogger
+from monitoring.logging_utils import BufferedTradeSink
+from strategies.trend import TrendFollowingStrategy
+
+COLUMNS = ["symbol", "side", "size", "executed_price", "fee", "balance"]
+
+
+def _bars(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "timestamp": ts,
+                    "symbol": symbol,
+                    "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n))),
+                }
+            )
+            for symbol in ("BTC/USD", "ETH/USD")
+        ]
+    )
+
+
+def test_event_backtest_matches_paper_trading_fills():
+    bars = _bars()
+    config = {"short_window": 5, "long_window": 20, "live": {"latency_ms": 250}}
+    sink = BufferedTradeSink()
+    result = EventBacktester(TrendFollowingStrategy, config, trade_sink=sink).run(bars)
+
+    # Same bars through the live path: on_bar → execute_trade (no real sleep)
+    paper = PaperExecutor({**config, "live": {"latency_ms": 0}})
+    strategies = {}
+
+    async def replay():
+        for bar in bars.sort_values("timestamp", kind="stable").to_dict("records"):
+            strategy = strategies.setdefault(bar["symbol"], TrendFollowingStrategy(config=config))
+            signal = strategy.on_bar(bar)
+            if signal and signal["side"] in ("BUY", "SELL"):
+                await paper.execute_trade({**signal, "size": 1.0})
+
+    asyncio.run(replay())
+
+    expected = pd.DataFrame(paper.trade_log)[COLUMNS]
+    assert len(result["trades"]) > 0
+    pd.testing.assert_frame_equal(result["trades"][COLUMNS], expected)
+    assert len(sink.records) == len(expected)
+
+
+def test_latency_is_modeled_on_the_sim_clock():
+    bars = _bars(200)
+    config = {"short_window": 5, "long_window": 20, "live": {"latency_ms": 1500}}
+    result = EventBacktester(TrendFollowingStrategy, config, trade_on_change=True).run(bars)
+
+    fill_times = pd.to_datetime(result["trades"]["timestamp"])
+    offsets = (fill_times - fill_times.dt.floor("min")).dt.total_seconds()
+    np.testing.assert_allclose(offsets, 1.5)
+
+
+def test_live_engine_routes_ticks_to_the_executor(tmp_path):
+    bars = _bars(300)
+    config = {"short_window": 5, "long_window": 20, "live": {"latency_ms": 0}}
+    expected = EventBacktester(TrendFollowingStrategy, config).run(bars)["trades"]
+
+    async def session():
+        engine = LiveEngine(config, TrendFollowingStrategy)
+        engine.live_logger = LiveLogger(report_path=str(tmp_path / "live_metrics.csv"))
+        for bar in bars.sort_values("timestamp", kind="stable").to_dict("records"):
+            engine.queue.put_nowait({"symbol": bar["symbol"], "price": bar["close"]})
+        consumer = asyncio.create_task(engine._consume_data())
+        await engine.queue.join()
+        consumer.cancel()
+        return engine
+
+    engine = asyncio.run(session())
+    trades = pd.DataFrame(engine.executor.trade_log)
+    assert len(trades) > 0 and set(trades["side"]) == {"BUY", "SELL"}
+    pd.testing.assert_frame_equal(trades[COLUMNS], expected[COLUMNS])
+
+    # trade_on_change only routes side flips
+    engine = LiveEngine({**config, "live": {"trade_on_change": True}}, TrendFollowingStrategy)
+    signals = [
+        {"symbol": "X", "side": side, "price": 1.0} for side in ("BUY", "BUY", "HOLD", "SELL")
+    ]
+    orders = [engine._order_for(signal) for signal in signals]
+    assert [order and order["side"] for order in orders] == ["BUY", None, None, "SELL"]
+    assert orders[0]["size"] == 1.0
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from data.feature_expr import (
+    FeaturePlan,
+    col,
+    pct_change,
+    rolling_corr,
+    rolling_mean,
+    rolling_std,
+    zscore,
+)
+
+
+def _frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+            "volume": rng.uniform(1, 5, n),
+        }
+    )
+
+
+def test_shared_subexpressions_are_one_node():
+    close = col("close")
+    assert rolling_mean(close, 20) is rolling_mean(col("close"), 20)
+    assert rolling_corr(close, col("volume"), 30) is rolling_corr(col("volume"), close, 30)
+
+    plan = FeaturePlan(
+        {
+            "a": rolling_std(pct_change(close), 10),
+            "b": zscore(pct_change(close), 10),
+            "c": col("volume") / rolling_mean(col("volume"), 20),
+        }
+    )
+    # close, pct_change, std, zscore, volume, sma, ratio
+    assert plan.n_nodes == 7
+
+
+def test_plan_matches_pandas():
+    df = _frame()
+    close, volume = col("close"), col("volume")
+    plan = FeaturePlan(
+        {
+            "sma": rolling_mean(close, 20),
+            "std": rolling_std(pct_change(close), 10),
+            "z": zscore(close, 30),
+            "corr": rolling_corr(close, volume, 50),
+            "ratio": volume / rolling_mean(volume, 20),
+        }
+    )
+    out = plan.evaluate(df)
+
+    c, v = df["close"], df["volume"]
+    np.testing.assert_allclose(out["sma"], c.rolling(20).mean(), rtol=1e-10)
+    np.testing.assert_allclose(out["std"], c.pct_change().rolling(10).std(), rtol=1e-6)
+    np.testing.assert_allclose(
+        out["z"], (c - c.rolling(30).mean()) / c.rolling(30).std(), rtol=1e-6, atol=1e-9
+    )
+    np.testing.assert_allclose(out["corr"], c.rolling(50).corr(v), rtol=1e-6, atol=1e-9)
+    np.testing.assert_allclose(out["ratio"], v / v.rolling(20).mean(), rtol=1e-10)
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import VectorizedBacktester
+from backtest.fill_simulator import IntrabarFillSimulator
+from tests.benchmarks.synthetic import make_ohlcv
+
+
+def _bars(rows):
+    return pd.DataFrame(rows, columns=["open", "high", "low", "close"], dtype=float)
+
+
+def _random_bars(n, seed):
+    rng = np.random.default_rng(seed)
+    bars = make_ohlcv(n, seed)[["open", "high", "low", "close"]]
+    bars["open"] *= 1 + rng.normal(0, 0.002, n)  # gaps
+    bars["high"] = np.maximum(bars.max(axis=1), bars["high"])
+    bars["low"] = np.minimum(bars.min(axis=1), bars["low"])
+    return bars
+
+
+def _reference(bars, target, stop, take, path, entry, offset):
+    """Per-bar loop over the same rules: (position, effective returns)."""
+    o, h, lo, c = (bars[k].to_numpy() for k in ("open", "high", "low", "close"))
+    n = len(c)
+    pos, ret = np.zeros(n), np.zeros(n)
+    ret[1:] = c[1:] / c[:-1] - 1
+    state = None
+    for t in range(1, n + 1):
+        prev = target[t - 1]
+        if prev == 0:
+            state = None
+        elif t == 1 or target[t - 2] != prev:
+            side = np.sign(prev)
+            state = {"side": side, "size": prev, "open": entry == "market", "done": False}
+            state["price" if entry == "market" else "level"] = (
+                c[t - 1] if entry == "market" else c[t - 1] * (1 - side * offset)
+            )
+        if t == n:
+            if state and state["open"] and not state["done"]:
+                pos[t - 1] = state["size"]
+            break
+        if state is None or state["done"]:
+            continue
+        s = state["side"]
+        if not state["open"]:
+            level = state["level"]
+            if (s > 0 and lo[t] <= level) or (s < 0 and h[t] >= level):
+                state["price"] = min(o[t], level) if s > 0 else max(o[t], level)
+                state["open"] = True
+                pos[t - 1], ret[t] = state["size"], c[t] / state["price"] - 1
+            continue
+        pos[t - 1] = state["size"]
+        sl = state["price"] * (1 - s * stop) if stop else np.nan
+        tp = state["price"] * (1 + s * take) if take else np.nan
+        hit_sl = lo[t] <= sl if s > 0 else h[t] >= sl
+        hit_tp = h[t] >= tp if s > 0 else lo[t] <= tp
+        if not (hit_sl or hit_tp):
+            continue
+        gap = (o[t] <= sl or o[t] >= tp) if s > 0 else (o[t] >= sl or o[t] <= tp)
+        stop_first = {"worst": True, "best": False, "OHLC": s < 0, "OLHC": s > 0}[path]
+        if gap:
+            price = o[t]
+        elif hit_sl and hit_tp:
+            price = sl if stop_first else tp
+        else:
+            price = sl if hit_sl else tp
+        ret[t], state["done"] = price / c[t - 1] - 1, True
+    return pos, ret
+
+
+@pytest.mark.parametrize("path", ["OHLC", "OLHC", "worst", "best"])
+@pytest.mark.parametrize("entry", ["market", "limit"])
+def test_matches_per_bar_reference(path, entry):
+    rng = np.random.default_rng(7)
+    for seed in range(5):
+        bars = _random_bars(400, seed)
+        target = np.repeat(rng.choice([-1.0, 0.0, 0.5, 1.0], 40), 10)
+        stop, take = rng.choice([None, 0.001, 0.003]), rng.choice([None, 0.001, 0.004])
+        sim = IntrabarFillSimulator(stop, take, path, entry, limit_offset=0.0005)
+        frame, _ = sim.simulate(bars, target)
+
+        pos, ret = _reference(bars, target, stop, take, path, entry, 0.0005)
+        np.testing.assert_allclose(frame["position"], pos)
+        held = pos[:-1] != 0
+        np.testing.assert_allclose(frame["returns"].to_numpy()[1:][held], ret[1:][held])
+
+
+def test_without_levels_matches_close_fills():
+    bars = _random_bars(500, 1)
+    target = np.repeat(np.random.default_rng(0).choice([-1.0, 0.0, 1.0], 50), 10)
+    engine = VectorizedBacktester(commission=0.001, slippage=0.0005)
+    result = IntrabarFillSimulator().run(bars, target, engine)
+    returns = bars["close"].pct_change().fillna(0.0)
+    expected = engine.run(pd.Series(target, index=bars.index), returns, bars["close"])
+    np.testing.assert_allclose(result["equity"], expected["equity"])
+    assert result["metrics"]["stop_losses"] == result["metrics"]["take_profits"] == 0
+
+
+def test_gaps_fill_at_the_open_and_path_resolves_both_levels():
+    bars = _bars(
+        [
+            [100, 100, 100, 100],
+            [100, 104, 95, 100],  # touches both the 97 stop and the 103 take-profit
+            [100, 100, 100, 100],
+        ]
+    )
+    target = [1.0, 1.0, 1.0]
+    kinds = {
+        path: IntrabarFillSimulator(0.03, 0.03, path).simulate(bars, target)[1]["type"].iloc[-1]
+        for path in ("OHLC", "OLHC", "worst", "best")
+    }
+    assert kinds == {
+        "OHLC": "take_profit",
+        "OLHC": "stop_loss",
+        "worst": "stop_loss",
+        "best": "take_profit",
+    }
+
+    gapped = _bars([[100, 100, 100, 100], [90, 92, 89, 91], [91, 91, 91, 91]])
+    frame, fills = IntrabarFillSimulator(0.03).simulate(gapped, [1.0, 1.0, 1.0])
+    assert fills["type"].tolist() == ["market", "stop_loss"]
+    assert fills["price"].iloc[-1] == 90.0  # opened through the 97 stop
+    np.testing.assert_allclose(frame["position"], [1.0, 0.0, 0.0])
+    assert frame["returns"].iloc[1] == pytest.approx(-0.10)
+    assert frame["price"].iloc[1] == 90.0
+
+
+def test_short_stop_and_limit_entry():
+    bars = _bars(
+        [
+            [100, 100, 100, 100],
+            [100, 101, 99.5, 100.5],  # limit sell at 101 fills
+            [100.5, 104.5, 100, 104],  # stop at 101 * 1.03 = 104.03 fills
+            [104, 104, 104, 104],
+        ]
+    )
+    sim = IntrabarFillSimulator(0.03, entry="limit", limit_offset=0.01)
+    frame, fills = sim.simulate(bars, [-1.0, -1.0, -1.0, -1.0])
+    assert fills["type"].tolist() == ["limit", "stop_loss"]
+    np.testing.assert_allclose(fills["price"], [101.0, 104.03])
+    np.testing.assert_allclose(frame["position"], [-1.0, -1.0, 0.0, 0.0])
+    np.testing.assert_allclose(frame["returns"].iloc[1:3], [100.5 / 101 - 1, 104.03 / 100.5 - 1])
+
+    # A limit that never trades leaves the segment flat
+    frame, fills = IntrabarFillSimulator(entry="limit", limit_offset=0.1).simulate(
+        bars, [-1.0, -1.0, -1.0, -1.0]
+    )
+    assert fills.empty and not frame["position"].any()
+
+
+def test_sweep_and_settings():
+    bars = _random_bars(2000, 3)
+    target = np.repeat(np.random.default_rng(1).choice([-1.0, 0.0, 1.0], 100), 20)
+    sim = IntrabarFillSimulator(intrabar_path="OHLC")
+    table = sim.sweep(bars, target, [None, 0.002], [None, 0.004])
+    assert list(table.index) == [(0.0, 0.0), (0.0, 0.004), (0.002, 0.0), (0.002, 0.004)]
+
+    engine = VectorizedBacktester()
+    single = IntrabarFillSimulator(0.002, 0.004, "OHLC").run(bars, target, engine)
+    row = table.loc[(0.002, 0.004)]
+    assert row["final_equity"] == pytest.approx(single["metrics"]["final_equity"], abs=0.01)
+    assert row["stop_losses"] == single["metrics"]["stop_losses"]
+    assert row["total_return"] == pytest.approx(single["metrics"]["total_return"], abs=1e-4)
+
+    settings = {
+        "risk": {"stop_loss_pct": 0.05, "take_profit_pct": 0.15},
+        "backtest": {"intrabar": {"path": "OLHC", "entry": "limit", "limit_offset": 0.001}},
+    }
+    sim = IntrabarFillSimulator.from_settings(settings=settings)
+    assert (sim.stop_loss_pct, sim.take_profit_pct) == (0.05, 0.15)
+    assert (sim.intrabar_path, sim.entry, sim.limit_offset) == ("OLHC", "limit", 0.001)
+    with pytest.raises(ValueError):
+        IntrabarFillSimulator(intrabar_path="random")
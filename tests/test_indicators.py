@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+from analytics.indicators import IndicatorCache, pct_change, rolling_std, sma, zscore
+
+
+def _prices(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 100 + np.cumsum(rng.normal(0, 1, n))
+    values[7] = np.nan
+    return values
+
+
+def test_indicators_match_pandas():
+    values = _prices()
+    series = pd.Series(values)
+    for w in (5, 30):
+        np.testing.assert_allclose(sma(values, w), series.rolling(w).mean(), rtol=1e-10)
+        np.testing.assert_allclose(rolling_std(values, w), series.rolling(w).std(), rtol=1e-6)
+        np.testing.assert_allclose(pct_change(values, w), series / series.shift(w) - 1)
+    expected = (series - series.rolling(30).mean()) / series.rolling(30).std()
+    np.testing.assert_allclose(zscore(values, 30), expected, rtol=1e-6)
+
+
+def test_cache_reuses_results_for_equal_content():
+    cache = IndicatorCache()
+    values = _prices()
+    first = cache.compute_many(values, "sma", [10, 20])
+    second = cache.compute(values.copy(), "sma", 20)
+    assert second is first[20]
+    assert cache.stats()["hits"] == 1
+
+
+def test_anonymous_series_do_not_follow_the_callers_buffer():
+    cache = IndicatorCache()
+    buffer = _prices()
+    original = buffer.copy()
+    cache.compute(buffer, "sma", 10)
+    buffer[:] = buffer[::-1]  # caller reuses its buffer in place
+
+    later = cache.compute(original, "sma", 30)  # same fingerprint, new window
+    np.testing.assert_allclose(later, pd.Series(original).rolling(30).mean(), rtol=1e-10)
+
+
+def test_append_extends_cached_indicators_incrementally():
+    values = _prices(800)
+    cache = IndicatorCache()
+    cache.register("BTC", values[:500])
+    for name in ("sma", "std", "zscore", "pct_change"):
+        cache.get("BTC", name, 20)
+
+    cache.append("BTC", values[500:])
+    for name, func in (
+        ("sma", sma),
+        ("std", rolling_std),
+        ("zscore", zscore),
+        ("pct_change", pct_change),
+    ):
+        np.testing.assert_allclose(cache.get("BTC", name, 20), func(values, 20), rtol=1e-6)
+    assert cache.stats()["misses"] == 4
+
+
+def test_sync_follows_rolling_buffer():
+    values = _prices(700)
+    cache = IndicatorCache()
+    cache.compute(values[:300], "sma", 50, series_id="ETH")
+    cache.compute(values[40:340], "sma", 50, series_id="ETH")
+
+    result = cache.get("ETH", "sma", 50)
+    assert len(result) == 300
+    np.testing.assert_allclose(result[-250:], sma(values[40:340], 50)[-250:], rtol=1e-10)
+    assert cache.stats()["misses"] == 1
+
+
+def test_sync_detects_edits_anywhere_in_the_overlap():
+    cache = IndicatorCache()
+    base = np.arange(100.0)
+    cache.compute(base, "sma", 5, series_id="X")
+
+    edited = base.copy()
+    edited[50:55] += 1000
+    np.testing.assert_allclose(cache.compute(edited, "sma", 5, series_id="X"), sma(edited, 5))
+
+    # Appended bars after an edit also re-register instead of extending stale entries
+    grown = np.concatenate([edited, [100.0, 101.0]])
+    grown[20] = -5.0
+    np.testing.assert_allclose(cache.compute(grown, "sma", 5, series_id="X"), sma(grown, 5))
+
+
+def test_cache_is_bounded_by_bytes():
+    values = _prices(1000)
+    cache = IndicatorCache(max_bytes=3 * values.nbytes)
+    cache.compute_many(values, "sma", range(2, 12))
+    assert cache.nbytes <= 3 * values.nbytes
+    assert cache.stats()["entries"] == 3
+
+
+def test_misses_are_computed_outside_the_lock(monkeypatch):
+    import threading
+
+    import analytics.indicators as indicators
+
+    cache = IndicatorCache()
+    free = []
+    original = indicators.rolling_mean_std
+
+    def probing(*args, **kwargs):
+        # Another thread must be able to take the lock while we compute
+        def try_lock():
+            acquired = cache._lock.acquire(blocking=False)
+            if acquired:
+                cache._lock.release()
+            free.append(acquired)
+
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(indicators, "rolling_mean_std", probing)
+    values = _prices()
+    np.testing.assert_allclose(cache.compute(values, "sma", 20), sma(values, 20), equal_nan=True)
+    assert free and all(free)
+
+    # A result computed for a superseded snapshot is returned but not cached
+    cache.compute(values[:300], "sma", 5, series_id="S")
+    lookup = cache._lookup("S", "sma", [10])
+    cache.register("S", values[:200])
+    cache._fill("S", "sma", *lookup)
+    assert ("S", "sma", 10, lookup[1]) not in cache._entries
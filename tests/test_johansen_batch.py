@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from ai.cointegration.johansen_batch import BatchJohansenService, JohansenJob
+
+
+def _basket(n=260, seed=7):
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.normal(0, 1, n))
+    y = x + rng.normal(0, 0.4, n)
+    z = 0.5 * x + 0.2 * y + rng.normal(0, 0.3, n)
+    return pd.DataFrame({"x": x, "y": y, "z": z})
+
+
+def test_plan_rolling_reuses_anchor_windows():
+    anchors, mapping = BatchJohansenService.plan_rolling(n_rows=30, window=10, stride=4)
+    assert anchors == [10, 14, 18, 22, 26]
+    assert len(mapping) == 20
+    assert mapping[:5] == [10, 10, 10, 10, 14]
+
+
+def test_results_are_memoized_by_window_and_data():
+    prices = _basket()
+    svc = BatchJohansenService(max_workers=1)
+    jobs = [JohansenJob(("x", "y", "z"), 0, 200), JohansenJob(("x", "y", "z"), 0, 200)]
+
+    first = svc.evaluate(prices, jobs)
+    assert first[0] is first[1]
+    assert svc.cache_info()["misses"] == 1
+
+    svc.evaluate(prices, jobs[:1])
+    assert svc.cache_info()["hits"] == 1
+
+    shifted = prices + 1.0
+    svc.evaluate(shifted, jobs[:1])
+    assert svc.cache_info()["misses"] == 2
+
+
+def test_rolling_stride_matches_one_result_per_window():
+    prices = _basket()
+    svc = BatchJohansenService(max_workers=1)
+    results = svc.evaluate_rolling(prices, window=200, stride=20)
+    assert len(results) == len(prices) - 200
+    assert svc.cache_info()["entries"] == 3
+    assert all("rank" in r for r in results)
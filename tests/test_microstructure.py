@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from strategies.microstructure import BookSide, MicrostructureEngine, MicrostructureFilter
+
+
+@pytest.mark.parametrize("is_bid", [True, False])
+def test_book_side_top_volume_tracks_deltas(is_bid):
+    rng = random.Random(11)
+    side = BookSide(is_bid=is_bid, depth=5)
+    reference = {}
+    for _ in range(5_000):
+        price = round(rng.uniform(95, 105), 1)
+        size = rng.choice([0.0, rng.uniform(0.1, 3.0)])
+        side.update(price, size)
+        if size <= 0:
+            reference.pop(price, None)
+        else:
+            reference[price] = size
+
+    best = sorted(reference.items(), reverse=is_bid)[:5]
+    assert side.top() == best
+    assert side.top_volume == pytest.approx(sum(s for _, s in best))
+
+
+def test_rolling_vwap_expires_old_trades():
+    engine = MicrostructureEngine(vwap_window_seconds=10)
+    engine.on_trade("BTC/USD", 100.0, 1.0, ts=0)
+    engine.on_trade("BTC/USD", 102.0, 1.0, ts=5)
+    assert engine.vwap("BTC/USD", now=5) == pytest.approx(101.0)
+    assert engine.vwap("BTC/USD", now=12) == pytest.approx(102.0)
+
+
+def test_filter_confirms_from_engine_state():
+    engine = MicrostructureEngine(depth=2)
+    engine.on_book_snapshot("BTC/USD", bids=[(99, 5), (98, 5), (97, 100)], asks=[(101, 1)])
+    engine.on_trade("BTC/USD", 101.0, 2.0)
+    filt = MicrostructureFilter(engine=engine)
+    assert filt.confirm({"pair": "BTC/USD", "direction": "LONG", "price": 100.0})
+    assert not filt.confirm({"pair": "BTC/USD", "direction": "SHORT", "price": 100.0})
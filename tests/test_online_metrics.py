@@ -0,0 +1,69 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.online_metrics import OnlineMetrics
+from backtest.performance_metrics import compute_performance_metrics
+from monitoring.logging_utils import NullTradeSink
+from portfolio.allocator import PortfolioAllocator
+
+STATE = ["n", "mean", "m2", "neg_n", "neg_mean", "neg_m2", "wins", "peak", "max_drawdown"]
+
+
+def _equity(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(1000 * np.cumprod(1 + rng.normal(0.0002, 0.01, n)))
+
+
+@pytest.mark.parametrize("risk_free_rate", [0.0, 0.02])
+def test_streaming_matches_full_series_metrics(risk_free_rate):
+    equity = _equity()
+    metrics = OnlineMetrics(risk_free_rate=risk_free_rate)
+    for value in equity:
+        metrics.update(value)
+    snapshot = metrics.snapshot()
+    expected = compute_performance_metrics(equity, risk_free_rate)
+    for key, value in expected.items():
+        assert snapshot[key] == pytest.approx(value, abs=1e-3), key
+    assert snapshot["drawdown"] == pytest.approx(equity.iloc[-1] / equity.max() - 1, abs=1e-4)
+
+
+def test_batch_path_matches_streaming():
+    equity = _equity(seed=1).to_numpy()
+    streamed = OnlineMetrics(halflife=50)
+    for value in equity:
+        streamed.update(value)
+
+    batched = OnlineMetrics(halflife=50)
+    for chunk in np.array_split(equity, [1, 7, 600, 601, 1500]):
+        batched.update_many(chunk)
+
+    for name in STATE + ["ew_mean", "ew_var", "ew_down"]:
+        assert getattr(batched, name) == pytest.approx(getattr(streamed, name), rel=1e-9), name
+    assert OnlineMetrics.from_equity(equity, halflife=50).snapshot() == streamed.snapshot()
+
+
+def test_ewma_matches_pandas():
+    returns = _equity(seed=2).pct_change().dropna()
+    metrics = OnlineMetrics.from_equity(_equity(seed=2), halflife=20)
+    ewm = returns.ewm(halflife=20, adjust=False)
+    assert metrics.ew_mean == pytest.approx(ewm.mean().iloc[-1])
+    assert metrics.ew_var == pytest.approx(ewm.var(bias=True).iloc[-1])
+    assert metrics.ewma_volatility == pytest.approx(np.sqrt(ewm.var(bias=True).iloc[-1] * 252))
+
+
+def test_allocator_tracks_metrics_per_update():
+    logger = logging.getLogger("test_online_metrics")
+    allocator = PortfolioAllocator(logger, {"initial_capital": 1000.0}, trade_sink=NullTradeSink())
+    for side, price in [("BUY", 100.0), ("SELL", 90.0), ("BUY", 95.0), ("SELL", 120.0)]:
+        allocator.allocate_capital({"symbol": "X", "side": side, "qty": 1.0, "price": price}, price)
+
+    curve = pd.Series([1000.0] + allocator.equity_curve)
+    expected = compute_performance_metrics(curve)
+    metrics = allocator.get_metrics()
+    assert metrics["max_drawdown"] == expected["max_drawdown"]
+    assert metrics["sharpe_ratio"] == pytest.approx(expected["sharpe_ratio"], abs=1e-3)
+    assert allocator.max_drawdown == pytest.approx(-(curve / curve.cummax() - 1).min())
+    assert allocator.peak_equity == curve.max() and allocator.current_equity == curve.iloc[-1]
@@ -0,0 +1,90 @@
+import json
+import zlib
+
+from live.order_book import BookReplayer, OrderBookManager
+from strategies.microstructure import MicrostructureEngine
+
+
+def _expected_checksum(asks, bids):
+    def token(v):
+        return v.replace(".", "").lstrip("0")
+
+    parts = [token(p) + token(v) for p, v in asks[:10]] + [
+        token(p) + token(v) for p, v in bids[:10]
+    ]
+    return zlib.crc32("".join(parts).encode()) & 0xFFFFFFFF
+
+
+def _recorded_session():
+    snapshot = [
+        336,
+        {
+            "as": [
+                ["5541.30000", "2.50700000", "1534614248.123678"],
+                ["5541.80000", "0.33000000", "1534614098.345543"],
+                ["5542.70000", "0.64700000", "1534614244.654432"],
+            ],
+            "bs": [
+                ["5541.20000", "1.52900000", "1534614248.765567"],
+                ["5539.90000", "0.30000000", "1534614241.769870"],
+                ["5539.50000", "5.00000000", "1534613831.243486"],
+            ],
+        },
+        "book-3",
+        "XBT/USD",
+    ]
+    asks_after = [
+        ("5541.30000", "2.50700000"),
+        ("5541.50000", "1.00000000"),
+        ("5541.80000", "0.33000000"),
+    ]
+    bids_after = [("5541.20000", "1.52900000"), ("5539.50000", "5.00000000")]
+    update = [
+        336,
+        {"a": [["5541.50000", "1.00000000", "1534614249.000000"]]},
+        {
+            "b": [["5539.90000", "0.00000000", "1534614249.100000"]],
+            "c": str(_expected_checksum(asks_after, bids_after)),
+        },
+        "book-3",
+        "XBT/USD",
+    ]
+    return [
+        snapshot,
+        update,
+        [0, [["5541.2", "0.1", "1534614249.2", "s", "m", ""]], "trade", "XBT/USD"],
+    ]
+
+
+def test_book_applies_snapshot_updates_and_checksum():
+    engine = MicrostructureEngine(depth=3)
+    manager = OrderBookManager(depth=3, microstructure=engine)
+    for msg in _recorded_session():
+        manager.handle(msg)
+
+    book = manager.books["XBT/USD"]
+    assert book.valid and manager.checksum_failures == 0
+    assert book.snapshot()["asks"] == [(5541.3, 2.507), (5541.5, 1.0), (5541.8, 0.33)]
+    assert book.snapshot()["bids"] == [(5541.2, 1.529), (5539.5, 5.0)]
+    assert engine.books["XBT/USD"]["asks"].top() == book.snapshot()["asks"]
+
+    price, filled = book.walk("BUY", 3.0)
+    assert filled == 3.0 and 5541.3 < price < 5541.5
+
+
+def test_checksum_mismatch_invalidates_book():
+    manager = OrderBookManager(depth=3)
+    snapshot, update, _ = _recorded_session()
+    update[2]["c"] = "12345"
+    manager.handle(snapshot)
+    manager.handle(update)
+    assert not manager.books["XBT/USD"].valid
+    assert manager.checksum_failures == 1
+
+
+def test_replayer_feeds_recorded_messages(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text("\n".join(json.dumps(m) for m in _recorded_session()))
+    manager = OrderBookManager(depth=3)
+    assert BookReplayer(path).replay(manager) == 3
+    assert manager.books["XBT/USD"].best_ask() == 5541.3
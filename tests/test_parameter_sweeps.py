@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimization.optimizers.utils import sweep_results
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.trend_following import TrendFollowingStrategy
+
+
+@pytest.fixture(scope="module")
+def price_data():
+    rng = np.random.default_rng(3)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2_000))))
+    prices.iloc[700] = np.nan
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def test_trend_sweep_matches_run_backtest(price_data):
+    strategy = TrendFollowingStrategy()
+    shorts, longs = [5, 10, 20], [30, 50, 100]
+    grid = strategy.sweep(price_data, shorts, longs)
+
+    assert grid["pnl"].shape == (3, 3)
+    for s in shorts:
+        for lw in longs:
+            expected = strategy.run_backtest({"short_window": s, "long_window": lw}, price_data)
+            assert grid["pnl"].loc[s, lw] == pytest.approx(expected["pnl"], abs=1e-10)
+
+
+def test_trend_sweep_blocks_stay_within_byte_budget():
+    import tracemalloc
+
+    rng = np.random.default_rng(4)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 50_000))))
+    data = {"prices": prices, "returns": prices.pct_change()}
+    strategy, shorts, longs = TrendFollowingStrategy(), list(range(2, 42)), [50, 100, 200]
+    whole = strategy.sweep(data, shorts, longs)  # also warms the SMA cache
+
+    budget = 8 * 1024 * 1024
+    tracemalloc.start()
+    blocked = strategy.sweep(data, shorts, longs, max_bytes=budget)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 2 * budget  # one block of temporaries plus small per-block copies
+    pd.testing.assert_frame_equal(blocked["pnl"], whole["pnl"])
+
+
+def test_mean_reversion_sweep_matches_run_backtest(price_data):
+    strategy = MeanReversionStrategy()
+    lookbacks, thresholds = [10, 20, 30], [1.5, 2.0, 2.5]
+    grid = strategy.sweep(price_data, lookbacks, thresholds)
+
+    assert grid["pnl"].shape == (3, 3)
+    for lb in lookbacks:
+        for th in thresholds:
+            expected = strategy.run_backtest({"lookback": lb, "threshold": th}, price_data)
+            assert grid["pnl"].loc[lb, th] == pytest.approx(expected["pnl"], abs=1e-10)
+
+
+def test_sweep_results_flattens_grid_for_optimizers(price_data):
+    grid = {"lookback": [10, 20], "threshold": [1.5, 2.0]}
+    results = sweep_results(MeanReversionStrategy(), grid, price_data, target_metric="sharpe")
+
+    assert len(results) == 4
+    assert {tuple(r["params"].values()) for r in results} == {
+        (10, 1.5),
+        (10, 2.0),
+        (20, 1.5),
+        (20, 2.0),
+    }
+    assert all(r["fitness"] == r["sharpe"] for r in results)
+    assert sweep_results(MeanReversionStrategy(), {"lookback": [10]}, price_data) is None
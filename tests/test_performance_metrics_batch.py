@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.performance_metrics import (
+    compute_performance_metrics,
+    compute_performance_metrics_batch,
+)
+
+LEGACY = ["total_return", "sharpe_ratio", "sortino_ratio", "max_drawdown", "win_rate"]
+
+
+def _curves(n=500, k=40, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.01, (n, k))
+    returns[:, 0] = 0.001  # never under water, no losses
+    returns[:, 1] = rng.choice([0.01, -0.002], n)
+    equity = 1000 * np.cumprod(1 + returns, axis=0)
+    return pd.DataFrame(
+        np.vstack([np.full(k, 1000.0), equity]), columns=[f"c{i}" for i in range(k)]
+    )
+
+
+@pytest.mark.parametrize("risk_free_rate", [0.0, 0.03])
+def test_batch_matches_single_curve_function(risk_free_rate):
+    curves = _curves()
+    batch = compute_performance_metrics_batch(curves, risk_free_rate, rounded=True)
+    assert list(batch.index) == list(curves.columns)
+    for name in curves.columns:
+        single = compute_performance_metrics(curves[name], risk_free_rate)
+        row = batch.loc[name]
+        for key in LEGACY:
+            assert row[key] == pytest.approx(single[key], abs=1e-3), (name, key)
+        assert row["volatility"] == pytest.approx(single["volatility"], abs=1e-3)
+        assert row["trades"] == single["trades"]
+
+
+def test_extended_metrics_against_direct_definitions():
+    curves = _curves(k=6)
+    batch = compute_performance_metrics_batch(curves)
+    for name in curves.columns[2:]:
+        equity = curves[name]
+        returns = equity.pct_change().dropna()
+        drawdown = equity / equity.cummax() - 1
+        years = len(returns) / 252
+        cagr = (equity.iloc[-1] / equity.iloc[0]) ** (1 / years) - 1
+        row = batch.loc[name]
+
+        assert row["calmar_ratio"] == pytest.approx(cagr / abs(drawdown.min()))
+        omega = returns.clip(lower=0).sum() / (-returns).clip(lower=0).sum()
+        assert row["omega_ratio"] == pytest.approx(omega)
+        tail = abs(returns.quantile(0.95)) / abs(returns.quantile(0.05))
+        assert row["tail_ratio"] == pytest.approx(tail)
+        assert row["time_under_water"] == pytest.approx((drawdown < 0).mean())
+        runs = (drawdown < 0).astype(int).groupby((drawdown >= 0).cumsum()).sum()
+        assert row["max_time_under_water"] == runs.max()
+
+    rising = batch.loc["c0"]
+    assert rising["max_drawdown"] == 0 and rising["calmar_ratio"] == 0
+    assert rising["omega_ratio"] == np.inf and rising["max_time_under_water"] == 0
+
+
+def test_batch_accepts_arrays_and_short_input():
+    curves = _curves(k=3)
+    from_array = compute_performance_metrics_batch(curves.to_numpy())
+    assert list(from_array.index) == [0, 1, 2]
+    assert compute_performance_metrics_batch(curves.to_numpy()[:1])["trades"].tolist() == [0] * 3
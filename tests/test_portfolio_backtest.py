@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtest_runner import BacktestRunner, _strategy_data, _time_indexed
+from backtest.engine import VectorizedBacktester
+from backtest.portfolio_backtest import PortfolioBacktester, collect_streams
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.statistical_arbitrage import StatisticalArbitrageStrategy
+from strategies.trend_following import TrendFollowingStrategy
+
+
+def _frames(pos, ret, streams):
+    columns = pd.MultiIndex.from_tuples(streams, names=["sleeve", "symbol"])
+    return pd.DataFrame(pos, columns=columns), pd.DataFrame(ret, columns=columns)
+
+
+def test_single_stream_matches_vectorized_engine():
+    rng = np.random.default_rng(0)
+    pos = np.sign(rng.normal(size=500)) * (rng.random(500) > 0.3)
+    ret = rng.normal(0, 0.01, 500)
+    result = PortfolioBacktester(commission=0.001, slippage=0.0005).run(
+        *_frames(pos[:, None], ret[:, None], [("trend", "AAA")])
+    )
+    expected = VectorizedBacktester(commission=0.001, slippage=0.0005).run(pos, ret)
+    np.testing.assert_allclose(result["equity"], expected["equity"])
+    assert result["metrics"]["costs"] == pytest.approx(expected["metrics"]["costs"], abs=0.01)
+
+
+def test_selection_exposure_and_weight_caps():
+    pos = np.array([[1.0, 0.5, -0.8], [0.0, 0.5, -0.8]])
+    frames = _frames(pos, np.zeros_like(pos), [("a", "X"), ("b", "Y"), ("c", "Z")])
+    bt = PortfolioBacktester(max_positions=2, max_exposure=0.6)
+    weights = bt.run(*frames)["weights"].to_numpy()
+    np.testing.assert_allclose(weights, [[0.3, 0.0, -0.24], [0.0, 0.15, -0.24]])
+
+    capped = PortfolioBacktester(max_positions=2, max_weight=0.2).run(*frames)["weights"]
+    assert np.abs(capped.to_numpy()).max() == pytest.approx(0.2)
+
+
+def test_risk_parity_weights_inverse_to_volatility():
+    rng = np.random.default_rng(1)
+    ret = rng.normal(0, 1, (400, 2)) * [0.01, 0.02]
+    bt = PortfolioBacktester(allocation_method="risk_parity", vol_window=200)
+    weights = bt.run(*_frames(np.ones((400, 2)), ret, [("a", "X"), ("b", "Y")]))["weights"]
+    np.testing.assert_allclose(weights.iloc[:199].to_numpy(), 0.5)  # no estimate yet
+    ratio = weights.iloc[200:, 0] / weights.iloc[200:, 1]
+    assert ratio.mean() == pytest.approx(2.0, rel=0.1)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+
+def test_drawdown_stop_flattens_book_after_first_breach():
+    ret = np.r_[np.full(50, 0.01), np.full(50, -0.02), np.full(50, 0.03)]
+    frames = _frames(np.ones((150, 1)), ret[:, None], [("trend", "X")])
+    free = PortfolioBacktester(commission=0, slippage=0).run(*frames)
+    stopped = PortfolioBacktester(commission=0, slippage=0, max_drawdown=0.15).run(*frames)
+
+    halted = stopped["metrics"]["halted_at"]
+    assert 50 < halted < 100
+    np.testing.assert_allclose(stopped["equity"][: halted + 1], free["equity"][: halted + 1])
+    assert (stopped["weights"].iloc[halted:] == 0).all().all()
+    assert stopped["equity"].iloc[-1] == stopped["equity"].iloc[halted + 1]
+    assert stopped["metrics"]["max_drawdown"] > -0.2
+
+
+def _price_data(seed, n=600):
+    prices = pd.Series(100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n))))
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def test_sleeve_attribution_adds_up_and_settings_apply():
+    jobs = [
+        (sleeve, symbol, strategy, _price_data(seed), None)
+        for sleeve, strategy in [
+            ("trend", TrendFollowingStrategy()),
+            ("mean", MeanReversionStrategy()),
+        ]
+        for seed, symbol in enumerate(["AAA", "BBB"])
+    ]
+    settings = {
+        "backtest": {"capital_base": 1_000.0},
+        "portfolio": {"max_positions": 3, "allocation_method": "risk_parity", "max_drawdown": 0.5},
+        "risk": {"max_exposure": 0.75},
+    }
+    bt = PortfolioBacktester.from_settings(settings=settings)
+    assert (bt.max_positions, bt.allocation_method, bt.max_exposure) == (3, "risk_parity", 0.75)
+
+    result = bt.run_strategies(jobs)
+    np.testing.assert_allclose(result["sleeve_returns"].sum(axis=1), result["returns"])
+    assert list(result["sleeves"].index) == ["trend", "mean"]
+    assert (result["weights"] != 0).sum(axis=1).max() <= 3
+    assert np.abs(result["weights"]).sum(axis=1).max() <= 0.75 + 1e-12
+    assert result["sleeves"]["streams"].tolist() == [2, 2]
+
+    pos, ret = collect_streams(jobs)
+    assert pos.shape == ret.shape == (600, 4)
+    with pytest.raises(ValueError):
+        PortfolioBacktester(allocation_method="kelly")
+
+
+def test_runner_combines_all_strategies(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(2)
+    common = np.cumsum(rng.normal(0, 0.01, 400))
+    for symbol in ["AAA", "BBB"]:
+        close = 100 * np.exp(common + np.cumsum(rng.normal(0, 0.003, 400)))
+        pd.DataFrame({"close": close}).to_csv(tmp_path / f"{symbol}.csv", index=False)
+
+    runner = BacktestRunner(VectorizedBacktester())
+    runner.symbols, runner.data_dir = ["AAA", "BBB"], str(tmp_path)
+    result = runner.run_portfolio(max_drawdown=None)
+    # Stat arb trades BBB against the AAA benchmark only
+    assert result["weights"].shape[1] == 5
+    assert set(result["sleeves"].index) == {"TrendFollowing", "MeanReversion", "StatArbitrage"}
+
+
+def test_runner_aligns_symbols_of_different_lengths_by_time(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(4)
+    stamps = pd.date_range("2024-01-01", periods=400, freq="h")
+    common = np.cumsum(rng.normal(0, 0.01, 400))
+    for symbol, start in [("AAA", 0), ("BBB", 100)]:
+        close = 100 * np.exp(common + np.cumsum(rng.normal(0, 0.003, 400)))
+        frame = pd.DataFrame({"timestamp": stamps, "close": close}).iloc[start:]
+        frame.to_csv(tmp_path / f"{symbol}.csv", index=False)
+
+    runner = BacktestRunner(VectorizedBacktester())
+    runner.symbols, runner.data_dir = ["AAA", "BBB"], str(tmp_path)
+    pair = _strategy_data(StatisticalArbitrageStrategy, "BBB", runner._load, "AAA")
+    assert pair["X"].index.equals(stamps[100:]) and pair["Y"].index.equals(stamps[100:])
+
+    result = runner.run_portfolio(max_drawdown=None)
+    weights = result["weights"]
+    assert weights.index.equals(stamps)
+    bbb = weights.xs("BBB", axis=1, level="symbol")
+    assert (bbb.iloc[:100] == 0).all().all() and (bbb.iloc[100:] != 0).any().any()
+
+    # Frames without timestamps are aligned on their last bar
+    untimed = _time_indexed(pd.DataFrame({"close": [1.0, 2.0, 3.0]}))
+    assert untimed.index.tolist() == [-3, -2, -1]
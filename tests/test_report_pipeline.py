@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from backtest.report_pipeline import ReportPipeline
+
+
+def _equity(seed, n=2_000):
+    returns = np.random.default_rng(seed).normal(0.0002, 0.01, n)
+    return pd.Series(100_000 * np.cumprod(1 + returns), name="equity")
+
+
+def _results():
+    return [
+        {"strategy": "Trend", "symbol": "AAPL", "sharpe_ratio": 1.1, "total_return": 0.2},
+        {"strategy": "Trend", "symbol": "MSFT", "sharpe_ratio": 0.4, "total_return": 0.05},
+        {"strategy": "MeanRev", "symbol": "AAPL", "sharpe_ratio": -0.3, "total_return": -0.1},
+        {"strategy": "StatArb", "symbol": "AAPL", "error": "AAPL is the pairs benchmark"},
+    ]
+
+
+def test_pipeline_renders_reports_index_and_shared_bundle(tmp_path):
+    curve_dir = tmp_path / "curves"
+    curve_dir.mkdir()
+    _equity(2).to_csv(curve_dir / "MeanRev_AAPL.csv", header=True)
+    curves = {("Trend", "AAPL"): _equity(0), ("Trend", "MSFT"): _equity(1)}
+
+    out = tmp_path / "html"
+    outcome = ReportPipeline(str(out), max_workers=2).run(
+        _results(), curves=curves, curve_dir=str(curve_dir)
+    )
+    assert outcome["rendered"] == [
+        "MeanRev_AAPL_report.html",
+        "Trend_AAPL_report.html",
+        "Trend_MSFT_report.html",
+        "comparison.html",
+    ]
+    assert outcome["skipped"] == []
+
+    bundle = os.path.getsize(out / "plotly.min.js")
+    for name in outcome["rendered"]:
+        text = (out / name).read_text(encoding="utf-8")
+        assert 'src="plotly.min.js"' in text and len(text) < bundle / 4
+
+    index = (out / "index.html").read_text(encoding="utf-8")
+    assert 'href="Trend_MSFT_report.html"' in index and 'href="comparison.html"' in index
+    assert "AAPL is the pairs benchmark" in index
+
+
+def test_unchanged_inputs_are_skipped(tmp_path):
+    curves = {("Trend", "AAPL"): _equity(0), ("Trend", "MSFT"): _equity(1)}
+    results = _results()[:2]
+    pipeline = ReportPipeline(str(tmp_path))
+    assert len(pipeline.run(results, curves=curves)["rendered"]) == 3
+
+    again = pipeline.run(results, curves=curves)
+    assert again["rendered"] == [] and len(again["skipped"]) == 3
+
+    curves[("Trend", "MSFT")] = _equity(5)
+    changed = pipeline.run(results, curves=curves)
+    assert changed["rendered"] == ["Trend_MSFT_report.html", "comparison.html"]
+
+    os.remove(tmp_path / "Trend_AAPL_report.html")
+    assert pipeline.run(results, curves=curves)["rendered"] == ["Trend_AAPL_report.html"]
+    assert len(pipeline.run(results, curves=curves, force=True)["rendered"]) == 3
+
+
+def test_index_escapes_result_text(tmp_path):
+    results = _results() + [
+        {"strategy": "Trend", "symbol": "GOOG", "error": "expected <class 'float'> > 0 & <b>"}
+    ]
+    out = tmp_path / "html"
+    index = ReportPipeline(str(out)).run(results, curves={("Trend", "AAPL"): _equity(0)})["index"]
+    page = open(index, encoding="utf-8").read()
+    assert "&lt;class &#x27;float&#x27;&gt; &gt; 0 &amp; &lt;b&gt;" in page
+    assert "<b>" not in page
+    assert '<a href="Trend_AAPL_report.html">open</a>' in page
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.performance_metrics import compute_performance_metrics_batch
+from backtest.resampling import bootstrap_metrics, iter_resampled_returns, resample_indices
+
+
+def _returns(n=500, seed=0):
+    return np.random.default_rng(seed).normal(0.0005, 0.01, n)
+
+
+def test_block_bootstrap_keeps_runs_of_consecutive_bars():
+    idx = resample_indices(np.random.default_rng(0), 1000, 200, "block", block_size=20)
+    assert idx.shape == (1000, 200) and idx.min() >= 0 and idx.max() < 1000
+    continued = np.mean(idx[1:] == (idx[:-1] + 1) % 1000)
+    assert continued == pytest.approx(1 - 1 / 20, abs=0.01)
+
+
+def test_trade_shuffle_preserves_total_return():
+    trades = _returns(60)
+    result = bootstrap_metrics(trades, n_paths=300, method="trades", seed=1)
+    np.testing.assert_allclose(result["paths"]["total_return"], np.prod(1 + trades) - 1)
+    assert result["paths"]["max_drawdown"].std() > 0
+    for column in ["sharpe_ratio", "win_rate", "volatility", "omega_ratio"]:
+        np.testing.assert_allclose(result["paths"][column], result["observed"][column])
+
+
+def test_results_are_seeded_and_independent_of_workers():
+    returns = _returns()
+    kwargs = dict(n_paths=500, method="block", seed=7, max_chunk_bytes=500 * 8 * 10 * 64)
+    inline = bootstrap_metrics(returns, **kwargs)
+    pooled = bootstrap_metrics(returns, max_workers=2, **kwargs)
+    pd.testing.assert_frame_equal(inline["paths"], pooled["paths"])
+    assert len(inline["paths"]) == 500
+
+    other = bootstrap_metrics(returns, **{**kwargs, "seed": 8})
+    assert not inline["paths"].equals(other["paths"])
+
+
+def test_chunks_feed_batch_metrics_and_intervals():
+    returns = _returns(seed=3)
+    chunks = list(iter_resampled_returns(returns, 250, "iid", seed=3, chunk_size=100))
+    assert [c.shape for c in chunks] == [(500, 100), (500, 100), (500, 50)]
+
+    result = bootstrap_metrics(returns, n_paths=2000, method="iid", seed=3)
+    observed = compute_performance_metrics_batch(np.cumprod(np.r_[1.0, 1 + returns])).iloc[0]
+    pd.testing.assert_series_equal(result["observed"], observed, check_names=False)
+
+    summary = result["summary"]
+    sharpe = summary.loc["sharpe_ratio"]
+    assert sharpe["lower"] < observed["sharpe_ratio"] < sharpe["upper"]
+    assert sharpe["mean"] == pytest.approx(observed["sharpe_ratio"], abs=0.3)
+    assert 0 <= summary.loc["max_drawdown", "prob_non_positive"] <= 1
@@ -0,0 +1,112 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import VectorizedBacktester
+from backtest.result_cache import BacktestResultCache, fingerprint_data, make_key
+from optimization.optimizers.utils import sweep_results
+from strategies.trend_following import TrendFollowingStrategy
+
+
+def _data(n=800, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))))
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def test_key_normalizes_params_and_tracks_inputs():
+    strategy, data = TrendFollowingStrategy(), _data()
+    costs = {"commission": 0.001}
+    key = make_key(strategy, {"short_window": 10, "long_window": 50}, data, costs)
+    assert key == make_key(
+        TrendFollowingStrategy, {"long_window": np.int64(50), "short_window": 10}, _data(), costs
+    )
+    assert key != make_key(strategy, {"short_window": 10, "long_window": 60}, data, costs)
+    assert key != make_key(strategy, {"short_window": 10, "long_window": 50}, _data(seed=1), costs)
+    assert key != make_key(strategy, {"short_window": 10, "long_window": 50}, data, {})
+
+
+def test_engine_results_are_memoized(tmp_path):
+    cache = BacktestResultCache(str(tmp_path / "results.sqlite"))
+    engine = VectorizedBacktester(result_cache=cache)
+    strategy, data = TrendFollowingStrategy(), _data()
+
+    first = engine.run_strategy(strategy, data, {"short_window": 10, "long_window": 50})
+    second = engine.run_strategy(strategy, data, {"short_window": 10, "long_window": 50})
+    pd.testing.assert_series_equal(first["equity"], second["equity"])
+    assert first["metrics"] == second["metrics"]
+
+    engine.commission = 0.002  # different costs → different entry
+    engine.run_strategy(strategy, data, {"short_window": 10, "long_window": 50})
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+def test_size_based_lru_eviction(tmp_path):
+    size = len(pickle.dumps(np.zeros(128), protocol=pickle.HIGHEST_PROTOCOL))
+    cache = BacktestResultCache(str(tmp_path / "results.sqlite"), max_bytes=3 * size)
+    for i in range(3):
+        cache.put(f"k{i}", np.zeros(128))
+    assert cache.get("k0") is not None  # k0 becomes most recently used
+    cache.put("k3", np.zeros(128))
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None and cache.get("k3") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def _cached_sweep(path):
+    cache = BacktestResultCache(path)
+    grid = {"short_window": [5, 10], "long_window": [40, 80]}
+    return sweep_results(TrendFollowingStrategy(), grid, _data(), "pnl", cache=cache)
+
+
+def test_cache_is_shared_across_worker_processes(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    expected = _cached_sweep(path)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(_cached_sweep, [path] * 4))
+    assert all(r == expected for r in results)
+    stats = BacktestResultCache(path).stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (4, 1, 1)
+
+
+def test_optimization_runner_keys_by_strategy_class_and_costs(tmp_path, monkeypatch):
+    from optimization.optimization_runner import OptimizationRunner
+
+    cache = BacktestResultCache(tmp_path / "cache.sqlite")
+    calls = []
+
+    def run_fn(data_path, params, strategy_name):
+        calls.append(params)
+        return {"fitness": 1.0}
+
+    data_path = tmp_path / "data.csv"
+    data_path.write_text("close\n1.0\n2.0\n")
+    runner = OptimizationRunner(
+        "TrendFollowing", "grid", data_path, {}, output_dir=tmp_path, result_cache=cache
+    )
+    strategy, costs, data = runner._identity
+    assert strategy is TrendFollowingStrategy
+    assert costs == VectorizedBacktester.from_settings().cost_settings
+    assert data == fingerprint_data(data_path)
+
+    # The data file is hashed once, when the runner is built, not per evaluation
+    hashed = []
+
+    def spy(value):
+        hashed.append(value)
+        return fingerprint_data(value)
+
+    monkeypatch.setattr("backtest.result_cache.fingerprint_data", spy)
+    runner._cached_run(run_fn, {"short_window": 10})
+    runner._cached_run(run_fn, {"short_window": 10})
+    assert len(calls) == 1
+    assert hashed and data_path not in hashed
+
+    runner._identity = (strategy, {**costs, "commission": costs["commission"] * 2}, data)
+    runner._cached_run(run_fn, {"short_window": 10})
+    assert len(calls) == 2
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.rolling_metrics import RollingMetrics, rolling_max_drawdown, rolling_return_stats
+
+
+def _brute_drawdown(values, window, mode):
+    out = np.full(len(values), np.nan)
+    for t in range(window - 1, len(values)):
+        seg = values[t - window + 1 : t + 1]
+        peak = np.maximum.accumulate(seg)
+        out[t] = (seg / peak - 1).min() if mode == "relative" else (seg - peak).min()
+    return out
+
+
+@pytest.mark.parametrize("mode", ["relative", "absolute"])
+@pytest.mark.parametrize("n, window", [(1, 1), (9, 10), (100, 1), (100, 7), (101, 10), (250, 50)])
+def test_windowed_max_drawdown_matches_brute_force(mode, n, window):
+    rng = np.random.default_rng(n * window)
+    equity = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    np.testing.assert_allclose(
+        rolling_max_drawdown(equity, window, mode), _brute_drawdown(equity, window, mode)
+    )
+
+
+def test_drawdown_is_windowed_not_global():
+    equity = np.array([100, 50, 60, 70, 80, 90, 95, 96, 97, 98], dtype=float)
+    dd = rolling_max_drawdown(equity, 3)
+    assert dd[2] == pytest.approx(-0.5)
+    assert np.all(dd[4:] == 0)  # the crash has left the window; global DD is still -50%
+
+
+def test_nan_windows_and_min_periods():
+    pnl = np.array([0.0, 5.0, -3.0, np.nan, 2.0, 4.0, 1.0, -6.0])
+    dd = rolling_max_drawdown(pnl, 3, mode="absolute", min_periods=1)
+    assert dd[0] == 0 and dd[2] == -8.0
+    assert np.isnan(dd[3:6]).all()
+    assert dd[6] == -3.0 and dd[7] == -10.0
+
+
+def test_rolling_metrics_match_pandas():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"returns": rng.normal(0.001, 0.02, 500)})
+    df["equity_curve"] = (1 + df["returns"]).cumprod()
+    out = RollingMetrics(window=30).compute(df)
+
+    std = df["returns"].rolling(30).std(ddof=0)
+    pd.testing.assert_series_equal(out["rolling_volatility"], std, check_names=False)
+    sharpe = df["returns"].rolling(30).mean() / std
+    pd.testing.assert_series_equal(out["rolling_sharpe"], sharpe, check_names=False)
+    np.testing.assert_allclose(
+        out["rolling_max_drawdown"], _brute_drawdown(df["equity_curve"].to_numpy(), 30, "relative")
+    )
+    _, _, annual = rolling_return_stats(df["returns"], 30, periods_per_year=252)
+    np.testing.assert_allclose(annual, sharpe * np.sqrt(252))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtest_runner import BacktestRunner
+from backtest.engine import VectorizedBacktester
+from backtest.shared_data import SharedDatasetStore, SharedFrameLoader
+
+
+def _write_csvs(data_dir, symbols, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0, 0.01, n))
+    for symbol in symbols:
+        close = 100 * np.exp(common + np.cumsum(rng.normal(0, 0.003, n)))
+        pd.DataFrame({"close": close, "volume": rng.integers(1, 1000, n)}).to_csv(
+            data_dir / f"{symbol}.csv", index=False
+        )
+
+
+def test_shared_frame_roundtrip():
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0], "volume": [10, 20, 30], "tag": list("abc")})
+    with SharedDatasetStore() as store:
+        store.put("X", df)
+        loader = SharedFrameLoader(store.specs)
+        frame = loader("X")
+        pd.testing.assert_frame_equal(frame, df[["close", "volume"]].astype(float))
+        with pytest.raises(ValueError):
+            frame.values[0, 0] = 5.0
+        with pytest.raises(FileNotFoundError):
+            loader("Y")
+        del frame
+        loader.close()
+
+
+def test_process_mode_matches_thread_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_csvs(tmp_path, ["AAA", "BBB"])
+    engine = VectorizedBacktester(commission=0.001, slippage=0.0)
+
+    results = {}
+    for mode in ("thread", "process"):
+        runner = BacktestRunner(engine, mode=mode, max_workers=2)
+        runner.symbols = ["AAA", "BBB"]
+        runner.data_dir = str(tmp_path)
+        streamed = []
+        rows = runner.run_all(on_result=streamed.append)
+        assert streamed == rows
+        results[mode] = {(r["strategy"], r["symbol"]): r for r in rows}
+
+    assert results["thread"].keys() == results["process"].keys()
+    assert len(results["thread"]) == 6
+    for key, row in results["thread"].items():
+        assert row == results["process"][key]
+    # Stat arb can't pair the benchmark with itself
+    assert "error" in results["process"][("StatisticalArbitrageStrategy", "AAA")]
+    assert "error" not in results["process"][("StatisticalArbitrageStrategy", "BBB")]
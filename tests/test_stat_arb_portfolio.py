@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.stattools import coint
+
+from strategies.statistical_arbitrage import StatisticalArbitrageStrategy
+
+
+def _prices(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "A": x,
+            "B": 0.8 * x + rng.normal(0, 0.5, n) + 20,
+            "C": 50 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+        }
+    )
+
+
+def test_portfolio_positions_match_single_pair_logic():
+    prices = _prices()
+    strategy = StatisticalArbitrageStrategy(lookback=60)
+    result = strategy.run_portfolio_backtest(prices, [("A", "B")], coint_stride=1)
+
+    x, y, lb = prices["A"].to_numpy(), prices["B"].to_numpy(), 60
+    beta = strategy._rolling_beta(x, y, lb).ffill().bfill().to_numpy()
+    spread = pd.Series(y - beta * x)
+    z = ((spread - spread.rolling(lb).mean()) / spread.rolling(lb).std()).to_numpy()
+    pvals = [coint(x[i - lb : i], y[i - lb : i])[1] for i in range(lb, len(x))]
+    valid = np.concatenate([np.full(lb, np.nan), pvals]) < 0.05
+
+    expected = np.zeros(len(x))
+    for i in range(1, len(x)):
+        if z[i] < -2.0 and valid[i]:
+            expected[i] = 1
+        elif z[i] > 2.0 and valid[i]:
+            expected[i] = -1
+        elif abs(z[i]) < 0.5 or not valid[i]:
+            expected[i] = 0
+        else:
+            expected[i] = expected[i - 1]
+
+    np.testing.assert_array_equal(result["positions"]["A/B"].to_numpy(), expected)
+
+
+def test_capital_is_shared_across_open_pairs():
+    prices = _prices(seed=3)
+    strategy = StatisticalArbitrageStrategy(lookback=40, entry_z=1.0)
+    result = strategy.run_portfolio_backtest(
+        prices, [("A", "B"), ("A", "C"), ("B", "C")], params={"coint_pval": None}
+    )
+
+    weights = result["weights"]
+    open_rows = weights.sum(axis=1) > 0
+    assert open_rows.any()
+    np.testing.assert_allclose(weights[open_rows].sum(axis=1), 1.0)
+    port_ret = result["equity"].pct_change().fillna(0)
+    assert result["pairs"]["contribution"].sum() == pytest.approx(port_ret.sum(), abs=1e-3)
+    assert result["portfolio"]["n_pairs"] == 3
+
+
+@pytest.mark.parametrize("coint_pval", [0.05, None])
+def test_late_listed_symbol_starts_its_pairs_late(coint_pval):
+    prices = _prices(seed=3)
+    prices["D"] = 0.5 * prices["C"] + np.random.default_rng(1).normal(0, 0.3, len(prices))
+    prices.loc[:119, "D"] = np.nan  # listed at row 120
+    strategy = StatisticalArbitrageStrategy(lookback=40, entry_z=1.0, coint_pval=coint_pval)
+    result = strategy.run_portfolio_backtest(prices, [("A", "B"), ("C", "D")])
+
+    # A/B is unaffected by the late listing
+    alone = strategy.run_portfolio_backtest(prices, [("A", "B")])
+    pd.testing.assert_series_equal(result["positions"]["A/B"], alone["positions"]["A/B"])
+
+    # C/D is flat before the listing and evaluated on its own history after it
+    late = strategy.run_portfolio_backtest(prices.iloc[120:], [("C", "D")])
+    assert not result["positions"]["C/D"].iloc[:120].any()
+    np.testing.assert_array_equal(
+        result["positions"]["C/D"].iloc[120:].to_numpy(), late["positions"]["C/D"].to_numpy()
+    )
+    assert result["positions"]["C/D"].any()
+    valid_pct = late["pairs"].loc["C/D", "coint_valid_pct"] * len(late["equity"]) / len(prices)
+    assert result["pairs"].loc["C/D", "coint_valid_pct"] == pytest.approx(valid_pct, abs=1e-3)
+    assert np.isfinite(result["equity"]).all()
+
+    # The live cross-section does not silence the other pairs either
+    signal = strategy.generate_cross_section(prices[["A", "B", "C", "D"]].iloc[:100])
+    assert signal[2:].tolist() == [0, 0]
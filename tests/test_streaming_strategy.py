@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.streaming import RollingWindow
+from strategies.trend import TrendFollowingStrategy
+
+
+def test_rolling_window_matches_pandas():
+    rng = np.random.default_rng(0)
+    values = 30_000 + rng.normal(0, 50, 500)
+    window = RollingWindow(20)
+    means, stds = [], []
+    for v in values:
+        window.push(v)
+        means.append(window.mean if window.ready else np.nan)
+        stds.append(window.std if window.ready else np.nan)
+
+    series = pd.Series(values)
+    np.testing.assert_allclose(means, series.rolling(20).mean(), rtol=1e-10)
+    np.testing.assert_allclose(stds, series.rolling(20).std(), rtol=1e-6)
+
+
+def test_trend_on_bar_matches_batch_crossover():
+    rng = np.random.default_rng(1)
+    closes = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400))))
+    history = pd.DataFrame({"close": closes.iloc[:300]})
+
+    strategy = TrendFollowingStrategy({"short_window": 10, "long_window": 50})
+    strategy.warmup(history)
+
+    short = closes.rolling(10).mean()
+    long_ = closes.rolling(50).mean()
+    for i in range(300, 400):
+        signal = strategy.on_bar({"symbol": "BTC/USD", "close": closes.iloc[i]})
+        expected = "BUY" if short.iloc[i] > long_.iloc[i] else "SELL"
+        assert signal["side"] == expected
+        assert signal["price"] == pytest.approx(closes.iloc[i])
+
+
+def test_on_tick_uses_trade_price():
+    strategy = TrendFollowingStrategy({"short_window": 2, "long_window": 3})
+    ticks = [{"symbol": "ETH/USD", "price": p, "volume": 1.0} for p in (1.0, 2.0, 3.0)]
+    signals = [strategy.on_tick(t) for t in ticks]
+    assert signals[:2] == [None, None]
+    assert signals[2] == {"symbol": "ETH/USD", "side": "BUY", "price": 3.0}
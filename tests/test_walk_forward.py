@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import VectorizedBacktester
+from backtest.walk_forward import WalkForwardEngine, slice_data, walk_forward_windows
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.trend_following import TrendFollowingStrategy
+
+GRID = {"short_window": [5, 10, 20], "long_window": [40, 80]}
+
+
+def _data(n=1200, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))))
+    return {"prices": prices, "returns": prices.pct_change()}
+
+
+def test_rolling_and_anchored_windows():
+    rolling = walk_forward_windows(1000, 400, 200)
+    assert [(w.train_start, w.train_stop, w.test_stop) for w in rolling] == [
+        (0, 400, 600),
+        (200, 600, 800),
+        (400, 800, 1000),
+    ]
+    anchored = walk_forward_windows(1050, 400, 200, anchored=True)
+    assert [w.train_start for w in anchored] == [0, 0, 0, 0]
+    assert anchored[-1].test_stop == 1050
+    with pytest.raises(ValueError):
+        walk_forward_windows(1000, 400, 200, step=100)
+
+
+def test_window_slices_are_views():
+    data = _data()
+    window = slice_data(data, 100, 300)
+    assert np.shares_memory(window["prices"].to_numpy(), data["prices"].to_numpy())
+    assert window["prices"].index[0] == 100 and len(window["returns"]) == 200
+
+
+@pytest.mark.parametrize("anchored", [False, True])
+def test_walk_forward_matches_sequential_loop(anchored):
+    data = _data()
+    engine = VectorizedBacktester(commission=0.001, slippage=0.0)
+    strategy = TrendFollowingStrategy()
+    wf = WalkForwardEngine(
+        strategy, GRID, 400, 200, anchored=anchored, engine=engine, max_workers=3
+    )
+    result = wf.run(data)
+
+    returns = []
+    for w in walk_forward_windows(1200, 400, 200, anchored=anchored):
+        train = slice_data(data, w.train_start, w.train_stop)
+        scores = {
+            (s, lw): engine.run_strategy(strategy, train, {"short_window": s, "long_window": lw})[
+                "metrics"
+            ]["sharpe_ratio"]
+            for s in GRID["short_window"]
+            for lw in GRID["long_window"]
+        }
+        s, lw = max(scores, key=scores.get)
+        assert result["windows"].loc[w.index, "params"] == {"short_window": s, "long_window": lw}
+        frame = strategy.generate_positions(
+            {"short_window": s, "long_window": lw}, slice_data(data, w.train_start, w.test_stop)
+        ).iloc[-(w.test_stop - w.test_start) :]
+        returns.append(engine.run(frame["position"], frame["returns"])["returns"])
+
+    expected = pd.concat(returns)
+    pd.testing.assert_series_equal(result["returns"], expected)
+    assert list(result["equity"].index) == list(range(400, 1200))
+    assert result["equity"].iloc[-1] == pytest.approx(engine.capital_base * np.prod(1 + expected))
+    assert result["metrics"]["windows"] == 4
+
+
+def test_walk_forward_uses_sweep_metric():
+    data = _data(seed=1)
+    wf = WalkForwardEngine(
+        MeanReversionStrategy(),
+        {"lookback": [10, 20], "threshold": [1.0, 2.0]},
+        500,
+        350,
+        engine=VectorizedBacktester(),
+        fitness_metric="pnl",
+    )
+    result = wf.run(data)
+    best = wf.optimize(slice_data(data, 0, 500))
+    assert result["windows"].loc[0, "params"] == best["params"]
+    assert type(best["params"]["lookback"]) is int
+    assert result["windows"]["test_stop"].iloc[-1] == 1200
@@ -3,10 +3,11 @@ from datetime import datetime
 from pathlib import Path
 
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from analytics.rolling_metrics import rolling_max_drawdown, rolling_return_stats
+
 
 class NEXORAAnalyzer:
     """
@@ -84,28 +85,24 @@ class NEXORAAnalyzer:
 
     # -------------------------------------------------------------
     def compute_rolling_metrics(self, window=30):
-        """Compute rolling Sharpe ratio, drawdown, and volatility."""
+        """Compute rolling Sharpe ratio, max drawdown, and volatility."""
         if self.df is None or self.df.empty:
             return None
 
         df = self.df.copy()
         df["cum_pnl"] = df["pnl"].cumsum()
 
-        # Rolling volatility
-        df["rolling_volatility"] = df["pnl"].rolling(window).std()
+        # Rolling volatility + Sharpe (one fused pass)
+        _, volatility, sharpe = rolling_return_stats(df["pnl"], window, ddof=1)
+        df["rolling_volatility"] = volatility
+        df["rolling_sharpe"] = sharpe
 
-        # Rolling Sharpe
-        rolling_mean = df["pnl"].rolling(window).mean()
-        df["rolling_sharpe"] = np.where(
-            df["rolling_volatility"] != 0,
-            rolling_mean / df["rolling_volatility"],
-            np.nan,
+        # Max drawdown within each window, in PnL units: cumulative PnL starts
+        # at zero and can go negative, so a percentage of its peak is meaningless
+        df["rolling_drawdown"] = rolling_max_drawdown(
+            df["cum_pnl"], window, mode="absolute", min_periods=1
         )
 
-        # Rolling drawdown
-        rolling_max = df["cum_pnl"].rolling(window, min_periods=1).max()
-        df["rolling_drawdown"] = (df["cum_pnl"] - rolling_max) / rolling_max * 100
-
         print(f"📉 Computed rolling metrics (window={window}).")
         return df
 
@@ -123,7 +120,7 @@ class NEXORAAnalyzer:
         axes[1].grid(True, alpha=0.3)
 
         axes[2].plot(df["timestamp"], df["rolling_drawdown"], color="tab:red")
-        axes[2].set_title("Rolling Drawdown (%)")
+        axes[2].set_title("Rolling Max Drawdown (PnL)")
         axes[2].grid(True, alpha=0.3)
 
         plt.tight_layout()